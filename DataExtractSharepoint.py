@@ -2,39 +2,17 @@ import pandas as pd
 import os
 from pathlib import Path
 import re
-from datetime import datetime
-import PyPDF2
-import pdfplumber
+
+from pdf_text_cache import get_default_cache
+from pdf_text_engine import extract_text, TEXT_ENGINES
+from date_normalize import parse_date
 
 def extract_text_from_pdf(pdf_path):
     """
-    استخراج متن از فایل PDF با دو روش
+    استخراج متن از فایل PDF (فقط 3 صفحه اول برای سرعت)
+    موتور استخراج بر اساس آمار قبلی همین نوع گزارش انتخاب می‌شود
     """
-    text = ""
-    
-    # روش 1: استفاده از pdfplumber (بهترین روش)
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages[:3]:  # فقط 3 صفحه اول برای سرعت
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if text.strip():
-            return text
-    except Exception as e:
-        print(f"   ⚠️ خطا در pdfplumber: {str(e)}")
-    
-    # روش 2: استفاده از PyPDF2 (روش جایگزین)
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(min(3, len(pdf_reader.pages))):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text() + "\n"
-    except Exception as e:
-        print(f"   ⚠️ خطا در PyPDF2: {str(e)}")
-    
+    text, engine = extract_text(pdf_path, pages=(1, 3), engines=TEXT_ENGINES)
     return text
 
 def detect_report_type(pdf_text, file_name):
@@ -79,39 +57,25 @@ def extract_date_from_text(pdf_text, file_name):
     استخراج تاریخ از متن PDF یا نام فایل
     """
     # روش 1: از نام فایل (فرمت: YYYYMMDD-Daily Production Report.pdf)
-    date_match = re.search(r'(\d{4})(\d{2})(\d{2})', file_name)
+    date_match = re.search(r'\d{8}', file_name)
     if date_match:
-        year, month, day = date_match.groups()
-        try:
-            date_obj = datetime(int(year), int(month), int(day))
+        date_obj = parse_date(date_match.group(0))
+        if date_obj:
             return date_obj.strftime('%m/%d/%Y')
-        except:
-            pass
     
     # روش 2: جستجو در متن PDF
     # فرمت‌های متداول تاریخ
     date_patterns = [
-        r'(\d{1,2})/(\d{1,2})/(\d{4})',  # MM/DD/YYYY
-        r'(\d{4})-(\d{2})-(\d{2})',      # YYYY-MM-DD
-        r'(\d{2})\.(\d{2})\.(\d{4})',    # DD.MM.YYYY
+        r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
+        r'\d{4}-\d{2}-\d{2}',      # YYYY-MM-DD
+        r'\d{2}\.\d{2}\.\d{4}',    # DD.MM.YYYY
     ]
     
     for pattern in date_patterns:
-        match = re.search(pattern, pdf_text)
-        if match:
-            try:
-                if '/' in pattern:
-                    return match.group(0)
-                else:
-                    # تبدیل به فرمت MM/DD/YYYY
-                    groups = match.groups()
-                    if len(groups[0]) == 4:  # YYYY-MM-DD
-                        date_obj = datetime(int(groups[0]), int(groups[1]), int(groups[2]))
-                    else:  # DD.MM.YYYY
-                        date_obj = datetime(int(groups[2]), int(groups[1]), int(groups[0]))
-                    return date_obj.strftime('%m/%d/%Y')
-            except:
-                continue
+        for match in re.finditer(pattern, pdf_text):
+            date_obj = parse_date(match.group(0))
+            if date_obj:
+                return date_obj.strftime('%m/%d/%Y')
     
     return "N/A"
 
@@ -125,12 +89,9 @@ def extract_refno_from_file(file_name, date_str):
         return ref_match.group(1)
     
     # روش 2: از تاریخ (تبدیل MM/DD/YYYY به YYYYMMDD)
-    if date_str != "N/A":
-        try:
-            date_obj = datetime.strptime(date_str, '%m/%d/%Y')
-            return date_obj.strftime('%Y%m%d')
-        except:
-            pass
+    date_obj = parse_date(date_str)
+    if date_obj:
+        return date_obj.strftime('%Y%m%d')
     
     # روش 3: از نام فایل بدون پسوند
     return file_name.replace('.pdf', '').replace(' ', '_')
@@ -248,6 +209,7 @@ def main():
     print(f"📄 نام فایل: ProductionReport_Summary.xlsx")
     print(f"📂 مسیر کامل: {output_file}")
     print(f"📊 تعداد گزارش‌ها: {len(results)}")
+    get_default_cache().print_stats()
     print("="*80)
     
     # نمایش نمونه داده‌ها
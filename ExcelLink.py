@@ -2,55 +2,59 @@ import os
 import re
 from pathlib import Path
 
+from pdf_text_cache import get_default_cache
+from pdf_text_engine import extract_text, TEXT_ENGINES
+
+def read_first_page_text(pdf_path):
+    """متن صفحه اول PDF (یک بار خوانده می‌شود و در کش مشترک ذخیره می‌شود)"""
+    text, engine = extract_text(pdf_path, pages=(1, 1), engines=TEXT_ENGINES)
+    return text
+
 def extract_date_from_pdf(pdf_path):
     """استخراج Date از جدول در صفحه اول PDF"""
     try:
-        import PyPDF2
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            first_page = pdf_reader.pages[0]
-            text = first_page.extract_text()
-            
-            # تلاش برای یافتن Date در ساختار جدول
-            lines = text.split('\n')
-            for i, line in enumerate(lines):
-                if 'date' in line.lower():
-                    # بررسی همان خط
-                    patterns = [
-                        r'Date[:\s]*(\d{1,2}[-/]\w{3}[-/]\d{2,4})',
-                        r'Date[:\s]*(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-                        r'Date[:\s]*(\w{3}[-/]\d{1,2}[-/]\d{2,4})',
+        text = read_first_page_text(pdf_path)
+        
+        # تلاش برای یافتن Date در ساختار جدول
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            if 'date' in line.lower():
+                # بررسی همان خط
+                patterns = [
+                    r'Date[:\s]*(\d{1,2}[-/]\w{3}[-/]\d{2,4})',
+                    r'Date[:\s]*(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+                    r'Date[:\s]*(\w{3}[-/]\d{1,2}[-/]\d{2,4})',
+                ]
+                for pattern in patterns:
+                    match = re.search(pattern, line, re.IGNORECASE)
+                    if match:
+                        return match.group(1)
+                
+                # بررسی خط بعدی
+                if i + 1 < len(lines):
+                    next_line = lines[i + 1].strip()
+                    date_patterns = [
+                        r'^(\d{1,2}[-/]\w{3}[-/]\d{2,4})$',
+                        r'^(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})$',
+                        r'^(\w{3}[-/]\d{1,2}[-/]\d{2,4})$',
                     ]
-                    for pattern in patterns:
-                        match = re.search(pattern, line, re.IGNORECASE)
+                    for pattern in date_patterns:
+                        match = re.match(pattern, next_line)
                         if match:
                             return match.group(1)
-                    
-                    # بررسی خط بعدی
-                    if i + 1 < len(lines):
-                        next_line = lines[i + 1].strip()
-                        date_patterns = [
-                            r'^(\d{1,2}[-/]\w{3}[-/]\d{2,4})$',
-                            r'^(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})$',
-                            r'^(\w{3}[-/]\d{1,2}[-/]\d{2,4})$',
-                        ]
-                        for pattern in date_patterns:
-                            match = re.match(pattern, next_line)
-                            if match:
-                                return match.group(1)
-            
-            # جستجوی کلی در متن
-            general_patterns = [
-                r'(\d{1,2}[-/]\w{3}[-/]\d{2,4})',
-                r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-            ]
-            for pattern in general_patterns:
-                match = re.search(pattern, text)
-                if match:
-                    return match.group(1)
-            
-            return "N/A"
-            
+        
+        # جستجوی کلی در متن
+        general_patterns = [
+            r'(\d{1,2}[-/]\w{3}[-/]\d{2,4})',
+            r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+        ]
+        for pattern in general_patterns:
+            match = re.search(pattern, text)
+            if match:
+                return match.group(1)
+        
+        return "N/A"
+        
     except ImportError:
         print("⚠️ کتابخانه PyPDF2 نصب نیست. برای نصب: pip install PyPDF2")
         return "N/A"
@@ -114,18 +118,14 @@ def extract_date_from_word(doc_path):
 def extract_report_title_from_pdf(pdf_path):
     """بررسی وجود عنوان گزارش در PDF"""
     try:
-        import PyPDF2
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            first_page = pdf_reader.pages[0]
-            text = first_page.extract_text()
-            
-            if "MAINTENANCE MONTHLY REPORT" in text.upper():
-                return "MAINTENANCE MONTHLY REPORT"
-            elif "JCTION ENGINEERING MONTHLY REPORT" in text.upper():
-                return "JCTION ENGINEERING MONTHLY REPORT"
-            else:
-                return "N/A"
+        text = read_first_page_text(pdf_path)
+        
+        if "MAINTENANCE MONTHLY REPORT" in text.upper():
+            return "MAINTENANCE MONTHLY REPORT"
+        elif "JCTION ENGINEERING MONTHLY REPORT" in text.upper():
+            return "JCTION ENGINEERING MONTHLY REPORT"
+        else:
+            return "N/A"
                 
     except Exception:
         return "N/A"
@@ -176,8 +176,7 @@ def create_excel_report(folder_path, output_file="Weekly_Reports.xlsx"):
     print("=" * 60)
     
     try:
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        from report_writer import ReportWriter
     except ImportError:
         print("❌ خطا: کتابخانه openpyxl نصب نیست!")
         print("💡 برای نصب از دستور زیر استفاده کنید:")
@@ -198,37 +197,17 @@ def create_excel_report(folder_path, output_file="Weekly_Reports.xlsx"):
     for f in all_files:
         print(f"   📄 {f.name}")
     
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Weekly Reports"
-    
-    ws.column_dimensions['A'].width = 50
-    ws.column_dimensions['B'].width = 55
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 40
-    
-    headers = ['Report No', 'File Name (Link)', 'Date', 'Report Title']
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
+    # هدر، عرض و استایل ستون‌ها (ستون نام فایل: لینک به خود فایل)
+    columns = [
+        ('Report No', 50, 'left'), ('File Name (Link)', 55, 'link'),
+        ('Date', 15, 'center'), ('Report Title', 40, 'center')
+    ]
+    output_path = os.path.join(folder_path, output_file)
+    report = ReportWriter(output_path, "Weekly Reports", columns, header_size=11)
     
     print("\n🔄 در حال پردازش فایل‌ها...")
     
-    for idx, file in enumerate(sorted(all_files), 2):
+    for file in sorted(all_files):
         filename = file.name
         file_path = str(file.absolute())
         file_ext = file.suffix.lower()
@@ -247,35 +226,16 @@ def create_excel_report(folder_path, output_file="Weekly_Reports.xlsx"):
             date = "N/A"
             report_title = "N/A"
         
-        cell_a = ws.cell(row=idx, column=1)
-        cell_a.value = report_no
-        cell_a.alignment = Alignment(horizontal='left', vertical='center')
-        cell_a.border = thin_border
-        
-        cell_b = ws.cell(row=idx, column=2)
-        cell_b.value = filename
-        cell_b.hyperlink = file_path
-        cell_b.font = Font(color="0563C1", underline="single")
-        cell_b.alignment = Alignment(horizontal='left', vertical='center')
-        cell_b.border = thin_border
-        
-        cell_c = ws.cell(row=idx, column=3)
-        cell_c.value = date
-        cell_c.alignment = Alignment(horizontal='center', vertical='center')
-        cell_c.border = thin_border
-        
-        cell_d = ws.cell(row=idx, column=4)
-        cell_d.value = report_title
-        cell_d.alignment = Alignment(horizontal='center', vertical='center')
-        cell_d.border = thin_border
+        # ردیف بلافاصله روی دیسک نوشته می‌شود
+        report.append([report_no, filename, date, report_title], links={1: file_path})
     
     try:
-        output_path = os.path.join(folder_path, output_file)
-        wb.save(output_path)
+        report.close()
         print("\n" + "=" * 60)
         print(f"✅ فایل اکسل با موفقیت ایجاد شد!")
         print(f"📂 مسیر فایل: {output_path}")
         print(f"📊 تعداد فایل‌های پردازش شده: {len(all_files)}")
+        get_default_cache().print_stats()
         print("=" * 60)
     except PermissionError:
         print(f"\n❌ خطا: دسترسی به ذخیره فایل وجود ندارد!")
@@ -12,6 +12,11 @@ import cv2
 import numpy as np
 import os
 
+from ocr_preprocess import PreprocessPipeline
+
+# Preprocessing stages (see ocr_preprocess.py for available stages)
+PREPROCESS_PIPELINE = PreprocessPipeline('extracteddata_legacy')
+
 # If Tesseract is installed in a different location, specify the path
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -31,16 +36,8 @@ def preprocess_image(image_path):
         
     img = cv2.imread(image_path)
     
-    # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    
-    # Apply threshold for better quality
-    _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-    
-    # Denoise
-    denoised = cv2.fastNlMeansDenoising(thresh, None, 10, 7, 21)
-    
-    return denoised
+    # Grayscale -> fixed threshold -> denoise
+    return PREPROCESS_PIPELINE(img)
 
 def extract_table_data_ocr(image_path):
     """
@@ -10,10 +10,12 @@ import re
 from pathlib import Path
 from docx import Document
 from docx.table import Table
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from datetime import datetime
 
+from docx_header_reader import read_report_fields
+from rename_planner import apply_renames, STATUS_LABELS
+from report_writer import ReportWriter
+
 class WordFileRenamer:
     def __init__(self, source_directory):
         """
@@ -32,6 +34,9 @@ class WordFileRenamer:
         Args:
             doc: شیء Document از python-docx
             
+        اولین مقدار پیدا شده برای هر فیلد نگه داشته می‌شود (همان قاعده docx_header_reader،
+        تا نتیجه به این بستگی نداشته باشد که کدام مسیر اجرا شده است)
+        
         Returns:
             dict: دیکشنری حاوی sequence_number, date, revision
         """
@@ -50,7 +55,7 @@ class WordFileRenamer:
                     
                     # جستجوی Sequence Number
                     for i, cell_text in enumerate(cells_text):
-                        if 'Sequence' in cell_text and 'Number' in cell_text:
+                        if not data['sequence_number'] and 'Sequence' in cell_text and 'Number' in cell_text:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -62,7 +67,7 @@ class WordFileRenamer:
                     
                     # جستجوی Revision در Header
                     for i, cell_text in enumerate(cells_text):
-                        if cell_text in ['Revision', 'Rev', 'REV']:
+                        if not data['revision'] and cell_text in ['Revision', 'Rev', 'REV']:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -80,7 +85,7 @@ class WordFileRenamer:
                 # جستجوی Revision (اگر در Header پیدا نشده)
                 if not data['revision']:
                     for i, cell_text in enumerate(cells_text):
-                        if cell_text in ['Revision', 'Rev', 'REV']:
+                        if not data['revision'] and cell_text in ['Revision', 'Rev', 'REV']:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -92,7 +97,7 @@ class WordFileRenamer:
                 
                 # جستجوی Date
                 for i, cell_text in enumerate(cells_text):
-                    if cell_text == 'Date' or cell_text == 'DATE':
+                    if not data['date'] and cell_text in ['Date', 'DATE']:
                         try:
                             if row_idx + 1 < len(table.rows):
                                 next_row = table.rows[row_idx + 1]
@@ -213,6 +218,8 @@ class WordFileRenamer:
         print(f"تعداد {len(pdf_files)} فایل PDF پیدا شد.\n")
         
         # پردازش فایل‌های Word
+        pending_renames = []
+        
         for file_path in word_files:
             # رد کردن فایل‌های موقت
             if file_path.name.startswith('~$'):
@@ -221,11 +228,12 @@ class WordFileRenamer:
             print(f"📄 در حال پردازش Word: {file_path.name}")
             
             try:
-                # خواندن فایل Word
-                doc = Document(file_path)
+                # خواندن سریع Header و جداول اول فایل Word
+                data = read_report_fields(file_path)
                 
-                # استخراج داده‌ها
-                data = self.extract_table_data(doc)
+                # اگر فیلدی پیدا نشد، کل سند با python-docx بررسی می‌شود
+                if not all(data.values()):
+                    data = self.extract_table_data(Document(file_path))
                 
                 print(f"  Sequence Number: {data['sequence_number']}")
                 print(f"  Revision: {data['revision']}")
@@ -250,14 +258,9 @@ class WordFileRenamer:
                     'status': 'موفق'
                 }
                 
-                # تغییر نام فایل (اختیاری)
+                # تغییر نام فایل (اختیاری) - پس از پردازش همه فایل‌ها یکجا انجام می‌شود
                 if rename_files:
-                    new_path = file_path.parent / new_filename
-                    if not new_path.exists():
-                        file_path.rename(new_path)
-                        result['status'] = 'تغییر نام داده شد'
-                    else:
-                        result['status'] = 'فایل با این نام وجود دارد'
+                    pending_renames.append((file_path.name, result))
                 
                 self.results.append(result)
                 
@@ -315,6 +318,15 @@ class WordFileRenamer:
                     'status': f'خطا: {str(e)}'
                 })
         
+        # تغییر نام یکجا: نگاشت کامل از یک بار خواندن پوشه، اجرای دو مرحله‌ای با journal
+        if pending_renames:
+            outcome = apply_renames(
+                self.source_directory,
+                [(name, result['new_name']) for name, result in pending_renames]
+            )
+            for name, result in pending_renames:
+                result['status'] = STATUS_LABELS[outcome[name][1]]
+        
         return self.results
     
     def create_excel_report(self, output_path):
@@ -324,53 +336,27 @@ class WordFileRenamer:
         Args:
             output_path: مسیر فایل خروجی Excel
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "گزارش فایل‌ها"
-        
-        # تنظیمات سبک
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        # هدر جدول
-        headers = ['ردیف', 'نوع فایل', 'نام اصلی فایل', 'نام جدید فایل', 'Sequence Number', 'Revision', 'Date', 'وضعیت']
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
-        
-        # داده‌ها
-        for row_idx, result in enumerate(self.results, 2):
-            ws.cell(row=row_idx, column=1, value=row_idx-1).border = border
-            ws.cell(row=row_idx, column=2, value=result.get('file_type', 'N/A')).border = border
-            ws.cell(row=row_idx, column=3, value=result['original_name']).border = border
-            ws.cell(row=row_idx, column=4, value=result['new_name']).border = border
-            ws.cell(row=row_idx, column=5, value=result['sequence_number']).border = border
-            ws.cell(row=row_idx, column=6, value=result['revision']).border = border
-            ws.cell(row=row_idx, column=7, value=result['date']).border = border
-            ws.cell(row=row_idx, column=8, value=result['status']).border = border
+        # هدر جدول، عرض و استایل ستون‌ها
+        columns = [
+            ('ردیف', 8, 'cell'), ('نوع فایل', 12, 'cell'), ('نام اصلی فایل', 50, 'cell'),
+            ('نام جدید فایل', 50, 'cell'), ('Sequence Number', 18, 'cell'), ('Revision', 12, 'cell'),
+            ('Date', 15, 'cell'), ('وضعیت', 25, 'cell')
+        ]
         
-        # تنظیم عرض ستون‌ها
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 50
-        ws.column_dimensions['D'].width = 50
-        ws.column_dimensions['E'].width = 18
-        ws.column_dimensions['F'].width = 12
-        ws.column_dimensions['G'].width = 15
-        ws.column_dimensions['H'].width = 25
+        # داده‌ها (ردیف‌ها به صورت جریانی نوشته می‌شوند)
+        with ReportWriter(output_path, "گزارش فایل‌ها", columns) as report:
+            for row_idx, result in enumerate(self.results, 1):
+                report.append([
+                    row_idx,
+                    result.get('file_type', 'N/A'),
+                    result['original_name'],
+                    result['new_name'],
+                    result['sequence_number'],
+                    result['revision'],
+                    result['date'],
+                    result['status']
+                ])
         
-        # ذخیره فایل
-        wb.save(output_path)
         print(f"\n✓ گزارش Excel در مسیر زیر ذخیره شد:")
         print(f"  {output_path}")
 
@@ -10,16 +10,15 @@ Maintenance Monthly Reports - File Renamer
 
 import os
 from pathlib import Path
-import re
 from datetime import datetime
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # کتابخانه‌های اصلی
 try:
-    import PyPDF2
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from report_writer import ReportWriter
     from docx import Document
 except ImportError as e:
     print(f"❌ خطا: کتابخانه موردنیاز نصب نیست: {e}")
@@ -27,92 +26,96 @@ except ImportError as e:
     print("pip install PyPDF2 openpyxl python-docx")
     sys.exit(1)
 
-# کتابخانه‌های OCR (اختیاری)
-try:
-    from pdf2image import convert_from_path
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+from pdf_text_cache import get_default_cache
+from pdf_text_engine import extract_text, TEXT_ENGINES
+from pdf_title_block import extract_title_block_text
+from pdf_progressive_ocr import progressive_ocr, ocr_stats_snapshot, print_ocr_stats, OCR_AVAILABLE
+from doc_patterns import extract as extract_fields, get_registry
+from date_normalize import parse_date as parse_date_to_excel
+from rename_manifest import get_manifest, print_plan_summary
+from rename_planner import apply_renames, STATUS_LABELS
+
+# کتابخانه‌های OCR (اختیاری) - بررسی در pdf_progressive_ocr
+if not OCR_AVAILABLE:
     print("⚠️ توجه: کتابخانه‌های OCR نصب نیستند. برای PDF های اسکن شده از OCR استفاده نخواهد شد.")
 
+# فقط ناحیه جدول عنوان خوانده شود (در صورت نبود فیلدها، کل صفحه خوانده می‌شود)
+# ناحیه با دستور زیر یاد گرفته می‌شود:
+#   python pdf_title_block.py learn REMO <folder> --fields doc_no,date,title,period
+USE_TITLE_BLOCK = True
 
-def parse_date_to_excel(date_str):
-    """
-    تبدیل تاریخ به datetime object
-    ورودی: 14-Oct-2024 یا 14-October-2024 یا 14 Oct 2024
-    """
-    if not date_str:
-        return None
-    
-    try:
-        months = {
-            'jan': 1, 'january': 1,
-            'feb': 2, 'february': 2,
-            'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4,
-            'may': 5,
-            'jun': 6, 'june': 6,
-            'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8,
-            'sep': 9, 'september': 9,
-            'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11,
-            'dec': 12, 'december': 12
-        }
-        
-        # پاک کردن فضاهای اضافی و تبدیل به lowercase
-        date_str = date_str.strip().lower()
-        
-        # فرمت 1: 14-Oct-2024 یا 14-october-2024
-        if '-' in date_str:
-            parts = date_str.split('-')
-            if len(parts) == 3:
-                day = int(parts[0])
-                month_name = parts[1]
-                year = int(parts[2])
-                
-                month = months.get(month_name)
-                if month:
-                    return datetime(year, month, day)
-        
-        # فرمت 2: 14 Oct 2024
-        parts = date_str.split()
-        if len(parts) == 3:
-            day = int(parts[0])
-            month_name = parts[1]
-            year = int(parts[2])
-            
-            month = months.get(month_name)
-            if month:
-                return datetime(year, month, day)
-                
-    except Exception as e:
-        print(f"   ⚠️ خطا در تبدیل تاریخ '{date_str}': {e}")
-    
-    return None
+# فیلدهایی که parse_report_text از ناحیه عنوان لازم دارد
+TITLE_BLOCK_FIELDS = ('doc_no', 'date', 'title', 'period')
+
+# فقط فایل‌های جدید یا تغییر یافته پردازش شوند (فهرست SQLite فایل‌های دیده شده)
+# فایل‌هایی که قبلا ناموفق بوده‌اند با گزینه --retry-failed دوباره بررسی می‌شوند
+USE_MANIFEST = True
 
 
 def extract_text_from_pdf_with_ocr(pdf_path):
     """
     استخراج متن از PDF با OCR (اختیاری)
+    ابتدا نوار بالای صفحه با DPI پایین، سپس در صورت نیاز DPI و ناحیه بزرگ‌تر
     """
     if not OCR_AVAILABLE:
         return ""
     
     try:
         print(f"   🔍 تلاش برای OCR...")
-        images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300)
-        
-        if images:
-            text = pytesseract.image_to_string(images[0], lang='eng')
-            return text
+        return progressive_ocr(pdf_path, fields=TITLE_BLOCK_FIELDS)
     except Exception as e:
         print(f"   ⚠️ خطا در OCR: {str(e)}")
     
     return ""
 
 
+def parse_report_text(text):
+    """
+    استخراج Document No، Date، عنوان و دوره از متن گزارش
+
+    الگوها از مخزن مشترک doc_patterns (خانواده REMO) می‌آیند.
+    """
+    def valid_date(groups):
+        return parse_date_to_excel(groups['date'].replace(' ', '-')) is not None
+
+    info = extract_fields(text, 'REMO', validate={'date': valid_date})
+    
+    # Document No
+    doc_no = info['doc_no']
+    if doc_no:
+        print(f"   ✅ Document No: {doc_no}")
+    
+    # Date
+    date_obj = None
+    date_str = None
+    if info['date']:
+        date_str = info['date'].replace(' ', '-')
+        date_obj = parse_date_to_excel(date_str)
+        print(f"   ✅ Date: {date_str} → {date_obj.strftime('%d/%m/%Y')}")
+    
+    # عنوان گزارش
+    report_title = None
+    text_upper = text.upper()
+    if 'MAINTENANCE' in text_upper and 'MONTHLY' in text_upper and 'REPORT' in text_upper:
+        report_title = 'MAINTENANCE MONTHLY REPORT'
+    
+    # دوره گزارش (From ... to ...)
+    period = None
+    if info['period_from']:
+        period = f"From {info['period_from']} to {info['period_to']}"
+        print(f"   ✅ Period: {period}")
+    
+    return {
+        'doc_no': doc_no,
+        'doc_number': info['number'],
+        'rev': info['rev'],
+        'date': date_obj,
+        'date_str': date_str,
+        'report_title': report_title,
+        'period': period
+    }
+
+
 def extract_info_from_pdf(pdf_path):
     """
     استخراج اطلاعات از PDF:
@@ -124,101 +127,23 @@ def extract_info_from_pdf(pdf_path):
     text = ""
     
     try:
-        # خواندن مستقیم PDF
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            if len(pdf_reader.pages) > 0:
-                first_page = pdf_reader.pages[0]
-                text = first_page.extract_text()
+        # خواندن مستقیم PDF (سریع‌ترین موتور برای این نوع گزارش، از کش در صورت وجود)
+        from_region = False
+        if USE_TITLE_BLOCK:
+            text, from_region = extract_title_block_text(pdf_path, family='REMO', fields=TITLE_BLOCK_FIELDS)
+        else:
+            text, engine = extract_text(pdf_path, pages=(1, 1), family='REMO', engines=TEXT_ENGINES)
         
         # اگر متن کافی نبود، از OCR استفاده کن (اگر موجود باشد)
-        if (not text or len(text.strip()) < 50) and OCR_AVAILABLE:
+        # متن ناحیه عنوان کوتاه است ولی همه فیلدها در آن پیدا شده‌اند؛ معیار طول فقط برای کل صفحه است
+        if not from_region and (not text or len(text.strip()) < 50) and OCR_AVAILABLE:
             print(f"   ⚠️ PDF اسکن شده شناسایی شد، استفاده از OCR...")
             text = extract_text_from_pdf_with_ocr(pdf_path)
         
         if text:
             print(f"   📄 متن استخراج شده ({len(text)} کاراکتر)")
             
-            # استخراج Document No
-            # الگوهای مختلف برای Document No
-            patterns_docno = [
-                # فرمت استاندارد: SJSC-XXX-XXX-REMO-YYYY-GNN
-                r'Document\s*No\.?\s*:?\s*(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-                r'Document\s*Number\s*:?\s*(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-                r'Doc\s*No\.?\s*:?\s*(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-                # فرمت کلی
-                r'(SJSC-[A-Z0-9]+-[A-Z0-9]+-REMO-(\d{4})-(G\d{2}))',
-                r'(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-            ]
-            
-            doc_no = None
-            doc_number = None
-            rev = None
-            
-            for pattern in patterns_docno:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    groups = match.groups()
-                    if len(groups) >= 3:
-                        doc_no = groups[0]
-                        doc_number = groups[1]
-                        rev = groups[2]
-                        print(f"   ✅ Document No: {doc_no}")
-                        break
-            
-            # استخراج Date از جدول دوم
-            patterns_date = [
-                r'Date\s*:?\s*([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-                r'Date\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-                r'Approved\s+by\s+Date\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-                # الگوهای اضافی
-                r'Date:\s*([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-            ]
-            
-            date_obj = None
-            date_str = None
-            
-            for pattern in patterns_date:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    date_str = match.group(1).replace(' ', '-')
-                    date_obj = parse_date_to_excel(date_str)
-                    if date_obj:
-                        print(f"   ✅ Date: {date_str} → {date_obj.strftime('%d/%m/%Y')}")
-                        break
-                if date_obj:
-                    break
-            
-            # استخراج عنوان گزارش
-            report_title = None
-            text_upper = text.upper()
-            if 'MAINTENANCE' in text_upper and 'MONTHLY' in text_upper and 'REPORT' in text_upper:
-                report_title = 'MAINTENANCE MONTHLY REPORT'
-            
-            # استخراج دوره گزارش (From ... to ...)
-            period = None
-            period_patterns = [
-                r'\(From\s+([0-9]{1,2}[-\s][A-Za-z]{3,9})\s+to\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})\)',
-                r'From\s+([0-9]{1,2}[-\s][A-Za-z]{3,9})\s+to\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-            ]
-            
-            for pattern in period_patterns:
-                period_match = re.search(pattern, text, re.IGNORECASE)
-                if period_match:
-                    period = f"From {period_match.group(1)} to {period_match.group(2)}"
-                    print(f"   ✅ Period: {period}")
-                    break
-            
-            return {
-                'doc_no': doc_no,
-                'doc_number': doc_number,
-                'rev': rev,
-                'date': date_obj,
-                'date_str': date_str,
-                'report_title': report_title,
-                'period': period
-            }
+            return parse_report_text(text)
                     
     except Exception as e:
         print(f"   ⚠️ خطا در خواندن PDF: {str(e)}")
@@ -249,79 +174,7 @@ def extract_info_from_word(word_path):
         text = '\n'.join(full_text)
         print(f"   📄 متن Word استخراج شده ({len(text)} کاراکتر)")
         
-        # استخراج Document No
-        patterns_docno = [
-            r'Document\s*No\.?\s*:?\s*(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-            r'Document\s*Number\s*:?\s*(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-            r'(SJSC-[A-Z0-9]+-[A-Z0-9]+-REMO-(\d{4})-(G\d{2}))',
-            r'(SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(\d{4})-(G\d{2}))',
-        ]
-        
-        doc_no = None
-        doc_number = None
-        rev = None
-        
-        for pattern in patterns_docno:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                if len(groups) >= 3:
-                    doc_no = groups[0]
-                    doc_number = groups[1]
-                    rev = groups[2]
-                    print(f"   ✅ Document No: {doc_no}")
-                    break
-        
-        # استخراج Date
-        patterns_date = [
-            r'Date\s*:?\s*([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-            r'Date\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-            r'Date:\s*([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-        ]
-        
-        date_obj = None
-        date_str = None
-        
-        for pattern in patterns_date:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                date_str = match.group(1).replace(' ', '-')
-                date_obj = parse_date_to_excel(date_str)
-                if date_obj:
-                    print(f"   ✅ Date: {date_str} → {date_obj.strftime('%d/%m/%Y')}")
-                    break
-            if date_obj:
-                break
-        
-        # عنوان گزارش
-        report_title = None
-        text_upper = text.upper()
-        if 'MAINTENANCE' in text_upper and 'MONTHLY' in text_upper and 'REPORT' in text_upper:
-            report_title = 'MAINTENANCE MONTHLY REPORT'
-        
-        # دوره گزارش
-        period = None
-        period_patterns = [
-            r'\(From\s+([0-9]{1,2}[-\s][A-Za-z]{3,9})\s+to\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})\)',
-            r'From\s+([0-9]{1,2}[-\s][A-Za-z]{3,9})\s+to\s+([0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4})',
-        ]
-        
-        for pattern in period_patterns:
-            period_match = re.search(pattern, text, re.IGNORECASE)
-            if period_match:
-                period = f"From {period_match.group(1)} to {period_match.group(2)}"
-                print(f"   ✅ Period: {period}")
-                break
-        
-        return {
-            'doc_no': doc_no,
-            'doc_number': doc_number,
-            'rev': rev,
-            'date': date_obj,
-            'date_str': date_str,
-            'report_title': report_title,
-            'period': period
-        }
+        return parse_report_text(text)
     
     except Exception as e:
         print(f"   ⚠️ خطا در خواندن Word: {str(e)}")
@@ -336,67 +189,32 @@ def create_excel_report(files_data, output_path):
     ایجاد گزارش اکسل با فرمت زیبا
     """
     try:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Maintenance Reports"
-        
-        # استایل‌های زیبا
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        # هدرها
-        headers = ['ردیف', 'نام فایل اصلی', 'نام فایل جدید', 'عنوان گزارش', 
-                   'دوره', 'Document No', 'شماره', 'REV', 'تاریخ', 'وضعیت']
-        ws.append(headers)
-        
-        # استایل هدر
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+        # هدرها، عرض و استایل ستون‌ها (استایل‌ها یک بار تعریف می‌شوند)
+        columns = [
+            ('ردیف', 8, 'center'), ('نام فایل اصلی', 40, 'center'), ('نام فایل جدید', 45, 'center'),
+            ('عنوان گزارش', 35, 'center'), ('دوره', 30, 'center'), ('Document No', 40, 'center'),
+            ('شماره', 12, 'center'), ('REV', 8, 'center'), ('تاریخ', 15, 'date'), ('وضعیت', 20, 'center')
+        ]
         
-        # داده‌ها
-        for idx, data in enumerate(files_data, start=1):
-            date_value = data['date'] if data['date'] else 'N/A'
-            
-            row = [
-                idx,
-                data['old_name'],
-                data['new_name'] if data['new_name'] else 'N/A',
-                data['report_title'] if data['report_title'] else 'N/A',
-                data['period'] if data['period'] else 'N/A',
-                data['doc_no'] if data['doc_no'] else 'N/A',
-                data['doc_number'] if data['doc_number'] else 'N/A',
-                data['rev'] if data['rev'] else 'N/A',
-                date_value,
-                data['status']
-            ]
-            ws.append(row)
-            
-            # استایل ردیف
-            row_num = idx + 1
-            for col_idx, cell in enumerate(ws[row_num], start=1):
-                cell.border = border
-                cell.alignment = Alignment(horizontal='center', vertical='center')
+        # ردیف‌ها به صورت جریانی نوشته می‌شوند
+        with ReportWriter(output_path, "Maintenance Reports", columns,
+                          header_color="4472C4", header_size=11) as report:
+            for idx, data in enumerate(files_data, start=1):
+                date_value = data['date'] if data['date'] else 'N/A'
                 
-                # فرمت تاریخ
-                if col_idx == 9 and isinstance(cell.value, datetime):
-                    cell.number_format = 'DD/MM/YYYY'
+                report.append([
+                    idx,
+                    data['old_name'],
+                    data['new_name'] if data['new_name'] else 'N/A',
+                    data['report_title'] if data['report_title'] else 'N/A',
+                    data['period'] if data['period'] else 'N/A',
+                    data['doc_no'] if data['doc_no'] else 'N/A',
+                    data['doc_number'] if data['doc_number'] else 'N/A',
+                    data['rev'] if data['rev'] else 'N/A',
+                    date_value,
+                    data['status']
+                ])
         
-        # تنظیم عرض ستون‌ها
-        column_widths = [8, 40, 45, 35, 30, 40, 12, 8, 15, 20]
-        for idx, width in enumerate(column_widths, start=1):
-            ws.column_dimensions[chr(64 + idx)].width = width
-        
-        # ذخیره فایل
-        wb.save(output_path)
         print(f"\n📊 فایل اکسل ایجاد شد: {output_path}")
         
     except Exception as e:
@@ -405,13 +223,100 @@ def create_excel_report(files_data, output_path):
         traceback.print_exc()
 
 
-def rename_files(folder_path, dry_run=False):
+def _empty_file_data(file_path, status):
+    return {
+        'path': file_path,
+        'old_name': file_path.name,
+        'doc_no': None,
+        'doc_number': None,
+        'rev': None,
+        'date': None,
+        'date_str': None,
+        'report_title': None,
+        'period': None,
+        'new_name': None,
+        'status': status
+    }
+
+
+def _file_data_from_manifest(file_path, fields):
+    """
+    اطلاعات فایل بدون تغییر از فهرست (بدون خواندن دوباره فایل)
+    """
+    data = _empty_file_data(file_path, 'در انتظار')
+    data.update(fields)
+    data['date'] = parse_date_to_excel(fields.get('date_str'))
+    return data
+
+
+def extract_file_info(file_path):
+    """
+    استخراج اطلاعات یک فایل (قابل اجرا در پردازش جداگانه)
+    
+    Returns:
+        (data, worker_pid, elapsed_seconds, (cache_hits, cache_misses))
+    """
+    started = time.perf_counter()
+    cache = get_default_cache()
+    hits_before, misses_before = cache.hits, cache.misses
+    print(f"\n📄 پردازش: {file_path.name}")
+    
+    try:
+        if file_path.suffix.lower() == '.pdf':
+            info = extract_info_from_pdf(file_path)
+        else:
+            info = extract_info_from_word(file_path)
+        
+        if info and info['doc_number'] and info['rev']:
+            data = {
+                'path': file_path,
+                'old_name': file_path.name,
+                'doc_no': info['doc_no'],
+                'doc_number': info['doc_number'],
+                'rev': info['rev'],
+                'date': info['date'],
+                'date_str': info['date_str'],
+                'report_title': info['report_title'],
+                'period': info['period'],
+                'new_name': None,
+                'status': 'در انتظار'
+            }
+        else:
+            data = _empty_file_data(file_path, 'خطا - اطلاعات کافی یافت نشد')
+            print(f"   ❌ نتوانستیم اطلاعات لازم را استخراج کنیم!")
+    
+    except Exception as e:
+        print(f"   ❌ خطای غیرمنتظره: {str(e)}")
+        data = _empty_file_data(file_path, f'خطا: {str(e)}')
+    
+    # آمار الگوها در پردازش‌های فرزند با atexit ذخیره نمی‌شود
+    get_registry().flush()
+    cache_delta = (cache.hits - hits_before, cache.misses - misses_before)
+    return data, os.getpid(), time.perf_counter() - started, cache_delta
+
+
+def print_worker_stats(worker_stats, elapsed):
+    """
+    نمایش آمار توان عملیاتی هر پردازش
+    """
+    total_files = sum(s['files'] for s in worker_stats.values())
+    print(f"\n⏱️ زمان استخراج: {elapsed:.1f} ثانیه "
+          f"({total_files / elapsed if elapsed else 0:.1f} فایل/ثانیه)")
+    for idx, (pid, s) in enumerate(sorted(worker_stats.items()), start=1):
+        rate = s['files'] / s['seconds'] if s['seconds'] else 0
+        print(f"   🧵 پردازش {idx} (PID {pid}): {s['files']} فایل، "
+              f"{s['seconds']:.1f} ثانیه، {rate:.2f} فایل/ثانیه")
+
+
+def rename_files(folder_path, dry_run=False, workers=1, retry_failed=False):
     """
     تغییر نام فایل‌های PDF و Word
     
     Args:
         folder_path: مسیر پوشه حاوی فایل‌ها
         dry_run: اگر True باشد، فقط شبیه‌سازی می‌کند و فایل‌ها را تغییر نام نمی‌دهد
+        workers: تعداد پردازش‌های همزمان برای استخراج اطلاعات (1 = ترتیبی)
+        retry_failed: فایل‌های بدون تغییری که قبلا ناموفق بوده‌اند دوباره استخراج شوند
     """
     print("="*80)
     print("🔄 تغییر نام Maintenance Monthly Reports")
@@ -437,66 +342,52 @@ def rename_files(folder_path, dry_run=False):
         return
     
     print(f"📁 {len(pdf_files)} فایل PDF و {len(word_files)} فایل Word پیدا شد\n")
+    
+    # فقط فایل‌های جدید یا تغییر یافته استخراج می‌شوند
+    files_data = []
+    manifest = get_manifest() if USE_MANIFEST else None
+    plan = None
+    if manifest:
+        plan = manifest.plan(all_files, retry_failed=retry_failed)
+        print_plan_summary(plan)
+        print()
+        all_files = plan['extract']
+        files_data.extend(_file_data_from_manifest(path, fields) for path, fields in plan['reuse'])
+        if not all_files and not files_data:
+            print("✅ فایل جدید یا تغییر یافته‌ای وجود ندارد.")
+            return
+    
     print("🔍 در حال استخراج اطلاعات...")
     print("-"*80)
     
     # استخراج اطلاعات
-    files_data = []
+    ocr_snapshot = ocr_stats_snapshot()
+    worker_stats = defaultdict(lambda: {'files': 0, 'seconds': 0.0})
+    extract_start = time.perf_counter()
+    # شمارنده‌های کش فقط وقتی جمع زده می‌شوند که استخراج واقعا در پردازش‌های فرزند انجام شده باشد
+    parallel = workers > 1 and len(all_files) > 1
+    
+    if parallel:
+        print(f"⚙️ حالت موازی: {workers} پردازش همزمان")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map ترتیب ورودی را حفظ می‌کند
+            results = list(executor.map(extract_file_info, all_files, chunksize=4))
+    else:
+        results = [extract_file_info(file_path) for file_path in all_files]
     
-    for file_path in all_files:
-        print(f"\n📄 پردازش: {file_path.name}")
+    for data, worker_pid, elapsed, (cache_hits, cache_misses) in results:
+        files_data.append(data)
+        if manifest:
+            manifest.record_extraction(data['path'], data, elapsed)
+        worker_stats[worker_pid]['files'] += 1
+        worker_stats[worker_pid]['seconds'] += elapsed
         
-        try:
-            if file_path.suffix.lower() == '.pdf':
-                info = extract_info_from_pdf(file_path)
-            else:
-                info = extract_info_from_word(file_path)
-            
-            if info and info['doc_number'] and info['rev']:
-                files_data.append({
-                    'path': file_path,
-                    'old_name': file_path.name,
-                    'doc_no': info['doc_no'],
-                    'doc_number': info['doc_number'],
-                    'rev': info['rev'],
-                    'date': info['date'],
-                    'date_str': info['date_str'],
-                    'report_title': info['report_title'],
-                    'period': info['period'],
-                    'new_name': None,
-                    'status': 'در انتظار'
-                })
-            else:
-                files_data.append({
-                    'path': file_path,
-                    'old_name': file_path.name,
-                    'doc_no': None,
-                    'doc_number': None,
-                    'rev': None,
-                    'date': None,
-                    'date_str': None,
-                    'report_title': None,
-                    'period': None,
-                    'new_name': None,
-                    'status': 'خطا - اطلاعات کافی یافت نشد'
-                })
-                print(f"   ❌ نتوانستیم اطلاعات لازم را استخراج کنیم!")
-        
-        except Exception as e:
-            print(f"   ❌ خطای غیرمنتظره: {str(e)}")
-            files_data.append({
-                'path': file_path,
-                'old_name': file_path.name,
-                'doc_no': None,
-                'doc_number': None,
-                'rev': None,
-                'date': None,
-                'date_str': None,
-                'report_title': None,
-                'period': None,
-                'new_name': None,
-                'status': f'خطا: {str(e)}'
-            })
+        # شمارنده‌های کش در پردازش‌های فرزند جمع‌آوری می‌شوند
+        if parallel:
+            get_default_cache().hits += cache_hits
+            get_default_cache().misses += cache_misses
+    
+    extract_elapsed = time.perf_counter() - extract_start
     
     print("-"*80)
     
@@ -530,30 +421,30 @@ def rename_files(folder_path, dry_run=False):
         renamed_count = 0
         failed_count = 0
         
-        for data in files_data:
-            if data['new_name']:
-                old_path = data['path']
-                new_name = data['new_name']
-                new_path = old_path.parent / new_name
-                
-                # بررسی تکراری بودن نام
-                if new_path.exists() and new_path != old_path:
-                    print(f"⚠️ فایل با این نام وجود دارد: {new_name}")
-                    data['status'] = 'رد شده - نام تکراری در سیستم فایل'
-                    failed_count += 1
-                    continue
-                
-                try:
-                    old_path.rename(new_path)
-                    renamed_count += 1
-                    data['status'] = '✅ موفق'
-                    print(f"✅ {old_path.name}")
-                    print(f"   ➜ {new_name}")
-                except Exception as e:
-                    print(f"❌ خطا در تغییر نام: {str(e)}")
-                    data['status'] = f'❌ خطا: {str(e)}'
-                    failed_count += 1
+        # کل نگاشت یکجا برنامه‌ریزی و دو مرحله‌ای اجرا می‌شود (جابجایی نام‌ها هم پشتیبانی می‌شود)
+        pending = [data for data in files_data if data['new_name']]
+        failed_count += len(files_data) - len(pending)
+        outcome = apply_renames(folder_path, [(data['path'].name, data['new_name']) for data in pending])
+        
+        for data in pending:
+            old_path = data['path']
+            new_name = data['new_name']
+            final_name, status = outcome[old_path.name]
+            
+            if status in ('renamed', 'unchanged'):
+                if manifest:
+                    manifest.record_rename(old_path, new_name)
+                renamed_count += 1
+                data['status'] = '✅ موفق'
+                print(f"✅ {old_path.name}")
+                print(f"   ➜ {new_name}")
+            elif status == 'collision':
+                print(f"⚠️ فایل با این نام وجود دارد: {new_name}")
+                data['status'] = 'رد شده - نام تکراری در سیستم فایل'
+                failed_count += 1
             else:
+                print(f"❌ خطا در تغییر نام: {old_path.name} ({STATUS_LABELS[status]})")
+                data['status'] = f'❌ خطا: {STATUS_LABELS[status]}'
                 failed_count += 1
         
         print("-"*80)
@@ -587,6 +478,9 @@ def rename_files(folder_path, dry_run=False):
     print(f"   ✅ موفق: {renamed_count}")
     print(f"   ❌ ناموفق: {failed_count}")
     print(f"   📝 کل فایل‌ها: {len(files_data)}")
+    print_worker_stats(worker_stats, extract_elapsed)
+    print_ocr_stats(since=ocr_snapshot)
+    get_default_cache().print_stats()
     print("="*80)
     
     return excel_path
@@ -606,6 +500,12 @@ def main():
     # استفاده از مسیر فعلی برای تست
     FOLDER_PATH = os.path.join(os.getcwd(), "test_reports")
     
+    # تعداد پردازش‌های همزمان برای استخراج (1 = ترتیبی)
+    WORKERS = os.cpu_count() or 1
+    
+    # فایل‌های بدون تغییری که در اجراهای قبل ناموفق بوده‌اند دوباره بررسی شوند؟
+    RETRY_FAILED = '--retry-failed' in sys.argv
+    
     print("\n" + "="*80)
     print("🔧 Maintenance Monthly Reports - File Renamer")
     print("نسخه بهبود یافته")
@@ -639,10 +539,10 @@ def main():
     
     if choice == '1':
         print("\n✅ اجرای واقعی شروع می‌شود...\n")
-        excel_path = rename_files(FOLDER_PATH, dry_run=False)
+        excel_path = rename_files(FOLDER_PATH, dry_run=False, workers=WORKERS, retry_failed=RETRY_FAILED)
     elif choice == '2':
         print("\n🔍 حالت تست (Dry Run) شروع می‌شود...\n")
-        excel_path = rename_files(FOLDER_PATH, dry_run=True)
+        excel_path = rename_files(FOLDER_PATH, dry_run=True, workers=WORKERS, retry_failed=RETRY_FAILED)
     else:
         print("\n❌ عملیات لغو شد.")
         return
@@ -6,66 +6,27 @@ from datetime import datetime
 import PyPDF2
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
 from collections import defaultdict
 
+from pdf_progressive_ocr import progressive_ocr, ocr_stats_snapshot, print_ocr_stats
+from date_normalize import parse_date as parse_date_to_excel
+
 # تنظیم مسیر Tesseract (در صورت نیاز)
+# import pytesseract
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-def parse_date_to_excel(date_str):
-    """
-    تبدیل تاریخ به فرمت اکسل (dd/mm/yyyy)
-    ورودی: 8-Dec-2023 یا 08-Dec-2023
-    خروجی: datetime object
-    """
-    if not date_str:
-        return None
-    
-    try:
-        months = {
-            'jan': 1, 'january': 1,
-            'feb': 2, 'february': 2,
-            'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4,
-            'may': 5,
-            'jun': 6, 'june': 6,
-            'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8,
-            'sep': 9, 'september': 9,
-            'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11,
-            'dec': 12, 'december': 12
-        }
-        
-        parts = date_str.split('-')
-        if len(parts) == 3:
-            day = int(parts[0])
-            month_name = parts[1].lower()
-            year = int(parts[2])
-            
-            month = months.get(month_name)
-            if month:
-                return datetime(year, month, day)
-    except:
-        pass
-    
-    return None
+# فیلدهایی که extract_info_from_pdf از متن OCR استخراج می‌کند؛ الگوهای Doc No و تاریخ
+# این اسکریپت بدون برچسب هم کار می‌کنند
+OCR_FIELDS = ('doc_no', 'date', 'crude_title')
 
 def extract_text_from_pdf_with_ocr(pdf_path):
     """
     استخراج متن از PDF با استفاده از OCR (برای PDF های اسکن شده)
+    ابتدا نوار بالای صفحه با DPI پایین، سپس در صورت نیاز DPI و ناحیه بزرگ‌تر
     """
     try:
         print(f"   🔍 تلاش برای OCR...")
-        # تبدیل PDF به تصویر
-        images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300)
-        
-        if images:
-            # OCR روی اولین صفحه
-            text = pytesseract.image_to_string(images[0], lang='eng')
-            return text
+        return progressive_ocr(pdf_path, fields=OCR_FIELDS, require_labels=False)
     except Exception as e:
         print(f"   ⚠️ خطا در OCR: {str(e)}")
     
@@ -308,6 +269,7 @@ def rename_files(folder_path):
     print("🔄 تغییر نام فایل‌های Acceptance Reports")
     print("="*80)
     print(f"📂 مسیر پوشه: {folder_path}\n")
+    ocr_snapshot = ocr_stats_snapshot()
     
     # پیدا کردن فایل‌ها
     pdf_files = list(Path(folder_path).glob('*.pdf'))
@@ -439,6 +401,7 @@ def rename_files(folder_path):
     print(f"\n📊 نتیجه:")
     print(f"   ✅ تعداد فایل‌های تغییر نام داده شده: {renamed_count}")
     print(f"   ❌ تعداد فایل‌های ناموفق: {failed_count}")
+    print_ocr_stats(since=ocr_snapshot)
     print("="*80)
 
 def main():
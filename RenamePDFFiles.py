@@ -1,13 +1,27 @@
 import os
 import re
+import sys
 import fitz  # PyMuPDF
 import pandas as pd
 from PIL import Image
 import io
-import cv2
-import numpy as np
+import time
+import importlib.util
+from collections import defaultdict
+
+from pdf_text_engine import extract_text, TEXT_ENGINES
+from ocr_preprocess import PreprocessPipeline, default_pipeline
+from ocr_service import OCRClient, OCRServiceUnavailable, run_tesseract_batch, run_easyocr_batch, run_paddle_each
+from doc_patterns import extract as extract_fields
+
+# سعی کنید هر سه را امتحان کنید
+# pytesseract در ocr_service.run_tesseract_batch استفاده می‌شود؛ اینجا فقط نصب بودن بررسی می‌شود
+TESSERACT_AVAILABLE = importlib.util.find_spec('pytesseract') is not None
+if TESSERACT_AVAILABLE:
+    print("✅ Tesseract در دسترس است")
+else:
+    print("⚠️  Tesseract در دسترس نیست")
 
-# سعی کنید هر دو را امتحان کنید
 try:
     import easyocr
     EASYOCR_AVAILABLE = True
@@ -25,21 +39,66 @@ except:
     print("⚠️  PaddleOCR در دسترس نیست")
 
 
+# ترتیب اجرای موتورهای OCR (از ارزان به گران)
+OCR_CASCADE = ['tesseract', 'easyocr', 'paddle']
+
+# حداقل میانگین اطمینان کلمات (0 تا 100) برای پذیرش نتیجه یک موتور
+OCR_MIN_CONFIDENCE = 70
+
+# نتیجه صفحه اول (جدول عنوان) فقط وقتی پذیرفته می‌شود که Doc No هم در آن پیدا شود؛
+# صفحات بعدی Doc No ندارند و فقط با معیار اطمینان پذیرفته می‌شوند
+OCR_REQUIRE_DOC_NO = True
+
+# استفاده از سرویس OCR محلی (python ocr_service.py serve) در صورت فعال بودن
+USE_OCR_SERVICE = True
+
+# تعداد تصاویر در هر دسته OCR
+OCR_BATCH_SIZE = 8
+
+# تعداد PDF هایی که صفحاتشان با هم OCR می‌شوند (محدودیت حافظه)
+OCR_PDF_GROUP = 4
+
+
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, min_confidence=OCR_MIN_CONFIDENCE, require_doc_no=OCR_REQUIRE_DOC_NO,
+                 cascade=None, use_service=USE_OCR_SERVICE, batch_size=OCR_BATCH_SIZE,
+                 preprocess=None):
         self.easy_reader = None
         self.paddle_ocr = None
+        self.tesseract = TESSERACT_AVAILABLE
+        self.min_confidence = min_confidence
+        self.require_doc_no = require_doc_no
+        self.cascade = cascade or OCR_CASCADE
+        self.batch_size = max(1, batch_size)
+        
+        # خط لوله پیش‌پردازش (پیش‌فرض: نتیجه ocr_preprocess.py tune یا رفتار قبلی)
+        self.preprocess = PreprocessPipeline(preprocess) if preprocess else default_pipeline()
+        
+        # آمار هر موتور: تعداد تصویر، تعداد دسته، زمان کل، تعداد پذیرفته شده
+        self.ocr_stats = defaultdict(lambda: {'calls': 0, 'batches': 0, 'seconds': 0.0, 'accepted': 0})
         
-        # راه‌اندازی OCR engines
-        if EASYOCR_AVAILABLE:
+        # اگر سرویس OCR در حال اجراست، مدل‌ها از قبل بارگذاری شده‌اند
+        self.ocr_client = OCRClient.connect() if use_service else None
+        if self.ocr_client:
+            print(f"✅ سرویس OCR فعال است: {self.ocr_client.url} ({', '.join(self.ocr_client.engines)})")
+        
+        # راه‌اندازی OCR engines (فقط موتورهایی که سرویس ندارد)
+        for name in ('easyocr', 'paddle'):
+            if not self._served(name):
+                self._init_local_engine(name)
+    
+    def _init_local_engine(self, name):
+        """
+        بارگذاری مدل محلی یک موتور (اگر نصب باشد و قبلا بارگذاری نشده باشد)
+        """
+        if name == 'easyocr' and EASYOCR_AVAILABLE and self.easy_reader is None:
             try:
                 print("🔧 راه‌اندازی EasyOCR...")
                 self.easy_reader = easyocr.Reader(['en'], gpu=False, verbose=False)
                 print("✅ EasyOCR آماده است")
             except Exception as e:
                 print(f"⚠️  خطا در راه‌اندازی EasyOCR: {e}")
-        
-        if PADDLE_AVAILABLE:
+        elif name == 'paddle' and PADDLE_AVAILABLE and self.paddle_ocr is None:
             try:
                 print("🔧 راه‌اندازی PaddleOCR...")
                 self.paddle_ocr = PaddleOCR(use_angle_cls=True, lang='en', show_log=False)
@@ -47,128 +106,209 @@ class PDFProcessor:
             except Exception as e:
                 print(f"⚠️  خطا در راه‌اندازی PaddleOCR: {e}")
     
+    def _served(self, engine):
+        return bool(self.ocr_client) and engine in self.ocr_client.engines
+    
     def preprocess_image(self, image):
         """
         پیش‌پردازش تصویر برای بهبود OCR
+        مراحل از خط لوله قابل تنظیم خوانده می‌شوند (ocr_preprocess.py)
         """
-        # تبدیل PIL به numpy array
-        if isinstance(image, Image.Image):
-            img = np.array(image)
-        else:
-            img = image
-        
-        # تبدیل به grayscale
-        if len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = img
-        
-        # افزایش کنتراست
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(gray)
+        return self.preprocess(image)
+    
+    def _ocr_batch(self, name, images):
+        """
+        اجرای یک موتور روی گروهی از تصاویر؛ خروجی: [(متن، اطمینان), ...]
+        """
+        if self._served(name) and not (name == 'tesseract' and self.tesseract):
+            try:
+                return self.ocr_client.ocr(name, images)
+            except OCRServiceUnavailable as e:
+                # سرویس وسط کار متوقف شده: بقیه کار با موتورهای محلی
+                print(f"    ⚠️  {e} - ادامه با موتورهای محلی")
+                self.ocr_client = None
+                for engine in ('easyocr', 'paddle'):
+                    self._init_local_engine(engine)
+        if name == 'tesseract' and self.tesseract:
+            return run_tesseract_batch(images)
+        if name == 'easyocr' and self.easy_reader is not None:
+            return run_easyocr_batch(self.easy_reader, images, batch_size=self.batch_size)
+        if name == 'paddle' and self.paddle_ocr is not None:
+            return run_paddle_each(self.paddle_ocr, images)
+        raise RuntimeError(f"موتور {name} به صورت محلی در دسترس نیست")
+    
+    def available_ocr_engines(self):
+        """
+        موتورهای OCR راه‌اندازی شده به ترتیب cascade
+        """
+        ready = {
+            'tesseract': self.tesseract or self._served('tesseract'),
+            'easyocr': self.easy_reader is not None or self._served('easyocr'),
+            'paddle': self.paddle_ocr is not None or self._served('paddle'),
+        }
+        return [name for name in self.cascade if ready.get(name)]
+    
+    def ocr_images(self, images, needs_doc_no=None):
+        """
+        OCR گروهی تصاویر به صورت آبشاری:
+        هر موتور روی همه تصاویر باقی‌مانده در دسته‌های batch_size تایی اجرا می‌شود؛
+        تصویری که اطمینان کافی داشت (و در صورت نیاز Doc No در آن پیدا شد)، به موتور بعدی نمی‌رود
         
-        # Denoising
-        denoised = cv2.fastNlMeansDenoising(enhanced)
+        needs_doc_no: برای هر تصویر، آیا Doc No شرط پذیرش است (پیش‌فرض: همه تصاویر)
+        """
+        if needs_doc_no is None:
+            needs_doc_no = [True] * len(images)
+        processed = [self.preprocess_image(img) for img in images]
+        final = [None] * len(images)
+        partial = [[] for _ in images]
+        pending = list(range(len(images)))
         
-        # Thresholding
-        _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        for name in self.available_ocr_engines():
+            if not pending:
+                break
+            for start in range(0, len(pending), self.batch_size):
+                chunk = pending[start:start + self.batch_size]
+                started = time.perf_counter()
+                try:
+                    outputs = self._ocr_batch(name, [processed[i] for i in chunk])
+                except Exception as e:
+                    print(f"    ⚠️  خطا در {name}: {e}")
+                    continue
+                finally:
+                    self.ocr_stats[name]['calls'] += len(chunk)
+                    self.ocr_stats[name]['batches'] += 1
+                    self.ocr_stats[name]['seconds'] += time.perf_counter() - started
+                
+                for i, (text, confidence) in zip(chunk, outputs):
+                    has_doc_no = bool(self.extract_doc_info(text, verbose=False)['doc_no'])
+                    accepted = confidence >= self.min_confidence and (
+                        has_doc_no or not (self.require_doc_no and needs_doc_no[i]))
+                    print(f"    🔎 {name} [{i + 1}/{len(images)}]: اطمینان {confidence:.0f}% | "
+                          f"Doc No: {'✅' if has_doc_no else '❌'}")
+                    if accepted:
+                        self.ocr_stats[name]['accepted'] += 1
+                        final[i] = text
+                    else:
+                        partial[i].append(text)
+            pending = [i for i in pending if final[i] is None]
         
-        return binary
+        # هیچ موتوری کافی نبود: ترکیب همه نتایج
+        for i in pending:
+            final[i] = "\n".join(partial[i])
+        return final
     
     def extract_text_with_ocr(self, image):
         """
-        استخراج متن با استفاده از OCR (چند روش)
+        استخراج متن یک تصویر با OCR آبشاری
+        """
+        return self.ocr_images([image])[0]
+    
+    def print_ocr_stats(self):
+        """
+        نمایش زمان و تعداد پذیرش هر موتور OCR
+        """
+        if not self.ocr_stats:
+            return
+        print(f"\n⏱️ آمار موتورهای OCR (batch_size={self.batch_size}):")
+        for name in self.cascade:
+            s = self.ocr_stats.get(name)
+            if not s:
+                continue
+            avg = s['seconds'] / s['calls'] if s['calls'] else 0
+            print(f"  {name:<10} {s['calls']:>4} تصویر در {s['batches']:>3} دسته | "
+                  f"{s['accepted']:>4} پذیرفته | {s['seconds']:>7.1f} ثانیه (میانگین {avg:.2f})")
+        self.preprocess.print_timings()
+    
+    def _render_page(self, page):
+        # تبدیل صفحه به تصویر با کیفیت بالا
+        mat = fitz.Matrix(3, 3)  # zoom factor = 3
+        pix = page.get_pixmap(matrix=mat)
+        return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    
+    def extract_texts_from_pdfs(self, pdf_paths):
         """
-        text_results = []
+        استخراج متن از چند PDF؛ صفحات نیازمند OCR از همه فایل‌ها جمع‌آوری و گروهی OCR می‌شوند
         
-        # پیش‌پردازش تصویر
-        processed_img = self.preprocess_image(image)
+        Returns:
+            {pdf_path: text}
+        """
+        # {pdf_path: {page_num: text}}
+        page_texts = {pdf_path: {} for pdf_path in pdf_paths}
+        ocr_jobs = []   # (pdf_path, page_num, image)
         
-        # روش 1: EasyOCR
-        if self.easy_reader:
+        for pdf_path in pdf_paths:
+            # مسیر سریع: اگر لایه متنی صفحه اول (جدول عنوان) کافی است، نیازی به OCR صفحه‌به‌صفحه نیست
+            # (متن صفحات 2 و 3 نباید کمبود متن صفحه اول اسکن شده را پنهان کند)
             try:
-                result = self.easy_reader.readtext(processed_img, detail=0, paragraph=True)
-                text = " ".join(result)
-                text_results.append(text)
+                first, engine = extract_text(pdf_path, pages=(1, 1), family='REWK', engines=TEXT_ENGINES)
+                if first and len(first.strip()) > 100:
+                    text, engine = extract_text(pdf_path, pages=(1, 3), family='REWK', engines=TEXT_ENGINES)
+                    print(f"  ✅ {os.path.basename(pdf_path)}: متن مستقیم استخراج شد ({engine})")
+                    page_texts[pdf_path][0] = text
+                    continue
             except Exception as e:
-                print(f"    ⚠️  خطا در EasyOCR: {e}")
-        
-        # روش 2: PaddleOCR
-        if self.paddle_ocr:
+                print(f"  ⚠️  خطا در استخراج متن مستقیم: {e}")
+            
             try:
-                result = self.paddle_ocr.ocr(processed_img, cls=True)
-                if result and result[0]:
-                    text = " ".join([line[1][0] for line in result[0]])
-                    text_results.append(text)
+                doc = fitz.open(pdf_path)
+                print(f"  📄 {os.path.basename(pdf_path)}: تعداد صفحات: {len(doc)}")
+                
+                # بررسی 3 صفحه اول
+                for page_num in range(min(3, len(doc))):
+                    page = doc[page_num]
+                    page_text = page.get_text()
+                    
+                    if page_text and len(page_text.strip()) > 100:
+                        print(f"  ✅ صفحه {page_num + 1}: متن مستقیم استخراج شد")
+                        page_texts[pdf_path][page_num] = page_text
+                    else:
+                        print(f"  📷 صفحه {page_num + 1}: در صف OCR")
+                        ocr_jobs.append((pdf_path, page_num, self._render_page(page)))
+                doc.close()
             except Exception as e:
-                print(f"    ⚠️  خطا در PaddleOCR: {e}")
+                print(f"  ❌ خطا در پردازش PDF: {str(e)}")
         
-        # ترکیب نتایج
-        combined_text = "\n".join(text_results)
-        return combined_text
+        if ocr_jobs:
+            print(f"  🔍 OCR گروهی {len(ocr_jobs)} صفحه...")
+            results = self.ocr_images([job[2] for job in ocr_jobs],
+                                      needs_doc_no=[job[1] == 0 for job in ocr_jobs])
+            
+            # صفحاتی که OCR نتیجه کافی نداد: تصاویر داخل صفحه (حداکثر 3 تصویر)
+            image_jobs = []   # (pdf_path, page_num, image)
+            for (pdf_path, page_num, _), ocr_text in zip(ocr_jobs, results):
+                if ocr_text and len(ocr_text.strip()) > 50:
+                    page_texts[pdf_path][page_num] = ocr_text
+                    continue
+                print(f"    ⚠️  {os.path.basename(pdf_path)} صفحه {page_num + 1}: OCR نتیجه کافی نداد")
+                page_texts[pdf_path][page_num] = ""
+                try:
+                    doc = fitz.open(pdf_path)
+                    for img in doc[page_num].get_images()[:3]:
+                        base_image = doc.extract_image(img[0])
+                        image_jobs.append((pdf_path, page_num, Image.open(io.BytesIO(base_image["image"]))))
+                    doc.close()
+                except Exception as e:
+                    print(f"    ⚠️  خطا در استخراج تصاویر: {e}")
+            
+            if image_jobs:
+                print(f"  📷 OCR گروهی {len(image_jobs)} تصویر داخلی...")
+                image_texts = self.ocr_images([j[2] for j in image_jobs],
+                                              needs_doc_no=[j[1] == 0 for j in image_jobs])
+                for (pdf_path, page_num, _), img_text in zip(image_jobs, image_texts):
+                    page_texts[pdf_path][page_num] += img_text + "\n"
+        
+        return {
+            pdf_path: "".join(t + "\n" for _, t in sorted(pages.items()))
+            for pdf_path, pages in page_texts.items()
+        }
     
     def extract_text_from_pdf(self, pdf_path):
         """
         استخراج متن از PDF (هم متنی و هم اسکن شده)
         """
-        all_text = ""
-        
-        try:
-            doc = fitz.open(pdf_path)
-            print(f"  📄 تعداد صفحات: {len(doc)}")
-            
-            # بررسی 3 صفحه اول
-            for page_num in range(min(3, len(doc))):
-                page = doc[page_num]
-                
-                # ابتدا تلاش برای استخراج متن مستقیم
-                page_text = page.get_text()
-                
-                if page_text and len(page_text.strip()) > 100:
-                    print(f"  ✅ صفحه {page_num + 1}: متن مستقیم استخراج شد")
-                    all_text += page_text + "\n"
-                else:
-                    print(f"  📷 صفحه {page_num + 1}: استفاده از OCR...")
-                    
-                    # تبدیل صفحه به تصویر با کیفیت بالا
-                    mat = fitz.Matrix(3, 3)  # zoom factor = 3
-                    pix = page.get_pixmap(matrix=mat)
-                    
-                    # تبدیل به PIL Image
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    
-                    # OCR روی تصویر
-                    ocr_text = self.extract_text_with_ocr(img)
-                    
-                    if ocr_text and len(ocr_text.strip()) > 50:
-                        print(f"    ✅ OCR موفق: {len(ocr_text)} کاراکتر")
-                        all_text += ocr_text + "\n"
-                    else:
-                        print(f"    ⚠️  OCR نتیجه کافی نداد")
-                        
-                        # تلاش با استخراج تصاویر موجود در PDF
-                        image_list = page.get_images()
-                        for img_index, img in enumerate(image_list[:3]):  # حداکثر 3 تصویر
-                            try:
-                                xref = img[0]
-                                base_image = doc.extract_image(xref)
-                                image_bytes = base_image["image"]
-                                image = Image.open(io.BytesIO(image_bytes))
-                                
-                                print(f"    📷 OCR روی تصویر شماره {img_index + 1}...")
-                                img_text = self.extract_text_with_ocr(image)
-                                all_text += img_text + "\n"
-                            except Exception as e:
-                                print(f"    ⚠️  خطا در تصویر {img_index + 1}: {e}")
-            
-            doc.close()
-            
-        except Exception as e:
-            print(f"  ❌ خطا در پردازش PDF: {str(e)}")
-        
-        return all_text
+        return self.extract_texts_from_pdfs([pdf_path])[pdf_path]
     
-    def extract_doc_info(self, text):
+    def extract_doc_info(self, text, verbose=True):
         """
         استخراج اطلاعات از متن با الگوهای بهبود یافته
         """
@@ -180,25 +320,18 @@ class PDFProcessor:
         # تمیز کردن متن
         text = re.sub(r'\s+', ' ', text)
         
-        print(f"  🔍 طول متن استخراج شده: {len(text)} کاراکتر")
+        if verbose:
+            print(f"  🔍 طول متن استخراج شده: {len(text)} کاراکتر")
         
-        # الگوهای گسترده‌تر برای Doc No
-        doc_patterns = [
-            r'Doc\s*\.?\s*No\s*\.?\s*[:\-]?\s*([A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)',
-            r'Document\s+No\s*\.?\s*[:\-]?\s*([A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)',
-            r'DOC\s*\.?\s*NO\s*\.?\s*[:\-]?\s*([A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)',
-            r'Doc\s+Number\s*[:\-]?\s*([A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)',
-            r'([A-Z]{3,5}\-[A-Z]{3,10}\-[A-Z]{3,10}\-[A-Z]{3,10}\-\d+\-G\d{2})',
-        ]
+        # الگوهای Doc No و Date از مخزن مشترک (خانواده GENERIC)
+        info = extract_fields(text, 'GENERIC')
         
-        for pattern in doc_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                doc_no = match.group(1).strip()
-                doc_no = re.sub(r'\s+', '-', doc_no)
-                doc_no = re.sub(r'-+', '-', doc_no)
+        if info['doc_no']:
+            doc_no = info['doc_no'].strip()
+            doc_no = re.sub(r'\s+', '-', doc_no)
+            doc_no = re.sub(r'-+', '-', doc_no)
+            if verbose:
                 print(f"  ✅ Doc No یافت شد: {doc_no}")
-                break
         
         # استخراج Number و Rev
         if doc_no:
@@ -210,7 +343,8 @@ class PDFProcessor:
                     rev = part.upper()
                     if i > 0:
                         number = parts[i-1]
-                    print(f"  ✅ Number: {number}, Rev: {rev}")
+                    if verbose:
+                        print(f"  ✅ Number: {number}, Rev: {rev}")
                     break
             
             # اگر پیدا نشد، از آخرین قسمت‌ها استفاده کن
@@ -219,23 +353,14 @@ class PDFProcessor:
                 if re.match(r'G?\d{2}', parts[-1]):
                     rev = 'G' + re.sub(r'[^0-9]', '', parts[-1])
                     number = parts[-2]
-                    print(f"  ℹ️  Number: {number}, Rev: {rev} (استنباطی)")
+                    if verbose:
+                        print(f"  ℹ️  Number: {number}, Rev: {rev} (استنباطی)")
         
-        # الگوهای تاریخ
-        date_patterns = [
-            r'Date\s*[:\-]?\s*(\d{1,2}[\s/\-\.]\w+[\s/\-\.]\d{2,4})',
-            r'DATE\s*[:\-]?\s*(\d{1,2}[\s/\-\.]\w+[\s/\-\.]\d{2,4})',
-            r'(\d{1,2}[\s/\-\.](Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*[\s/\-\.]\d{2,4})',
-            r'Date\s*[:\-]?\s*(\d{1,2}[\s/\-\.]\d{1,2}[\s/\-\.]\d{2,4})',
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                date = match.group(1).strip()
-                date = re.sub(r'\s+', ' ', date)
+        if info['date']:
+            date = info['date'].strip()
+            date = re.sub(r'\s+', ' ', date)
+            if verbose:
                 print(f"  ✅ Date یافت شد: {date}")
-                break
         
         return {
             'doc_no': doc_no,
@@ -265,9 +390,11 @@ def process_pdfs(directory_path):
     
     processor = PDFProcessor()
     
-    if not processor.easy_reader and not processor.paddle_ocr:
+    if not processor.available_ocr_engines():
         print("\n❌ هیچ OCR engine‌ای در دسترس نیست!")
         print("لطفاً یکی از این دستورات را اجرا کنید:")
+        print("  pip install pytesseract")
+        print("  یا")
         print("  pip install easyocr")
         print("  یا")
         print("  pip install paddlepaddle paddleocr")
@@ -277,7 +404,15 @@ def process_pdfs(directory_path):
     renamed_count = 0
     failed_count = 0
     
+    group_texts = {}
+    
     for idx, pdf_file in enumerate(pdf_files, 1):
+        # صفحات چند PDF با هم OCR می‌شوند
+        if (idx - 1) % OCR_PDF_GROUP == 0:
+            group = [os.path.join(directory_path, f) for f in pdf_files[idx - 1:idx - 1 + OCR_PDF_GROUP]]
+            print(f"\n📦 استخراج متن فایل‌های {idx} تا {idx + len(group) - 1}...")
+            group_texts = processor.extract_texts_from_pdfs(group)
+        
         print(f"\n[{idx}/{len(pdf_files)}] 🔍 {pdf_file}")
         print("-"*70)
         
@@ -285,7 +420,7 @@ def process_pdfs(directory_path):
         
         try:
             # استخراج متن
-            text = processor.extract_text_from_pdf(pdf_path)
+            text = group_texts.get(pdf_path, "")
             
             if len(text.strip()) < 50:
                 print(f"  ⚠️  متن کافی استخراج نشد ({len(text)} کاراکتر)")
@@ -377,13 +512,56 @@ def process_pdfs(directory_path):
     print(f"  ✅ موفق: {renamed_count} فایل")
     print(f"  ❌ ناموفق: {failed_count} فایل")
     print(f"  📁 کل: {len(pdf_files)} فایل")
+    processor.print_ocr_stats()
     print(f"\n📄 گزارش کامل: {excel_path}")
     print(f"{'='*70}")
 
 
+def benchmark_ocr_batching(directory_path, batch_sizes=(1, 4, 8, 16), max_pages=24):
+    """
+    مقایسه توان عملیاتی OCR صفحه‌به‌صفحه (batch_size=1) با OCR گروهی
+    """
+    pdf_files = sorted(f for f in os.listdir(directory_path) if f.lower().endswith('.pdf'))
+    processor = PDFProcessor()
+    
+    # جمع‌آوری تصاویر صفحات (بدون مسیر سریع متنی)
+    images = []
+    for pdf_file in pdf_files:
+        doc = fitz.open(os.path.join(directory_path, pdf_file))
+        for page_num in range(min(3, len(doc))):
+            images.append(processor._render_page(doc[page_num]))
+            if len(images) >= max_pages:
+                break
+        doc.close()
+        if len(images) >= max_pages:
+            break
+    
+    if not images:
+        print("⚠️  هیچ صفحه‌ای برای بنچمارک یافت نشد!")
+        return
+    
+    print(f"\n🏁 بنچمارک OCR گروهی روی {len(images)} صفحه")
+    print("="*70)
+    baseline = None
+    for batch_size in batch_sizes:
+        processor.batch_size = batch_size
+        processor.ocr_stats.clear()
+        started = time.perf_counter()
+        processor.ocr_images(images)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"  batch_size={batch_size:<4} {elapsed:>7.1f} ثانیه | "
+              f"{len(images) / elapsed:>5.2f} صفحه/ثانیه | x{baseline / elapsed:.2f}")
+    print("="*70)
+
+
 if __name__ == "__main__":
     folder_path = r"D:\Sepher_Pasargad\works\Maintenace\Maintenance Report\All_Extracted\weekly"
     
+    if '--benchmark-batch' in sys.argv:
+        benchmark_ocr_batching(folder_path)
+        sys.exit(0)
+    
     print("🚀 شروع پردازش فایل‌های PDF...")
     print("="*70)
     
@@ -1,16 +1,23 @@
 import fitz
 from PIL import Image
 import pytesseract
-from deep_translator import GoogleTranslator
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-import arabic_reshaper
-from bidi.algorithm import get_display
 import re
+import os
+import sys
 import time
 import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from translation_memory import translate_segments, get_backend, get_translation_memory
+from translation_dispatcher import TranslationDispatcher
+from glossary_engine import Glossary
+from translation_checkpoint import TranslationCheckpoint, parse_pages
+from persian_layout import PersianLayout
 
 # تنظیمات
 INPUT_PDF = "SP-CA-SE-PD-0051.pdf"
@@ -19,6 +26,33 @@ START_PAGE = 14
 END_PAGE = 34
 FONT_PATH = "BNazanin.ttf"
 
+# پردازش خط لوله‌ای: رندر صفحات، OCR موازی و ترجمه همزمان
+PIPELINE = True
+OCR_WORKERS = os.cpu_count() or 1
+TRANSLATE_WORKERS = 4
+# حداکثر صفحات رندر شده در صف OCR (محدودیت حافظه)
+PIPELINE_DEPTH = OCR_WORKERS * 2
+RENDER_ZOOM = 2
+
+# استفاده مستقیم از لایه متنی PDF در صورت کیفیت کافی (OCR فقط برای صفحات تصویری)
+USE_TEXT_LAYER = True
+MIN_TEXT_LAYER_CHARS = 50
+MIN_TEXT_LAYER_CLEAN_RATIO = 0.9   # نسبت کاراکترهای قابل چاپ
+MIN_TEXT_LAYER_WORD_RATIO = 0.6    # نسبت کلمات دارای حرف
+
+# مترجم: 'google' یا 'stub' (محلی، بدون اینترنت)
+TRANSLATOR_BACKEND = os.environ.get('TRANSLATOR_BACKEND', 'google')
+# حافظه ترجمه دائمی (جمله‌های تکراری دوباره ارسال نمی‌شوند)
+USE_TRANSLATION_MEMORY = True
+# درخواست‌های همزمان به مترجم و سقف نرخ (درخواست در ثانیه) - به جای sleep ثابت
+TRANSLATE_CONCURRENCY = 4
+TRANSLATE_RATE = 5.0
+TRANSLATE_MAX_RETRIES = 3
+# واژه‌نامه کامل (CSV یا XLSX: ستون انگلیسی، ستون فارسی) - اضافه بر OIL_GAS_TERMS
+GLOSSARY_PATH = os.environ.get('GLOSSARY_PATH', 'oil_gas_glossary.xlsx')
+# ذخیره پیشرفت هر صفحه (ادامه کار پس از توقف یا خطا)
+USE_CHECKPOINT = True
+
 # ⚠️ مسیر Tesseract رو تنظیم کن
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -42,54 +76,158 @@ OIL_GAS_TERMS = {
     'Temperature': 'دما',
 }
 
-def extract_text_with_ocr(pdf_path, page_number):
-    """استخراج متن با OCR از صفحه PDF"""
-    doc = fitz.open(pdf_path)
+# واژه‌نامه کامپایل شده (یک گذر روی متن برای همه اصطلاحات)
+GLOSSARY = Glossary(OIL_GAS_TERMS)
+if GLOSSARY_PATH and os.path.exists(GLOSSARY_PATH):
+    GLOSSARY.load(GLOSSARY_PATH)
+
+# با تغییر اصطلاحات، ترجمه‌های ذخیره شده در حافظه ترجمه معتبر نیستند
+GLOSSARY_VERSION = GLOSSARY.version
+
+_backend = None
+# یک ارسال‌کننده برای هر مترجم (thread pool و محدودیت نرخ هر مترجم یک بار ساخته می‌شود)
+_dispatchers = {}
+_dispatchers_lock = threading.Lock()
+
+def get_translator():
+    """مترجم مشترک (یک بار ساخته می‌شود)"""
+    global _backend
+    if _backend is None:
+        _backend = get_backend(TRANSLATOR_BACKEND)
+    return _backend
+
+def get_dispatcher(translator=None):
+    """ارسال‌کننده مشترک هر مترجم؛ محدودیت نرخ بین همه صفحات در حال ترجمه مشترک است"""
+    translator = translator or get_translator()
+    with _dispatchers_lock:
+        if translator not in _dispatchers:
+            _dispatchers[translator] = TranslationDispatcher(translator, workers=TRANSLATE_CONCURRENCY,
+                                                             rate=TRANSLATE_RATE,
+                                                             max_retries=TRANSLATE_MAX_RETRIES)
+        return _dispatchers[translator]
+
+def close_dispatchers():
+    """نمایش آمار و بستن thread pool همه ارسال‌کننده‌ها"""
+    with _dispatchers_lock:
+        for dispatcher in _dispatchers.values():
+            dispatcher.print_stats()
+            dispatcher.close()
+        _dispatchers.clear()
+
+def apply_terms(translated):
+    """اعمال اصطلاحات تخصصی روی متن ترجمه شده"""
+    return GLOSSARY.apply(translated)
+
+def text_layer_usable(text):
+    """بررسی کیفیت لایه متنی: طول کافی، کاراکتر خراب کم و کلمات واقعی"""
+    stripped = text.strip()
+    if len(stripped) < MIN_TEXT_LAYER_CHARS:
+        return False
+    chars = [c for c in stripped if not c.isspace()]
+    clean = sum(1 for c in chars if c.isprintable() and c != '\ufffd')
+    if clean / len(chars) < MIN_TEXT_LAYER_CLEAN_RATIO:
+        return False
+    words = stripped.split()
+    wordlike = sum(1 for w in words if sum(c.isalpha() for c in w) >= 2)
+    return wordlike / len(words) >= MIN_TEXT_LAYER_WORD_RATIO
+
+def join_block_lines(text):
+    """خطوط یک بلوک (شکست خط صفحه، نه پایان جمله) با فاصله به هم چسبانده می‌شوند
+
+    کلمه‌ای که با خط تیره در انتهای خط شکسته شده دوباره یکی می‌شود
+    (خط تیره قبل از حرف بزرگ یا عدد، مثل شماره سند، حفظ می‌شود).
+    """
+    text = re.sub(r'(?<=[A-Za-z])-\s*\n\s*(?=[a-z])', '', text)
+    text = re.sub(r'-[ \t]*\n\s*(?=[A-Z0-9])', '-', text)
+    return ' '.join(line.strip() for line in text.splitlines() if line.strip())
+
+def extract_text_layer(doc, page_number):
+    """متن لایه متنی صفحه از بلوک‌ها به ترتیب موقعیت (بالا به پایین، چپ به راست)
+
+    هر بلوک یک پاراگراف است (خطوط بلوک به هم چسبانده می‌شوند) و بلوک‌ها با خط خالی جدا می‌شوند.
+    اگر لایه متنی قابل استفاده نباشد None برگردانده می‌شود.
+    """
     page = doc[page_number - 1]
-    
-    # تبدیل صفحه به تصویر
-    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # کیفیت بالا
-    img_data = pix.tobytes("png")
+    blocks = [(b[0], b[1], join_block_lines(b[4]))
+              for b in page.get_text("blocks")
+              if b[6] == 0 and b[4].strip()]  # فقط بلوک‌های متنی
+    blocks.sort(key=lambda b: (round(b[1]), b[0]))
+    text = "\n\n".join(b[2] for b in blocks)
+    return text if text_layer_usable(text) else None
+
+def render_page(doc, page_number, zoom=RENDER_ZOOM):
+    """تبدیل صفحه به تصویر PNG (بایت) از سند باز شده"""
+    page = doc[page_number - 1]
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))  # کیفیت بالا
+    return pix.tobytes("png")
+
+def ocr_page_image(img_data):
+    """OCR روی تصویر PNG؛ خروجی: (متن، زمان)
+
+    تابع سطح ماژول است تا در ProcessPoolExecutor قابل ارسال باشد.
+    """
+    started = time.perf_counter()
     img = Image.open(io.BytesIO(img_data))
-    
-    # OCR روی تصویر
     text = pytesseract.image_to_string(img, lang='eng')
-    
-    doc.close()
-    return text
+    return text, time.perf_counter() - started
+
+def extract_text_with_ocr(pdf_path, page_number, doc=None):
+    """استخراج متن با OCR از صفحه PDF
+
+    اگر doc داده شود از همان سند باز شده استفاده می‌شود.
+    """
+    if doc is not None:
+        return ocr_page_image(render_page(doc, page_number))[0]
+
+    doc = fitz.open(pdf_path)
+    try:
+        return ocr_page_image(render_page(doc, page_number))[0]
+    finally:
+        doc.close()
 
-def translate_text_with_terms(text, chunk_size=4000):
-    """ترجمه متن با حفظ اصطلاحات"""
+def extract_page_text(pdf_path, page_number, doc):
+    """متن صفحه از لایه متنی یا در صورت نبود آن با OCR؛ خروجی: (متن، مسیر 'text' یا 'ocr')"""
+    if USE_TEXT_LAYER:
+        text = extract_text_layer(doc, page_number)
+        if text is not None:
+            return text, 'text'
+    return extract_text_with_ocr(pdf_path, page_number, doc=doc), 'ocr'
+
+def print_path_stats(path_counts):
+    """نمایش تعداد صفحات پردازش شده با هر مسیر"""
+    if sum(path_counts.values()):
+        print(f"📑 منبع متن: لایه متنی {path_counts.get('text', 0)} صفحه | "
+              f"OCR {path_counts.get('ocr', 0)} صفحه")
+
+def translate_text_with_terms(text, chunk_size=4000, translator=None, memory=None,
+                              refresh=False, failed=None):
+    """ترجمه متن با حفظ اصطلاحات
+
+    جمله‌ها ابتدا در حافظه ترجمه جستجو می‌شوند و فقط جمله‌های جدید
+    به مترجم ارسال می‌شوند (refresh=True: ترجمه دوباره همه جمله‌ها).
+    جمله‌های ترجمه نشده به لیست failed اضافه می‌شوند.
+    """
     if not text or len(text.strip()) < 5:
         return ""
     
-    translator = GoogleTranslator(source='en', target='fa')
+    if memory is None and USE_TRANSLATION_MEMORY:
+        memory = get_translation_memory()
+    translator = translator or get_translator()
     
-    chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-    translated_chunks = []
-    
-    for i, chunk in enumerate(chunks):
-        try:
-            print(f"      ترجمه بخش {i+1}/{len(chunks)}...")
-            translated = translator.translate(chunk)
-            
-            # اعمال اصطلاحات
-            for eng, fa in OIL_GAS_TERMS.items():
-                translated = re.sub(r'\b' + eng + r'\b', fa, translated, flags=re.IGNORECASE)
-            
-            translated_chunks.append(translated)
-            time.sleep(0.3)
-            
-        except Exception as e:
-            print(f"      ⚠️ خطا: {e}")
-            translated_chunks.append(chunk)
-    
-    return " ".join(translated_chunks)
+    return translate_segments(text, translator, memory, glossary_version=GLOSSARY_VERSION,
+                              postprocess=apply_terms, chunk_size=chunk_size,
+                              dispatcher=get_dispatcher(translator),
+                              refresh=refresh, failed=failed)
 
 def create_pdf(output_path, pages_data, font_name):
-    """ایجاد PDF با متن فارسی"""
+    """ایجاد PDF با متن فارسی
+
+    خطوط با عرض واقعی حروف فونت شکسته می‌شوند (persian_layout).
+    """
     c = canvas.Canvas(output_path, pagesize=A4)
     page_width, page_height = A4
+    title_layout = PersianLayout(font_name, 14, page_width - 100)
+    text_layout = PersianLayout(font_name, 10, page_width - 100)
     
     for page_num, text in pages_data.items():
         print(f"   📄 ایجاد صفحه {page_num} در PDF...")
@@ -97,51 +235,212 @@ def create_pdf(output_path, pages_data, font_name):
         y_position = page_height - 50
         
         # عنوان صفحه
-        page_title = f"صفحه {page_num}"
-        reshaped = arabic_reshaper.reshape(page_title)
-        bidi_text = get_display(reshaped)
         c.setFont(font_name, 14)
-        c.drawRightString(page_width - 50, y_position, bidi_text)
+        for line in title_layout.wrap(f"صفحه {page_num}"):
+            c.drawRightString(page_width - 50, y_position, line)
         y_position -= 40
         
         # متن ترجمه شده
         if text:
-            reshaped = arabic_reshaper.reshape(text)
-            bidi_text = get_display(reshaped)
-            
-            lines = bidi_text.split('\n')
             c.setFont(font_name, 10)
             
-            for line in lines:
+            for line in text_layout.wrap(text):
                 if y_position < 50:
                     c.showPage()
+                    c.setFont(font_name, 10)
                     y_position = page_height - 50
                 
-                # هر خط رو به چند قطعه کوچیک تقسیم کن
-                max_width = 80
-                words = line.split()
-                current_line = ""
-                
-                for word in words:
-                    if len(current_line) + len(word) < max_width:
-                        current_line += word + " "
-                    else:
-                        c.drawRightString(page_width - 50, y_position, current_line)
-                        y_position -= 15
-                        current_line = word + " "
-                        
-                        if y_position < 50:
-                            c.showPage()
-                            y_position = page_height - 50
-                
-                if current_line:
-                    c.drawRightString(page_width - 50, y_position, current_line)
-                    y_position -= 15
+                if line:
+                    c.drawRightString(page_width - 50, y_position, line)
+                y_position -= 15
         
         c.showPage()
     
     c.save()
 
+def translate_page(page_num, text, checkpoint=None, refresh=False):
+    """ترجمه یک صفحه و ذخیره در checkpoint؛ خروجی: (ترجمه، زمان)
+
+    اگر بخشی از صفحه ترجمه نشود، ترجمه ذخیره نمی‌شود تا اجرای بعدی دوباره تلاش کند.
+    """
+    started = time.perf_counter()
+    if not text or len(text.strip()) <= 10:
+        translated, failed = "", []
+    else:
+        failed = []
+        translated = translate_text_with_terms(text, refresh=refresh, failed=failed)
+    if checkpoint is not None:
+        if failed:
+            print(f"   ⚠️ صفحه {page_num}: {len(failed)} جمله ترجمه نشد (در اجرای بعدی دوباره تلاش می‌شود)")
+        else:
+            checkpoint.save_translation(page_num, translated)
+    return translated, time.perf_counter() - started
+
+def _resume_plan(page_numbers, checkpoint, retranslate):
+    """تقسیم صفحات بر اساس checkpoint: (ترجمه‌های آماده، متن OCR آماده، صفحات نیازمند OCR)"""
+    saved = checkpoint.load(page_numbers) if checkpoint is not None else {}
+    done, ocr_texts, need_ocr = {}, {}, []
+    for page_num in page_numbers:
+        ocr_text, translated = saved.get(page_num, (None, None))
+        if translated is not None and page_num not in retranslate:
+            done[page_num] = translated
+        elif ocr_text is not None:
+            ocr_texts[page_num] = ocr_text
+        else:
+            need_ocr.append(page_num)
+    if saved:
+        print(f"♻️ از اجرای قبلی: {len(done)} صفحه ترجمه شده، {len(ocr_texts)} صفحه با OCR آماده، "
+              f"{len(need_ocr)} صفحه نیازمند OCR\n")
+    return done, ocr_texts, need_ocr
+
+def process_pages_sequential(pdf_path, page_numbers, checkpoint=None, retranslate=()):
+    """پردازش صفحه به صفحه (روش قبلی) با یک بار باز کردن سند"""
+    page_numbers = list(page_numbers)
+    retranslate = set(retranslate)
+    pages_data, ocr_texts, need_ocr = _resume_plan(page_numbers, checkpoint, retranslate)
+    if not ocr_texts and not need_ocr:
+        return {page_num: pages_data[page_num] for page_num in page_numbers}
+
+    path_counts = {'text': 0, 'ocr': 0}
+    doc = fitz.open(pdf_path) if need_ocr else None
+    try:
+        for page_num in page_numbers:
+            if page_num in pages_data:
+                continue
+            print(f"📄 پردازش صفحه {page_num}...")
+
+            if page_num in ocr_texts:
+                text, path = ocr_texts[page_num], 'checkpoint'
+            else:
+                # لایه متنی یا OCR
+                text, path = extract_page_text(pdf_path, page_num, doc)
+                path_counts[path] += 1
+                if checkpoint is not None:
+                    checkpoint.save_ocr(page_num, text)
+
+            if text and len(text.strip()) > 10:
+                print(f"   ✅ {'لایه متنی' if path == 'text' else 'OCR'}: {len(text)} کاراکتر استخراج شد")
+                print(f"   🌐 در حال ترجمه...")
+            else:
+                print(f"   ⚠️ متنی یافت نشد")
+            pages_data[page_num] = translate_page(page_num, text, checkpoint,
+                                                  refresh=page_num in retranslate)[0]
+
+            print(f"✅ صفحه {page_num} تکمیل شد!\n")
+    finally:
+        if doc is not None:
+            doc.close()
+    print_path_stats(path_counts)
+    return {page_num: pages_data[page_num] for page_num in page_numbers}
+
+def process_pages_pipelined(pdf_path, page_numbers, ocr_workers=OCR_WORKERS,
+                            translate_workers=TRANSLATE_WORKERS, depth=PIPELINE_DEPTH,
+                            checkpoint=None, retranslate=()):
+    """پردازش خط لوله‌ای صفحات
+
+    - سند فقط یک بار باز می‌شود و صفحات در پردازش اصلی رندر می‌شوند
+    - OCR در ProcessPoolExecutor اجرا می‌شود
+    - ترجمه هر صفحه به محض پایان OCR آن در ThreadPoolExecutor شروع می‌شود
+    زمان کل به کندترین مرحله محدود است نه به مجموع مراحل.
+    صفحات کامل در checkpoint دوباره پردازش نمی‌شوند؛ صفحات retranslate دوباره ترجمه می‌شوند.
+    خروجی به ترتیب page_numbers است.
+    """
+    page_numbers = list(page_numbers)
+    retranslate = set(retranslate)
+    pages_data, ocr_texts, need_ocr = _resume_plan(page_numbers, checkpoint, retranslate)
+    if not ocr_texts and not need_ocr:
+        return {page_num: pages_data[page_num] for page_num in page_numbers}
+
+    pending = list(reversed(need_ocr))
+    translate_futures = {}
+    stage_seconds = {'render': 0.0, 'ocr': 0.0, 'translate': 0.0}
+    path_counts = {'text': 0, 'ocr': 0}
+    started = time.perf_counter()
+
+    doc = fitz.open(pdf_path) if pending else None
+    try:
+        with ProcessPoolExecutor(max_workers=ocr_workers) as ocr_pool, \
+                ThreadPoolExecutor(max_workers=translate_workers) as translate_pool:
+            ocr_futures = {}
+
+            def submit_translation(page_num, text):
+                translate_futures[page_num] = translate_pool.submit(
+                    translate_page, page_num, text, checkpoint, page_num in retranslate)
+
+            def submit_next():
+                # صفحات دارای لایه متنی مستقیم به ترجمه می‌روند؛ اولین صفحه تصویری به OCR
+                while pending:
+                    page_num = pending.pop()
+                    render_started = time.perf_counter()
+                    if USE_TEXT_LAYER:
+                        text = extract_text_layer(doc, page_num)
+                        if text is not None:
+                            stage_seconds['render'] += time.perf_counter() - render_started
+                            path_counts['text'] += 1
+                            if checkpoint is not None:
+                                checkpoint.save_ocr(page_num, text)
+                            print(f"📄 صفحه {page_num}: لایه متنی {len(text)} کاراکتر → ترجمه")
+                            submit_translation(page_num, text)
+                            continue
+                    img_data = render_page(doc, page_num)
+                    stage_seconds['render'] += time.perf_counter() - render_started
+                    path_counts['ocr'] += 1
+                    ocr_futures[ocr_pool.submit(ocr_page_image, img_data)] = page_num
+                    return
+
+            # صفحاتی که OCR آنها از قبل موجود است مستقیم به ترجمه می‌روند
+            for page_num, text in ocr_texts.items():
+                submit_translation(page_num, text)
+
+            while pending and len(ocr_futures) < max(depth, 1):
+                submit_next()
+
+            while ocr_futures:
+                done, _ = wait(ocr_futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_num = ocr_futures.pop(future)
+                    try:
+                        text, seconds = future.result()
+                        stage_seconds['ocr'] += seconds
+                        if checkpoint is not None:
+                            checkpoint.save_ocr(page_num, text)
+                    except Exception as e:
+                        print(f"   ❌ خطا در OCR صفحه {page_num}: {e}")
+                        text = ""
+
+                    if text and len(text.strip()) > 10:
+                        print(f"📄 صفحه {page_num}: OCR {len(text)} کاراکتر → ترجمه")
+                    else:
+                        print(f"📄 صفحه {page_num}: ⚠️ متنی یافت نشد")
+                    submit_translation(page_num, text)
+
+                    # تولید کننده: صفحه بعدی جایگزین صفحه تمام شده
+                    if pending:
+                        submit_next()
+
+            for page_num in sorted(translate_futures):
+                try:
+                    translated, seconds = translate_futures[page_num].result()
+                    stage_seconds['translate'] += seconds
+                except Exception as e:
+                    print(f"   ❌ خطا در ترجمه صفحه {page_num}: {e}")
+                    translated = ""
+                pages_data[page_num] = translated
+                print(f"✅ صفحه {page_num} تکمیل شد!")
+    finally:
+        if doc is not None:
+            doc.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n⏱️ خط لوله: {len(translate_futures)} صفحه در {elapsed:.1f} ثانیه "
+          f"(رندر {stage_seconds['render']:.1f} | OCR {stage_seconds['ocr']:.1f} | "
+          f"ترجمه {stage_seconds['translate']:.1f} ثانیه - مجموع مراحل "
+          f"{sum(stage_seconds.values()):.1f} ثانیه)")
+    print_path_stats(path_counts)
+    print()
+
+    return {page_num: pages_data.get(page_num, "") for page_num in page_numbers}
+
 def main():
     print("🚀 شروع فرآیند OCR و ترجمه...\n")
     
@@ -153,30 +452,30 @@ def main():
         print(f"❌ خطا در فونت: {e}")
         return
     
-    pages_data = {}
+    # --pages 16,20-22: ترجمه دوباره فقط همین صفحات (بقیه از checkpoint)
+    args = sys.argv[1:]
+    retranslate = parse_pages(args[args.index('--pages') + 1]) if '--pages' in args else []
+    page_numbers = sorted(set(range(START_PAGE, END_PAGE + 1)) | set(retranslate))
+    if retranslate:
+        print(f"🔁 ترجمه دوباره صفحات: {', '.join(map(str, retranslate))}\n")
     
-    for page_num in range(START_PAGE, END_PAGE + 1):
-        print(f"📄 پردازش صفحه {page_num}...")
-        
-        # استخراج با OCR
-        text = extract_text_with_ocr(INPUT_PDF, page_num)
-        
-        if text and len(text.strip()) > 10:
-            print(f"   ✅ OCR: {len(text)} کاراکتر استخراج شد")
-            print(f"   🌐 در حال ترجمه...")
-            translated = translate_text_with_terms(text)
-            pages_data[page_num] = translated
-        else:
-            print(f"   ⚠️ متنی یافت نشد")
-            pages_data[page_num] = ""
-        
-        print(f"✅ صفحه {page_num} تکمیل شد!\n")
-        time.sleep(0.5)
+    checkpoint = (TranslationCheckpoint(INPUT_PDF, GLOSSARY_VERSION, backend=TRANSLATOR_BACKEND)
+                  if USE_CHECKPOINT else None)
+    if PIPELINE:
+        pages_data = process_pages_pipelined(INPUT_PDF, page_numbers, checkpoint=checkpoint,
+                                             retranslate=retranslate)
+    else:
+        pages_data = process_pages_sequential(INPUT_PDF, page_numbers, checkpoint=checkpoint,
+                                              retranslate=retranslate)
     
     # ایجاد PDF
     print("📦 ایجاد PDF نهایی...")
     create_pdf(OUTPUT_PDF, pages_data, 'BNazanin')
     
+    if USE_TRANSLATION_MEMORY:
+        get_translation_memory().print_stats(get_translator())
+    close_dispatchers()
+    
     print(f"\n✅ تمام! فایل: {OUTPUT_PDF}")
 
 if __name__ == "__main__":
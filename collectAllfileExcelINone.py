@@ -1,23 +1,79 @@
 import pandas as pd
 import os
+import io
+import importlib.util
+import time
 from pathlib import Path
 from datetime import datetime
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 
+from date_normalize import parse_dates
+
+# موتور سریع‌تر خواندن اکسل (اختیاری): pip install python-calamine
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+
+# تاریخ‌های عددی گزارش‌های ضخامت به صورت روز/ماه/سال هستند (مثل 14/10/2024)
+DATE_DAYFIRST = True
+
+# موتور خواندن فایل‌ها (None: انتخاب پیش‌فرض pandas)
+# 'calamine' سریع‌تر است ولی مقادیر (مثلا تاریخ‌ها و فرمول‌ها) را ممکن است متفاوت برگرداند؛
+# فقط پس از مقایسه خروجی با موتور پیش‌فرض فعال شود
+EXCEL_ENGINE = None
+
+# تعداد پردازش‌های همزمان برای خواندن فایل‌ها (1 = ترتیبی)
+WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# کلمات کلیدی هدر جدول و حداقل تعداد کلمات پیدا شده در یک ردیف
+HEADER_KEYWORDS = ['Location', 'Date', 'Point No', 'POS', 'Line Number', 'Material', 'N.Size', 'Class']
+HEADER_MIN_MATCHES = 4
+
+# تعداد ردیف‌های ابتدای شیت که برای پیدا کردن هدر خوانده می‌شوند
+HEADER_SCAN_ROWS = 30
+
 def find_header_row(df):
     """
     پیدا کردن ردیف هدر واقعی جدول
+    
+    تطبیق کلمات کلیدی به صورت برداری روی کل بلوک انجام می‌شود (بدون حلقه روی ردیف‌ها)
+    """
+    cells = df.astype(str).stack().str.lower()
+    if cells.empty:
+        return None
+    rows = cells.index.get_level_values(0)
+    
+    # برای هر کلمه: آیا در حداقل یک سلول ردیف آمده است
+    matches = sum(
+        cells.str.contains(keyword.lower(), regex=False, na=False).groupby(rows, sort=False).any()
+        for keyword in HEADER_KEYWORDS
+    )
+    found = matches.index[matches >= HEADER_MIN_MATCHES]
+    return found[0] if len(found) else None
+
+def read_sheet(excel_data, sheet_name):
     """
-    header_keywords = ['Location', 'Date', 'Point No', 'POS', 'Line Number', 'Material', 'N.Size', 'Class']
+    خواندن شیت از ردیف هدر به بعد (excel_data: pd.ExcelFile باز شده)
     
-    for idx, row in df.iterrows():
-        row_str = row.astype(str).str.lower()
-        matches = sum([any(keyword.lower() in val for val in row_str) for keyword in header_keywords])
-        
-        if matches >= 4:
-            return idx
+    هدر از روی HEADER_SCAN_ROWS ردیف اول پیدا می‌شود و سپس شیت فقط یک بار از ردیف هدر
+    خوانده می‌شود. خروجی: (DataFrame با هدر در ردیف 0، شماره ردیف هدر، Location، Date)
+    """
+    df_top = pd.read_excel(excel_data, sheet_name=sheet_name, header=None, nrows=HEADER_SCAN_ROWS)
+    header_row = find_header_row(df_top)
+    
+    if header_row is None and len(df_top) >= HEADER_SCAN_ROWS:
+        # هدر پایین‌تر از ردیف‌های بررسی شده است: بررسی کل شیت
+        df_top = pd.read_excel(excel_data, sheet_name=sheet_name, header=None)
+        header_row = find_header_row(df_top)
+    
+    if header_row is None:
+        return None, None, None, None
+    
+    # استخراج Location و Date از قسمت بالای فایل
+    location, date = extract_location_date(df_top, header_row)
     
-    return None
+    df_raw = pd.read_excel(excel_data, sheet_name=sheet_name, header=None, skiprows=header_row)
+    return df_raw, header_row, location, date
 
 def extract_location_date(df_raw, header_row):
     """
@@ -29,7 +85,7 @@ def extract_location_date(df_raw, header_row):
     # جستجو در ردیف‌های قبل از هدر
     for idx in range(max(0, header_row - 10), header_row):
         row = df_raw.iloc[idx]
-        row_str = ' '.join(row.astype(str).values)
+        row_str = ' '.join(row.map(str).values)
         
         # جستجوی Location
         if 'LOCATION' in row_str.upper() or 'Location' in row_str:
@@ -108,6 +164,68 @@ def clean_dataframe(df, header_row, location_value=None, date_value=None):
     
     return df
 
+def ingest_file(excel_file):
+    """
+    خواندن همه شیت‌های یک فایل اکسل با یک بار باز کردن فایل (قابل اجرا در پردازش جداگانه)
+    
+    خروجی: (لیست DataFrame های معتبر، گزارش متنی، زمان پردازش به ثانیه)
+    """
+    started = time.perf_counter()
+    dataframes = []
+    log = io.StringIO()
+    
+    with redirect_stdout(log):
+        try:
+            with pd.ExcelFile(excel_file, engine=EXCEL_ENGINE) as excel_data:
+                sheet_names = excel_data.sheet_names
+                
+                print(f"   📑 تعداد شیت‌ها: {len(sheet_names)}")
+                
+                for sheet_name in sheet_names:
+                    try:
+                        df_raw, header_row, location_from_header, date_from_header = read_sheet(excel_data, sheet_name)
+                        
+                        if header_row is None:
+                            print(f"   ⚠️  شیت '{sheet_name}': هدر پیدا نشد")
+                            continue
+                        
+                        print(f"   📍 شیت '{sheet_name}': هدر در ردیف {header_row + 1} پیدا شد")
+                        
+                        df = clean_dataframe(df_raw, 0, location_from_header, date_from_header)
+                        
+                        if df.empty:
+                            print(f"   ⚠️  شیت '{sheet_name}': بعد از پاکسازی خالی شد")
+                            continue
+                        
+                        # نمایش اطلاعات Location و Date
+                        if location_from_header:
+                            print(f"   📍 Location: {location_from_header}")
+                        if date_from_header:
+                            print(f"   📅 Date: {date_from_header}")
+                        
+                        # اطمینان از اینکه Location و Date پر شده‌اند
+                        if 'Location' in df.columns:
+                            df = df[df['Location'].notna()]
+                        
+                        if df.empty:
+                            print(f"   ⚠️  شیت '{sheet_name}': داده معتبری پیدا نشد")
+                            continue
+                        
+                        df.columns = df.columns.str.strip()
+                        
+                        dataframes.append(df)
+                        
+                        print(f"   ✅ شیت '{sheet_name}': {len(df)} ردیف معتبر")
+                        
+                    except Exception as e:
+                        print(f"   ❌ خطا در شیت '{sheet_name}': {str(e)}")
+                        continue
+        
+        except Exception as e:
+            print(f"❌ خطا در فایل {excel_file.name}: {str(e)}")
+    
+    return dataframes, log.getvalue(), time.perf_counter() - started
+
 def combine_excel_files(source_folder, output_file=None):
     """
     ترکیب تمام فایل‌های اکسل با پیدا کردن خودکار هدر و پاکسازی داده‌ها
@@ -129,70 +247,51 @@ def combine_excel_files(source_folder, output_file=None):
     print("="*80)
     
     all_dataframes = []
-    total_rows = 0
-    total_sheets = 0
     
     columns_to_fill = ['Location', 'Date']
     
-    for idx, excel_file in enumerate(excel_files, 1):
-        try:
-            print(f"\n🔄 در حال پردازش فایل {idx}/{len(excel_files)}: {excel_file.name}")
-            
-            excel_data = pd.ExcelFile(excel_file)
-            sheet_names = excel_data.sheet_names
-            
-            print(f"   📑 تعداد شیت‌ها: {len(sheet_names)}")
-            
-            for sheet_name in sheet_names:
-                try:
-                    df_raw = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
-                    
-                    header_row = find_header_row(df_raw)
-                    
-                    if header_row is None:
-                        print(f"   ⚠️  شیت '{sheet_name}': هدر پیدا نشد")
-                        continue
-                    
-                    print(f"   📍 شیت '{sheet_name}': هدر در ردیف {header_row + 1} پیدا شد")
-                    
-                    # استخراج Location و Date از قسمت بالای فایل
-                    location_from_header, date_from_header = extract_location_date(df_raw, header_row)
-                    
-                    df = clean_dataframe(df_raw, header_row, location_from_header, date_from_header)
-                    
-                    if df.empty:
-                        print(f"   ⚠️  شیت '{sheet_name}': بعد از پاکسازی خالی شد")
-                        continue
-                    
-                    # نمایش اطلاعات Location و Date
-                    if location_from_header:
-                        print(f"   📍 Location: {location_from_header}")
-                    if date_from_header:
-                        print(f"   📅 Date: {date_from_header}")
-                    
-                    # اطمینان از اینکه Location و Date پر شده‌اند
-                    if 'Location' in df.columns:
-                        df = df[df['Location'].notna()]
-                    
-                    if df.empty:
-                        print(f"   ⚠️  شیت '{sheet_name}': داده معتبری پیدا نشد")
-                        continue
-                    
-                    df.columns = df.columns.str.strip()
-                    
-                    all_dataframes.append(df)
-                    total_rows += len(df)
-                    total_sheets += 1
-                    
-                    print(f"   ✅ شیت '{sheet_name}': {len(df)} ردیف معتبر")
-                    
-                except Exception as e:
-                    print(f"   ❌ خطا در شیت '{sheet_name}': {str(e)}")
-                    continue
-            
-        except Exception as e:
-            print(f"❌ خطا در فایل {excel_file.name}: {str(e)}")
-            continue
+    # فایل‌ها بین پردازش‌ها تقسیم می‌شوند؛ ترتیب نتایج همان ترتیب فایل‌هاست
+    results = [None] * len(excel_files)
+    workers = min(WORKERS, len(excel_files))
+    started = time.perf_counter()
+    
+    def report_file(done, file_idx):
+        dataframes, log, seconds = results[file_idx]
+        print(f"\n🔄 فایل {done}/{len(excel_files)}: {excel_files[file_idx].name} ({seconds:.2f} ثانیه)")
+        print(log, end='')
+    
+    if EXCEL_ENGINE == 'calamine' and not CALAMINE_AVAILABLE:
+        print("❌ موتور calamine نصب نیست: pip install python-calamine")
+        return
+    if EXCEL_ENGINE:
+        print(f"📖 موتور خواندن: {EXCEL_ENGINE}")
+    if workers > 1:
+        print(f"⚙️ حالت موازی: {workers} پردازش همزمان")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(ingest_file, excel_file): file_idx
+                       for file_idx, excel_file in enumerate(excel_files)}
+            for done, future in enumerate(as_completed(futures), 1):
+                file_idx = futures[future]
+                results[file_idx] = future.result()
+                report_file(done, file_idx)
+    else:
+        for file_idx, excel_file in enumerate(excel_files):
+            results[file_idx] = ingest_file(excel_file)
+            report_file(file_idx + 1, file_idx)
+    
+    elapsed = time.perf_counter() - started
+    for dataframes, _, _ in results:
+        all_dataframes.extend(dataframes)
+    total_sheets = len(all_dataframes)
+    total_rows = sum(len(df) for df in all_dataframes)
+    
+    # زمان و سرعت خواندن
+    total_mb = sum(excel_file.stat().st_size for excel_file in excel_files) / 1024 / 1024
+    parse_seconds = sum(seconds for _, _, seconds in results)
+    print(f"\n⏱️ خواندن {len(excel_files)} فایل ({total_mb:.1f} MB) در {elapsed:.1f} ثانیه "
+          f"(مجموع زمان پردازش فایل‌ها: {parse_seconds:.1f} ثانیه)")
+    print(f"   📈 {len(excel_files) / elapsed:.2f} فایل، {total_mb / elapsed:.1f} MB و "
+          f"{total_rows / elapsed:,.0f} ردیف در ثانیه")
     
     if not all_dataframes:
         print("\n❌ هیچ داده‌ای برای ترکیب پیدا نشد!")
@@ -234,6 +333,12 @@ def combine_excel_files(source_folder, output_file=None):
     other_cols = [col for col in combined_df.columns if col not in existing_cols]
     combined_df = combined_df[existing_cols + other_cols]
     
+    # یکسان‌سازی تاریخ‌ها (هر فایل فرمت خودش را دارد)؛ مقادیر غیرقابل تبدیل دست نمی‌خورند
+    if 'Date' in combined_df.columns:
+        dates = parse_dates(combined_df['Date'], dayfirst=DATE_DAYFIRST)
+        print(f"📅 تاریخ‌های یکسان شده: {int(dates.notna().sum())} از {len(dates)}")
+        combined_df['Date'] = dates.astype(object).where(dates.notna(), combined_df['Date'])
+    
     if output_file is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = source_path / f"Combined_Thickness_Report_{timestamp}.xlsx"
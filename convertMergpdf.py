@@ -8,6 +8,8 @@ import pythoncom
 from PyPDF2 import PdfMerger
 import shutil
 
+from doc_patterns import extract as extract_fields
+
 class ExcelToPdfProcessor:
     def __init__(self, directory_path):
         self.directory_path = directory_path
@@ -43,47 +45,31 @@ class ExcelToPdfProcessor:
             
             print(f"  🔍 متن استخراج شده: {text[:200]}...")
             
-            # جستجوی Doc No با فرمت دقیق: SJSC-GGNRSP-PDPE-REDH-XXXX-GXX
-            doc_pattern = r'(SJSC-GGNRSP-[A-Z]+-[A-Z]+-(\d{4})-(G\d{2}))'
-            match = re.search(doc_pattern, text, re.IGNORECASE)
+            # جستجوی Doc No و Date با مخزن مشترک الگوها (خانواده PDPE)
+            # فرمت: SJSC-GGNRSP-PDPE-REDH/REDL-XXXX-GXX
+            info = extract_fields(text, 'PDPE')
+            doc_no = info['doc_no']
             
-            if match:
-                doc_no = match.group(1)
-                number = match.group(2)  # 4 رقم وسط
-                rev = match.group(3)      # Gxx
+            if info['number']:
+                number = info['number']  # 4 رقم وسط (مثل 0388)
+                rev = info['rev']        # Gxx (مثل G00)
                 print(f"  ✅ Doc No پیدا شد: {doc_no}")
                 print(f"  ✅ Number: {number}, Rev: {rev}")
-            else:
-                # تلاش دیگر برای Doc No
-                alt_pattern = r'Doc\s*No\.?\s*:?\s*([A-Z0-9\-]+)'
-                match2 = re.search(alt_pattern, text, re.IGNORECASE)
-                if match2:
-                    doc_no = match2.group(1)
-                    # استخراج number و rev از doc_no
-                    parts = doc_no.split('-')
-                    for i, part in enumerate(parts):
-                        if re.match(r'\d{4}', part):
-                            number = part
-                            if i + 1 < len(parts):
-                                rev_part = parts[i + 1]
-                                if re.match(r'G?\d{2}', rev_part):
-                                    rev = 'G' + re.sub(r'[^0-9]', '', rev_part).zfill(2)
-                            break
-            
-            # جستجوی Date با فرمت: 1-Aug-2024
-            date_patterns = [
-                r'Date\s*:?\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-                r'Date\s*:?\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',
-                r'(\d{1,2}-[A-Za-z]{3}-\d{4})',
-                r'(\d{1,2}/\d{1,2}/\d{4})',
-            ]
+            elif doc_no:
+                # استخراج number و rev از doc_no
+                parts = doc_no.split('-')
+                for i, part in enumerate(parts):
+                    if re.match(r'\d{4}', part):
+                        number = part
+                        if i + 1 < len(parts):
+                            rev_part = parts[i + 1]
+                            if re.match(r'G?\d{2}', rev_part):
+                                rev = 'G' + re.sub(r'[^0-9]', '', rev_part).zfill(2)
+                        break
             
-            for pattern in date_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    date = match.group(1).strip()
-                    print(f"  ✅ Date پیدا شد: {date}")
-                    break
+            if info['date']:
+                date = info['date'].strip()
+                print(f"  ✅ Date پیدا شد: {date}")
             
         except Exception as e:
             print(f"  ⚠️  خطا در خواندن اکسل: {e}")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Date Normalize - تبدیل یکسان تاریخ‌ها برای تمام ابزارهای گزارش
+
+جدول ماه‌ها و فرمت‌های تاریخ قبلا در هر اسکریپت جداگانه تعریف شده بود و فرمت‌ها
+یکی یکی با try/except امتحان می‌شدند. اینجا:
+- فرمت‌ها یک بار کامپایل می‌شوند و هر رشته فقط یک بار تجزیه می‌شود (کش LRU)
+- حالت گروهی: کل یک ستون pandas با همان فرمت‌ها یک جا تبدیل می‌شود
+
+فرمت‌های پشتیبانی شده:
+    14-Oct-2024, 14/Oct/2024, 14 October 2024, 14-Sept-2024
+    Oct 14, 2024, December 15 2024
+    20241014 (YYYYMMDD), 2024-10-14 (با یا بدون ساعت)
+    14.10.2024 (DD.MM.YYYY)
+    10/14/2024 (MM/DD/YYYY؛ با dayfirst=True: DD/MM/YYYY)
+
+استفاده:
+    from date_normalize import parse_date, parse_dates
+
+    date_obj = parse_date('14-Oct-2024')              # datetime(2024, 10, 14)
+    df['Date'] = parse_dates(df['Date'], dayfirst=True)
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+
+# حجم کش تاریخ‌های تجزیه شده
+DATE_CACHE_SIZE = 4096
+
+MONTHS = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12
+}
+
+_SUFFIX = r'(?:st|nd|rd|th)?'
+_TIME = r'(?:[ t]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?'
+
+# فرمت‌ها روی متن کوچک شده؛ هر الگو گروه‌های d (روز)، m (ماه: عدد یا نام) و y (سال) دارد
+DATE_FORMATS = [
+    # 14-Oct-2024, 14/Oct/2024, 14 October 2024
+    re.compile(rf'^(?P<d>\d{{1,2}}){_SUFFIX}[-/\s.]*(?P<m>[a-z]{{3,9}})\.?[-/\s,.]*(?P<y>\d{{4}})$'),
+    # Oct 14, 2024
+    re.compile(rf'^(?P<m>[a-z]{{3,9}})\.?[-\s]*(?P<d>\d{{1,2}}){_SUFFIX},?[-\s]*(?P<y>\d{{4}})$'),
+    # 20241014
+    re.compile(r'^(?P<y>\d{4})(?P<m>\d{2})(?P<d>\d{2})$'),
+    # 2024-10-14, 2024-10-14 00:00:00
+    re.compile(rf'^(?P<y>\d{{4}})[-/.](?P<m>\d{{1,2}})[-/.](?P<d>\d{{1,2}}){_TIME}$'),
+    # 14.10.2024
+    re.compile(r'^(?P<d>\d{1,2})\.(?P<m>\d{1,2})\.(?P<y>\d{4})$'),
+]
+
+# تاریخ عددی با / یا - (ترتیب روز و ماه به dayfirst بستگی دارد)
+_MONTH_FIRST = re.compile(r'^(?P<m>\d{1,2})[/-](?P<d>\d{1,2})[/-](?P<y>\d{4})$')
+_DAY_FIRST = re.compile(r'^(?P<d>\d{1,2})[/-](?P<m>\d{1,2})[/-](?P<y>\d{4})$')
+
+
+def _formats(dayfirst):
+    return DATE_FORMATS + [_DAY_FIRST if dayfirst else _MONTH_FIRST]
+
+
+def _month_number(month):
+    if month.isdigit():
+        return int(month)
+    return MONTHS.get(month)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_text(text, dayfirst):
+    for regex in _formats(dayfirst):
+        match = regex.match(text)
+        if not match:
+            continue
+        month = _month_number(match.group('m'))
+        if not month:
+            return None
+        try:
+            return datetime(int(match.group('y')), month, int(match.group('d')))
+        except ValueError:
+            return None
+    return None
+
+
+def parse_date(value, dayfirst=False):
+    """
+    تبدیل یک تاریخ (رشته یا datetime) به datetime؛ در صورت نامعتبر بودن None
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if not isinstance(value, str):
+        return None
+    text = value.strip().lower()
+    if not text:
+        return None
+    return _parse_text(text, dayfirst)
+
+
+def parse_dates(values, dayfirst=False):
+    """
+    تبدیل گروهی یک ستون (Series یا لیست) به datetime64؛ مقادیر نامعتبر NaT می‌شوند
+
+    هر فرمت با یک str.extract روی مقادیر یکتای ستون اعمال می‌شود و تاریخ‌ها از
+    ستون‌های روز/ماه/سال یک جا ساخته می‌شوند (بدون حلقه پایتون روی ردیف‌ها).
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    # ستون‌های گزارش تاریخ‌های تکراری زیادی دارند: هر مقدار یکتا فقط یک بار تجزیه می‌شود
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+
+    # مقادیر datetime/Timestamp داخل ستون object به شکل 2024-10-14 00:00:00 درمی‌آیند
+    text = uniques.astype(str).str.strip().str.lower()
+    parts = pd.DataFrame(index=uniques.index, columns=['year', 'month', 'day'], dtype='float64')
+    pending = pd.Series(True, index=uniques.index)
+
+    for regex in _formats(dayfirst):
+        if not pending.any():
+            break
+        found = text[pending].str.extract(regex)
+        found = found[found['y'].notna()]
+        if found.empty:
+            continue
+        month = found['m']
+        parts.loc[found.index, 'year'] = pd.to_numeric(found['y'])
+        parts.loc[found.index, 'day'] = pd.to_numeric(found['d'])
+        parts.loc[found.index, 'month'] = pd.to_numeric(month, errors='coerce').fillna(month.map(MONTHS))
+        pending[found.index] = False
+
+    # بازگرداندن نتیجه مقادیر یکتا به ردیف‌ها (کد -1 برای مقدار خالی)
+    parsed = pd.DatetimeIndex(pd.to_datetime(parts, errors='coerce'))
+    result = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("استفاده:")
+        print("  python date_normalize.py <date> [<date> ...] [--dayfirst]")
+        sys.exit(1)
+
+    dayfirst = '--dayfirst' in sys.argv
+    for arg in sys.argv[1:]:
+        if arg == '--dayfirst':
+            continue
+        result = parse_date(arg, dayfirst)
+        print(f"{arg!r:>24} -> {result.strftime('%Y-%m-%d') if result else '❌ نامعتبر'}")
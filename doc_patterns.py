@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Document Patterns - مخزن مرکزی الگوهای استخراج اطلاعات سند
+
+الگوهای Document No / Sequence / Revision / Date / Period قبلا در هر اسکریپت
+کپی شده بودند و در هر فراخوانی به ترتیب ثابت امتحان می‌شدند.
+اینجا:
+- الگوهای هر خانواده گزارش یک بار کامپایل می‌شوند
+- الگوی منطبق ثبت می‌شود و الگوهای پرکاربردتر زودتر امتحان می‌شوند
+- ترتیب فقط داخل یک «سطح» تغییر می‌کند؛ الگوی دقیق (با برچسب) همیشه قبل از الگوی کلی است
+- آمار تطبیق در پایگاه داده کش ذخیره می‌شود تا ترتیب از اجرای بعدی هم استفاده شود
+
+استفاده:
+    from doc_patterns import extract
+
+    info = extract(text, 'REMO')
+    # {'doc_no': 'SJSC-...-REMO-2024-G01', 'number': '2024', 'rev': 'G01', 'date': '14-Oct-2024', ...}
+
+    info = extract(text, 'REMO', fields=('date',), validate={'date': lambda g: parse(g['date'])})
+
+آمار:
+    python doc_patterns.py stats
+"""
+
+import os
+import re
+import atexit
+import sqlite3
+import threading
+
+from pdf_text_cache import DEFAULT_CACHE_PATH
+
+
+# بخش‌های تاریخ
+_DAY_MON_YEAR = r'[0-9]{1,2}[-\s][A-Za-z]{3,9}[-\s][0-9]{4}'
+_DAY_MON = r'[0-9]{1,2}[-\s][A-Za-z]{3,9}'
+
+# الگوها: خانواده → فیلد → [(سطح، الگو، flags), ...]
+# نام گروه‌های الگو (?P<name>) کلیدهای خروجی extract هستند.
+PATTERN_FAMILIES = {
+    # گزارش ماهانه تعمیرات (RenameFilepdf)
+    'REMO': {
+        'doc_no': [
+            (0, r'Document\s*No\.?\s*:?\s*(?P<doc_no>SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(?P<number>\d{4})-(?P<rev>G\d{2}))', re.I),
+            (0, r'Document\s*Number\s*:?\s*(?P<doc_no>SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(?P<number>\d{4})-(?P<rev>G\d{2}))', re.I),
+            (0, r'Doc\s*No\.?\s*:?\s*(?P<doc_no>SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(?P<number>\d{4})-(?P<rev>G\d{2}))', re.I),
+            (1, r'(?P<doc_no>SJSC-[A-Z0-9]+-[A-Z0-9]+-REMO-(?P<number>\d{4})-(?P<rev>G\d{2}))', re.I),
+            (2, r'(?P<doc_no>SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-(?P<number>\d{4})-(?P<rev>G\d{2}))', re.I),
+        ],
+        'date': [
+            (0, r'Date\s*:?\s*(?P<date>' + _DAY_MON_YEAR + ')', re.I),
+            (0, r'Approved\s+by\s+Date\s+(?P<date>' + _DAY_MON_YEAR + ')', re.I),
+        ],
+        'period': [
+            (0, r'\(From\s+(?P<period_from>' + _DAY_MON + r')\s+to\s+(?P<period_to>' + _DAY_MON_YEAR + r')\)', re.I),
+            (1, r'From\s+(?P<period_from>' + _DAY_MON + r')\s+to\s+(?P<period_to>' + _DAY_MON_YEAR + ')', re.I),
+        ],
+    },
+
+    # جدول مشخصات گزارش‌های تعمیرات (maintenance_processor_v3_FINAL)
+    'REMO_TABLE': {
+        'sequence': [
+            (0, r'Sequence\s+Number\s*[:\-|]?\s*(?P<sequence>\d+)', re.I),
+            (0, r'Seq\s*[:\-|]?\s*(?P<sequence>\d+)', re.I),
+            (1, r'Number\s*[:\-|]?\s*(?P<sequence>\d+)', re.I),
+            (2, r'\|\s*(?P<sequence>\d{4})\s*\|', re.I),
+            (3, r'(?:Sequence|Number).*?(?P<sequence>\d{3,4})', re.I),
+        ],
+        'revision': [
+            (0, r'Revision\s*[:\-|]?\s*(?P<revision>G\d+)', re.I),
+            (1, r'\|\s*(?P<revision>G\d{2,3})\s*\|', re.I),
+            (2, r'\b(?P<revision>G\d{2,3})\b', re.I),
+        ],
+        'date': [
+            (0, r'Date\s*[:\-|]?\s*(?P<date>\d{1,2}[-/][A-Za-z]{3}[-/]\d{4})', 0),
+            (1, r'(?P<date>\d{1,2}[-/][A-Za-z]{3}[-/]\d{4})', 0),
+            (2, r'Date.*?(?P<date>\d{1,2}\s+[A-Za-z]{3}\s+\d{4})', 0),
+        ],
+    },
+
+    # گزارش‌های عمومی با Doc No آزاد (RenamePDFFiles.PDFProcessor)
+    'GENERIC': {
+        'doc_no': [
+            (0, r'Doc\s*\.?\s*No\s*\.?\s*[:\-]?\s*(?P<doc_no>[A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)', re.I),
+            (0, r'Document\s+No\s*\.?\s*[:\-]?\s*(?P<doc_no>[A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)', re.I),
+            (0, r'Doc\s+Number\s*[:\-]?\s*(?P<doc_no>[A-Z0-9\-\s]+?)(?:\s+Rev|\s+Date|\s+G\d{2}|$)', re.I),
+            (1, r'(?P<doc_no>[A-Z]{3,5}\-[A-Z]{3,10}\-[A-Z]{3,10}\-[A-Z]{3,10}\-\d+\-G\d{2})', re.I),
+        ],
+        'date': [
+            (0, r'Date\s*[:\-]?\s*(?P<date>\d{1,2}[\s/\-\.]\w+[\s/\-\.]\d{2,4})', re.I),
+            (1, r'(?P<date>\d{1,2}[\s/\-\.](Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*[\s/\-\.]\d{2,4})', re.I),
+        ],
+    },
+
+    # گزارش‌های روزانه تولید REDH/REDL (pdf_mergerVeryfied, convertMergpdf)
+    'PDPE': {
+        'doc_no': [
+            (0, r'(?P<doc_no>SJSC-GGNRSP-[A-Z]+-[A-Z]+-(?P<number>\d{4})-(?P<rev>G\d{2}))', re.I),
+            (1, r'Doc\s*No\.?\s*:?\s*(?P<doc_no>[A-Z0-9\-]+)', re.I),
+        ],
+        'date': [
+            (0, r'Date\s*:?\s*(?P<date>\d{1,2}-[A-Za-z]{3}-\d{4})', re.I),
+            (0, r'Date\s*:?\s*(?P<date>\d{4}-\d{2}-\d{2})', re.I),
+            (0, r'Date\s*:?\s*(?P<date>\d{1,2}\s+[A-Za-z]+\s+\d{4})', re.I),
+            (1, r'(?P<date>\d{1,2}-[A-Za-z]{3}-\d{4})', re.I),
+            (1, r'(?P<date>\d{4}-\d{2}-\d{2})', re.I),
+            (2, r'(?P<date>\d{1,2}/\d{1,2}/\d{4})', re.I),
+        ],
+    },
+}
+
+# ذخیره آمار تطبیق پس از این تعداد تطبیق جدید
+FLUSH_EVERY = 25
+
+
+class _Pattern:
+    __slots__ = ('tier', 'source', 'regex', 'hits', 'pending')
+
+    def __init__(self, tier, source, flags):
+        self.tier = tier
+        self.source = source
+        self.regex = re.compile(source, flags)
+        self.hits = 0
+        self.pending = 0
+
+
+class PatternRegistry:
+    """
+    الگوهای کامپایل شده با ترتیب پویا بر اساس تعداد تطبیق
+    """
+
+    def __init__(self, families=PATTERN_FAMILIES, db_path=DEFAULT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self.patterns = {}
+        self.group_names = {}
+        for family, fields in families.items():
+            for field, entries in fields.items():
+                key = (family, field)
+                self.patterns[key] = [_Pattern(tier, source, flags) for tier, source, flags in entries]
+                names = []
+                for p in self.patterns[key]:
+                    names.extend(n for n in p.regex.groupindex if n not in names)
+                self.group_names[key] = names
+
+        self.conn = None
+        self._unflushed = 0
+        try:
+            self.conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pattern_hits (
+                    family TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    pattern TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (family, field, pattern)
+                )
+            """)
+            self.conn.commit()
+            self._load()
+        except sqlite3.Error as e:
+            print(f"   ⚠️ آمار الگوها در دسترس نیست: {e}")
+            self.conn = None
+
+    def _load(self):
+        rows = self.conn.execute('SELECT family, field, pattern, hits FROM pattern_hits').fetchall()
+        hits = {(f, fl, p): h for f, fl, p, h in rows}
+        for (family, field), patterns in self.patterns.items():
+            for p in patterns:
+                p.hits = hits.get((family, field, p.source), 0)
+            self._sort(patterns)
+
+    @staticmethod
+    def _sort(patterns):
+        order = {id(p): i for i, p in enumerate(patterns)}
+        patterns.sort(key=lambda p: (p.tier, -p.hits, order[id(p)]))
+
+    def _record(self, family, field, patterns, index):
+        """
+        ثبت تطبیق و جابجایی الگو به بالا در سطح خودش
+        """
+        with self._lock:
+            p = patterns[index]
+            p.hits += 1
+            p.pending += 1
+            while index > 0 and patterns[index - 1].tier == p.tier and patterns[index - 1].hits < p.hits:
+                patterns[index - 1], patterns[index] = patterns[index], patterns[index - 1]
+                index -= 1
+            self._unflushed += 1
+            should_flush = self._unflushed >= FLUSH_EVERY
+        if should_flush:
+            self.flush()
+
+    def match(self, text, family, field, validate=None):
+        """
+        اولین تطبیق معتبر یک فیلد؛ خروجی: dict گروه‌های نام‌دار یا None
+
+        validate(groups) اگر False برگرداند، تطبیق بعدی (همان الگو یا الگوی بعدی) امتحان می‌شود.
+        """
+        if not text:
+            return None
+        patterns = self.patterns[(family, field)]
+        for index, p in enumerate(list(patterns)):
+            if validate is None:
+                m = p.regex.search(text)
+                candidates = (m,) if m else ()
+            else:
+                candidates = p.regex.finditer(text)
+            for m in candidates:
+                groups = m.groupdict()
+                if validate is not None and not validate(groups):
+                    continue
+                self._record(family, field, patterns, patterns.index(p))
+                return groups
+        return None
+
+    def extract(self, text, family, fields=None, validate=None):
+        """
+        استخراج همه فیلدهای یک خانواده در یک فراخوانی
+
+        خروجی: dict همه گروه‌های نام‌دار (None برای مقادیر پیدا نشده)
+        """
+        validate = validate or {}
+        fields = fields or [f for (fam, f) in self.patterns if fam == family]
+        result = {}
+        for field in fields:
+            names = self.group_names[(family, field)]
+            groups = self.match(text, family, field, validate.get(field))
+            for name in names:
+                result[name] = groups.get(name) if groups else None
+        return result
+
+    def flush(self):
+        """
+        ذخیره آمار تطبیق (افزایشی، قابل استفاده همزمان از چند پردازش)
+        """
+        if self.conn is None:
+            return
+        with self._lock:
+            updates = []
+            for (family, field), patterns in self.patterns.items():
+                for p in patterns:
+                    if p.pending:
+                        updates.append((family, field, p.source, p.pending))
+                        p.pending = 0
+            self._unflushed = 0
+            if not updates:
+                return
+            try:
+                self.conn.executemany(
+                    'INSERT INTO pattern_hits (family, field, pattern, hits) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(family, field, pattern) DO UPDATE SET hits = hits + excluded.hits',
+                    updates
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"   ⚠️ خطا در ذخیره آمار الگوها: {e}")
+
+    def print_stats(self, family=None):
+        """
+        نمایش الگوها به ترتیب فعلی و تعداد تطبیق
+        """
+        print("\n🧩 آمار الگوهای استخراج:")
+        for (fam, field), patterns in self.patterns.items():
+            if family and fam != family:
+                continue
+            total = sum(p.hits for p in patterns)
+            if not total:
+                continue
+            print(f"   {fam}.{field} ({total} تطبیق):")
+            for p in patterns:
+                print(f"      [{p.tier}] {p.hits:>6} | {p.source[:70]}")
+
+
+_default_registry = None
+_default_registry_pid = None
+
+
+def get_registry():
+    """
+    نمونه مشترک مخزن الگوها برای کل فرآیند
+    """
+    global _default_registry, _default_registry_pid
+    if _default_registry is None or _default_registry_pid != os.getpid():
+        _default_registry = PatternRegistry()
+        _default_registry_pid = os.getpid()
+        atexit.register(_default_registry.flush)
+    return _default_registry
+
+
+def extract(text, family, fields=None, validate=None):
+    """
+    استخراج اطلاعات سند با مخزن مشترک
+    """
+    return get_registry().extract(text, family, fields=fields, validate=validate)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'stats':
+        print("استفاده:")
+        print("  python doc_patterns.py stats [FAMILY]")
+        sys.exit(1)
+    get_registry().print_stats(sys.argv[2] if len(sys.argv) > 2 else None)
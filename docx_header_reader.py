@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DOCX Header Reader - خواندن سریع Sequence Number، Revision و Date از فایل Word
+
+python-docx کل سند (گزارش ماهانه 100 صفحه‌ای با عکس و جدول) را بارگذاری می‌کند
+در حالی که این سه فیلد همیشه در Header یا جداول اول سند هستند. اینجا:
+- فایل docx به صورت zip باز می‌شود و فقط word/header*.xml و ابتدای word/document.xml
+  به صورت جریانی (iterparse) خوانده می‌شود
+- به محض پیدا شدن هر سه فیلد خواندن متوقف می‌شود
+- قواعد تشخیص همان قواعد WordFileRenamer.extract_table_data است؛ در هر دو مسیر اولین مقدار
+  پیدا شده برای هر فیلد نگه داشته می‌شود
+
+استفاده:
+    from docx_header_reader import read_report_fields
+
+    data = read_report_fields(file_path)   # {'sequence_number', 'date', 'revision'}
+
+مقایسه با python-docx:
+    python docx_header_reader.py <file.docx|folder>
+"""
+
+import re
+import sys
+import time
+import zipfile
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+
+# حداکثر تعداد جداول بدنه سند که بررسی می‌شوند
+MAX_BODY_TABLES = 3
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_TBL, _TR, _TC, _P = W + 'tbl', W + 'tr', W + 'tc', W + 'p'
+_T, _TAB, _BR, _CR = W + 't', W + 'tab', W + 'br', W + 'cr'
+_R, _HYPERLINK = W + 'r', W + 'hyperlink'
+_VAL = W + 'val'
+
+_HEADER_PART = re.compile(r'^word/header(\d*)\.xml$')
+
+REVISION_LABELS = ('Revision', 'Rev', 'REV')
+DATE_LABELS = ('Date', 'DATE')
+
+
+def _runs(p):
+    """
+    اجراهای (w:r) پاراگراف، شامل اجراهای داخل لینک؛ w:pPr (مثلا tab stop ها) متن نیست
+    """
+    for child in p:
+        if child.tag == _R:
+            yield child
+        elif child.tag == _HYPERLINK:
+            yield from child.findall(_R)
+
+
+def _paragraph_text(p):
+    """
+    متن پاراگراف مثل paragraph.text در python-docx
+    """
+    parts = []
+    for node in (n for r in _runs(p) for n in r):
+        if node.tag == _T:
+            parts.append(node.text or '')
+        elif node.tag == _TAB:
+            parts.append('\t')
+        elif node.tag in (_BR, _CR):
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _cell(tc):
+    """
+    متن سلول (فقط پاراگراف‌های مستقیم، مثل cell.text در python-docx)، تعداد ستون و وضعیت ادغام عمودی
+    """
+    text = '\n'.join(_paragraph_text(p) for p in tc.findall(_P))
+    span = 1
+    continued = False
+    props = tc.find(W + 'tcPr')
+    if props is not None:
+        grid_span = props.find(W + 'gridSpan')
+        if grid_span is not None:
+            span = int(grid_span.get(_VAL, 1))
+        v_merge = props.find(W + 'vMerge')
+        if v_merge is not None:
+            continued = v_merge.get(_VAL, 'continue') == 'continue'
+    return text, span, continued
+
+
+def _expand_row(tr, cells, previous):
+    """
+    تبدیل سلول‌های یک ردیف به لیست متن به ازای هر ستون جدول (مثل row.cells در python-docx)
+    """
+    row = []
+    grid_before = tr.find(W + 'trPr/' + W + 'gridBefore')
+    if grid_before is not None:
+        row.extend([''] * int(grid_before.get(_VAL, 0)))
+    for text, span, continued in cells:
+        col = len(row)
+        if continued and previous is not None and col < len(previous):
+            text = previous[col]
+        row.extend([text] * span)
+    return row
+
+
+def iter_tables(stream):
+    """
+    جداول سطح اول یک بخش XML به ترتیب؛ هر جدول: [[متن سلول, ...], ...]
+
+    خواندن جریانی است و با توقف مصرف کننده، بقیه فایل خوانده نمی‌شود.
+    """
+    depth = 0
+    rows = []
+    cells = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == _TBL:
+                depth += 1
+                if depth == 1:
+                    rows, cells = [], []
+            continue
+
+        if tag == _TBL:
+            depth -= 1
+            if depth == 0:
+                yield rows
+                elem.clear()
+        elif depth == 1 and tag == _TC:
+            cells.append(_cell(elem))
+        elif depth == 1 and tag == _TR:
+            rows.append(_expand_row(elem, cells, rows[-1] if rows else None))
+            cells = []
+            elem.clear()
+        elif depth == 0 and tag == _P:
+            elem.clear()  # پاراگراف‌های بیرون از جدول در حافظه نمانند
+
+
+def _value_below(rows, row_idx, col):
+    if row_idx + 1 < len(rows) and col < len(rows[row_idx + 1]):
+        return rows[row_idx + 1][col].strip()
+    return ''
+
+
+def _scan_header_table(rows, data):
+    for row_idx, row in enumerate(rows):
+        for i, cell_text in enumerate(row):
+            cell_text = cell_text.strip()
+            if not data['sequence_number'] and 'Sequence' in cell_text and 'Number' in cell_text:
+                value = _value_below(rows, row_idx, i)
+                if value and value.isdigit():
+                    data['sequence_number'] = value.zfill(4)
+            elif not data['revision'] and cell_text in REVISION_LABELS:
+                value = _value_below(rows, row_idx, i)
+                if value and value.startswith('G'):
+                    data['revision'] = value
+
+
+def _scan_body_table(rows, data):
+    for row_idx, row in enumerate(rows):
+        for i, cell_text in enumerate(row):
+            cell_text = cell_text.strip()
+            if not data['revision'] and cell_text in REVISION_LABELS:
+                value = _value_below(rows, row_idx, i)
+                if value:
+                    data['revision'] = value
+            elif not data['date'] and cell_text in DATE_LABELS:
+                value = _value_below(rows, row_idx, i)
+                if value and len(value) > 5:  # تاریخ حداقل باید معتبر باشد
+                    data['date'] = value
+
+
+def _header_parts(names):
+    headers = []
+    for name in names:
+        match = _HEADER_PART.match(name)
+        if match:
+            headers.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(headers)]
+
+
+def read_report_fields(docx_path, max_body_tables=MAX_BODY_TABLES):
+    """
+    استخراج Sequence Number و Revision از Header و Date (و Revision) از جداول اول سند
+
+    Returns:
+        dict: دیکشنری حاوی sequence_number, date, revision (فیلد پیدا نشده: None)
+    """
+    data = {
+        'sequence_number': None,
+        'date': None,
+        'revision': None
+    }
+
+    with zipfile.ZipFile(docx_path) as archive:
+        # 1. جستجو در Header (برای Sequence Number و Revision)
+        for name in _header_parts(archive.namelist()):
+            with archive.open(name) as stream:
+                for rows in iter_tables(stream):
+                    _scan_header_table(rows, data)
+            if data['sequence_number'] and data['revision']:
+                break
+
+        # 2. جستجو در جداول اول سند (برای Date و Revision)
+        with archive.open('word/document.xml') as stream:
+            for count, rows in enumerate(iter_tables(stream), 1):
+                _scan_body_table(rows, data)
+                if (data['date'] and data['revision']) or count >= max_body_tables:
+                    break
+
+    return data
+
+
+def compare(paths):
+    """
+    مقایسه زمان و نتیجه با python-docx (WordFileRenamer.extract_table_data)
+    """
+    from docx import Document
+    from Rename import WordFileRenamer
+
+    renamer = WordFileRenamer('.')
+    lazy_total = full_total = 0.0
+    for path in paths:
+        started = time.perf_counter()
+        lazy = read_report_fields(path)
+        lazy_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        full = renamer.extract_table_data(Document(path))
+        full_seconds = time.perf_counter() - started
+
+        lazy_total += lazy_seconds
+        full_total += full_seconds
+        mark = '✅' if lazy == full else '⚠️'
+        print(f"{mark} {path.name}: {lazy_seconds * 1000:.1f} ms / python-docx {full_seconds * 1000:.1f} ms")
+        if lazy != full:
+            print(f"     سریع:       {lazy}")
+            print(f"     python-docx: {full}")
+
+    print(f"\n📊 {len(paths)} فایل: {lazy_total:.2f} ثانیه در برابر {full_total:.2f} ثانیه")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("استفاده:")
+        print("  python docx_header_reader.py <file.docx|folder>")
+        sys.exit(1)
+
+    target = Path(sys.argv[1])
+    files = sorted(target.glob('*.docx')) if target.is_dir() else [target]
+    files = [f for f in files if not f.name.startswith('~$')]
+    compare(files)
@@ -9,10 +9,11 @@ import os
 from pathlib import Path
 import re
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from docx import Document
 
+from date_normalize import parse_date
+from report_writer import ReportWriter
+
 # سعی در import کتابخانه‌های PDF
 try:
     import PyPDF2
@@ -21,43 +22,6 @@ except:
     PDF_SUPPORT = False
     print("⚠️ PyPDF2 نصب نیست - فقط فایل‌های Word پردازش می‌شوند")
 
-def parse_date(date_str):
-    """تبدیل تاریخ به datetime"""
-    if not date_str:
-        return None
-    
-    months = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
-        'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-        'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
-    }
-    
-    try:
-        date_str = date_str.strip()
-        
-        # فرمت: 15-Dec-2024
-        parts = date_str.split('-')
-        if len(parts) == 3:
-            day = int(parts[0])
-            month = months.get(parts[1].lower())
-            year = int(parts[2])
-            if month:
-                return datetime(year, month, day)
-        
-        # فرمت: Dec 15, 2024
-        parts = date_str.replace(',', '').split()
-        if len(parts) == 3:
-            month = months.get(parts[0].lower())
-            day = int(parts[1])
-            year = int(parts[2])
-            if month:
-                return datetime(year, month, day)
-                
-    except:
-        pass
-    return None
-
 def extract_info_from_word(doc_path):
     """
     استخراج Revision و Date از فایل Word
@@ -221,53 +185,19 @@ def extract_info_from_pdf(pdf_path):
 
 def create_excel_report(files_data, output_path):
     """ایجاد گزارش Excel"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Weekly Reports Info"
-    
-    # استایل‌ها
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
-    
-    # هدر
-    headers = ['ردیف', 'نام فایل', 'Revision', 'تاریخ']
-    ws.append(headers)
-    
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = border
+    # هدر، عرض و استایل ستون‌ها
+    columns = [('ردیف', 8, 'center'), ('نام فایل', 50, 'center'), ('Revision', 15, 'center'), ('تاریخ', 20, 'date')]
     
     # داده‌ها
-    for idx, data in enumerate(files_data, start=1):
-        row = [
-            idx,
-            data['filename'],
-            data['revision'] if data['revision'] else 'N/A',
-            data['date'] if data['date'] else 'N/A'
-        ]
-        ws.append(row)
-        
-        row_num = idx + 1
-        for col_idx, cell in enumerate(ws[row_num], start=1):
-            cell.border = border
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # فرمت تاریخ
-            if col_idx == 4 and isinstance(cell.value, datetime):
-                cell.number_format = 'DD/MM/YYYY'
-    
-    # تنظیم عرض ستون‌ها
-    widths = [8, 50, 15, 20]
-    for idx, width in enumerate(widths, start=1):
-        ws.column_dimensions[chr(64 + idx)].width = width
+    with ReportWriter(output_path, "Weekly Reports Info", columns, header_color="4472C4", header_size=11) as report:
+        for idx, data in enumerate(files_data, start=1):
+            report.append([
+                idx,
+                data['filename'],
+                data['revision'] if data['revision'] else 'N/A',
+                data['date'] if data['date'] else 'N/A'
+            ])
     
-    wb.save(output_path)
     print(f"\n✅ گزارش Excel ذخیره شد: {output_path.name}")
 
 def main():
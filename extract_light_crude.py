@@ -2,10 +2,11 @@ import pandas as pd
 import os
 from pathlib import Path
 import re
-from datetime import datetime
 import shutil
 import PyPDF2
 
+from date_normalize import parse_date
+
 def extract_info_from_pdf(pdf_path):
     """
     استخراج Date, Ref No و Title از فایل PDF
@@ -25,17 +26,8 @@ def extract_info_from_pdf(pdf_path):
             
             date_str = date_match.group(1) if date_match else None
             
-            # تبدیل تاریخ به فرمت استاندارد
-            date_obj = None
-            if date_str:
-                try:
-                    # تبدیل فرمت مثل "4-Oct-2023" به datetime
-                    date_obj = datetime.strptime(date_str, '%d-%b-%Y')
-                except:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%d/%b/%Y')
-                    except:
-                        pass
+            # تبدیل تاریخ به فرمت استاندارد (مثل "4-Oct-2023" یا "4/Oct/2023")
+            date_obj = parse_date(date_str)
             
             # استخراج Ref No
             ref_match = re.search(r'Ref\s*No\.?\s*[:：]?\s*(SJSC-[A-Z]+-[A-Z]+-[A-Z]+-\d+-G\d+)', text, re.IGNORECASE)
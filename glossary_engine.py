@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glossary Engine - اعمال واژه‌نامه تخصصی در یک گذر
+
+روش قبلی برای هر اصطلاح یک re.sub جداگانه روی کل متن اجرا می‌کرد
+(هزینه: تعداد اصطلاحات × طول متن). اینجا همه اصطلاحات در یک trie
+کامپایل می‌شوند و متن فقط یک بار پیمایش می‌شود:
+- جستجو فقط از ابتدای کلمات شروع می‌شود (مرز کلمه مثل \\b)
+- طولانی‌ترین اصطلاح منطبق انتخاب می‌شود
+- حساس به حروف بزرگ و کوچک نیست
+
+واژه‌نامه از dict، CSV یا XLSX (ستون اول: انگلیسی، ستون دوم: فارسی) بارگذاری می‌شود.
+
+استفاده:
+    from glossary_engine import Glossary
+
+    glossary = Glossary(OIL_GAS_TERMS)
+    glossary.load('glossary.xlsx')
+    text_fa = glossary.apply(text_fa)
+
+بنچمارک:
+    python glossary_engine.py benchmark [--sizes 10,1000,10000]
+"""
+
+import os
+import re
+import csv
+import sys
+import time
+import random
+
+from translation_memory import glossary_version
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+# نام ستون‌های قابل قبول در فایل واژه‌نامه (در غیر این صورت دو ستون اول)
+SOURCE_COLUMNS = ('english', 'en', 'term', 'source')
+TARGET_COLUMNS = ('persian', 'farsi', 'fa', 'translation', 'target')
+
+# ابتدای هر کلمه (کاراکتر کلمه‌ای که قبلش کاراکتر کلمه‌ای نیست)
+WORD_START = re.compile(r'(?<!\w)\w')
+
+# علامت پایان اصطلاح در گره‌های trie
+_END = ''
+
+
+def _fold(text):
+    """
+    حروف کوچک با حفظ طول متن (برای نگاشت موقعیت‌ها به متن اصلی)
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+_is_word_char = re.compile(r'\w').match
+
+
+class Glossary:
+    """
+    واژه‌نامه کامپایل شده (trie) با جایگزینی طولانی‌ترین تطابق در یک گذر
+    """
+
+    def __init__(self, terms=None):
+        self.terms = {}
+        self._trie = None
+        if terms:
+            self.update(terms)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def update(self, terms):
+        """
+        افزودن اصطلاحات {انگلیسی: فارسی}؛ اصطلاح تکراری جایگزین قبلی می‌شود
+        """
+        for source, target in terms.items():
+            source = ' '.join(str(source).split())
+            if source:
+                self.terms[source] = str(target).strip()
+        self._trie = None
+
+    def load(self, path):
+        """
+        بارگذاری واژه‌نامه از فایل CSV یا XLSX
+        """
+        ext = os.path.splitext(str(path))[1].lower()
+        if ext in ('.xlsx', '.xlsm'):
+            if not OPENPYXL_AVAILABLE:
+                raise RuntimeError("openpyxl نصب نیست")
+            wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+            try:
+                rows = [list(r) for r in wb.active.iter_rows(values_only=True)]
+            finally:
+                wb.close()
+        else:
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                rows = list(csv.reader(f))
+
+        rows = [r for r in rows if r and any(c not in (None, '') for c in r)]
+        if not rows:
+            return 0
+
+        # تشخیص سطر عنوان
+        header = [str(c or '').strip().lower() for c in rows[0]]
+        src_idx, tgt_idx = 0, 1
+        if any(h in SOURCE_COLUMNS for h in header) or any(h in TARGET_COLUMNS for h in header):
+            src_idx = next((i for i, h in enumerate(header) if h in SOURCE_COLUMNS), 0)
+            tgt_idx = next((i for i, h in enumerate(header) if h in TARGET_COLUMNS), 1)
+            rows = rows[1:]
+
+        terms = {}
+        for row in rows:
+            if len(row) <= max(src_idx, tgt_idx):
+                continue
+            source, target = row[src_idx], row[tgt_idx]
+            if source not in (None, '') and target not in (None, ''):
+                terms[source] = target
+        self.update(terms)
+        return len(terms)
+
+    @property
+    def version(self):
+        """
+        نسخه واژه‌نامه (برای کلید حافظه ترجمه)
+        """
+        return glossary_version(self.terms)
+
+    def compile(self):
+        """
+        ساخت trie از اصطلاحات (حروف کوچک)
+        """
+        trie = {}
+        for source, target in self.terms.items():
+            node = trie
+            for ch in _fold(source):
+                node = node.setdefault(ch, {})
+            node[_END] = target
+        self._trie = trie
+        return trie
+
+    def apply(self, text):
+        """
+        جایگزینی همه اصطلاحات در یک گذر (طولانی‌ترین تطابق، با مرز کلمه)
+        """
+        if not text or not self.terms:
+            return text
+        trie = self._trie if self._trie is not None else self.compile()
+
+        folded = _fold(text)
+        n = len(text)
+        out = []
+        last = 0
+        for m in WORD_START.finditer(folded):
+            start = m.start()
+            if start < last:
+                continue
+            node = trie
+            match_end = -1
+            match_target = None
+            i = start
+            while i < n:
+                node = node.get(folded[i])
+                if node is None:
+                    break
+                i += 1
+                if _END in node and (i == n or not _is_word_char(folded[i])):
+                    match_end = i
+                    match_target = node[_END]
+            if match_end > 0:
+                out.append(text[last:start])
+                out.append(match_target)
+                last = match_end
+        out.append(text[last:])
+        return ''.join(out)
+
+
+def apply_terms_regex(text, terms):
+    """
+    روش قبلی (یک re.sub برای هر اصطلاح) - فقط برای مقایسه در بنچمارک
+    """
+    for eng, fa in terms.items():
+        text = re.sub(r'\b' + re.escape(eng) + r'\b', fa, text, flags=re.IGNORECASE)
+    return text
+
+
+def _synthetic_terms(count, rng):
+    words = ['pump', 'valve', 'pressure', 'flow', 'gas', 'oil', 'safety', 'line',
+             'control', 'relief', 'high', 'low', 'separator', 'tank', 'meter', 'well']
+    terms = {}
+    while len(terms) < count:
+        size = rng.choice((1, 1, 2, 2, 3))
+        source = ' '.join(rng.choice(words) + (str(rng.randrange(1000)) if rng.random() < 0.7 else '')
+                          for _ in range(size))
+        terms[source] = f"اصطلاح{len(terms)}"
+    return terms
+
+
+def benchmark(sizes=(10, 1000, 10000), text_chars=20000, seed=0):
+    """
+    مقایسه زمان اعمال واژه‌نامه با روش قبلی برای تعداد اصطلاحات مختلف
+    """
+    rng = random.Random(seed)
+    print("=" * 70)
+    print(f"📊 بنچمارک واژه‌نامه (متن {text_chars:,} کاراکتری)")
+    print("=" * 70)
+    print(f"{'اصطلاحات':>10} | {'کامپایل':>10} | {'trie':>10} | {'re.sub':>10} | {'نسبت':>8}")
+
+    for size in sizes:
+        terms = _synthetic_terms(size, rng)
+        sample = list(terms)
+        words = []
+        length = 0
+        while length < text_chars:
+            word = rng.choice(sample) if rng.random() < 0.2 else rng.choice(('the', 'of', 'and', 'unit', 'check'))
+            words.append(word)
+            length += len(word) + 1
+        text = ' '.join(words)
+
+        started = time.perf_counter()
+        glossary = Glossary(terms)
+        glossary.compile()
+        compile_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        fast = glossary.apply(text)
+        trie_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        slow = apply_terms_regex(text, terms)
+        regex_seconds = time.perf_counter() - started
+
+        note = "" if fast == slow else "  (⚠️ خروجی متفاوت: ترتیب اعمال re.sub)"
+        print(f"{size:>10,} | {compile_seconds * 1000:>8.1f}ms | {trie_seconds * 1000:>8.1f}ms | "
+              f"{regex_seconds * 1000:>8.1f}ms | {regex_seconds / max(trie_seconds, 1e-9):>7.1f}x{note}")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('benchmark', 'apply'):
+        print("استفاده:")
+        print("  python glossary_engine.py benchmark [--sizes 10,1000,10000]")
+        print("  python glossary_engine.py apply <glossary.csv|xlsx> <input.txt>")
+        return
+
+    if args[0] == 'benchmark':
+        sizes = (10, 1000, 10000)
+        if '--sizes' in args:
+            sizes = tuple(int(s) for s in args[args.index('--sizes') + 1].split(','))
+        benchmark(sizes)
+        return
+
+    glossary = Glossary()
+    count = glossary.load(args[1])
+    print(f"📖 {count} اصطلاح بارگذاری شد (نسخه {glossary.version})")
+    with open(args[2], encoding='utf-8') as f:
+        print(glossary.apply(f.read()))
+
+
+if __name__ == "__main__":
+    main()
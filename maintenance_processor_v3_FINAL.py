@@ -10,11 +10,16 @@ Author: Claude AI
 Date: 2025-12-17
 """
 
+import io
 import os
-import re
+import time
 from pathlib import Path
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from doc_patterns import extract as extract_fields, get_registry
+from rename_planner import apply_renames
+from report_writer import ReportWriter
 
 # Try to import PDF and Word libraries
 try:
@@ -32,6 +37,16 @@ except ImportError:
     print("⚠️  Warning: python-docx not installed. Word processing will be skipped.")
 
 
+# Parallel processing: one process pool per file type (pdfplumber pages cost
+# far more than python-docx tables, so PDFs get most of the cores)
+PARALLEL = True
+PDF_WORKERS = max(1, (os.cpu_count() or 2) - 2)
+WORD_WORKERS = 2
+
+SUPPORTED_TYPES = {'.pdf': 'PDF', '.docx': 'Word', '.doc': 'Word'}
+WORKERS = {'PDF': PDF_WORKERS, 'Word': WORD_WORKERS}
+
+
 def is_temp_file(filename):
     """Check if file is a temporary file"""
     temp_patterns = ['~$', '.tmp', '.temp', '~lock']
@@ -91,46 +106,13 @@ def extract_metadata(text, filename):
         'date': None
     }
     
-    # Extract Sequence Number - try multiple patterns
-    seq_patterns = [
-        r'Sequence\s+Number\s*[:\-|]?\s*(\d+)',  # With pipes from table
-        r'Number\s*[:\-|]?\s*(\d+)',
-        r'Seq\s*[:\-|]?\s*(\d+)',
-        r'\|\s*(\d{4})\s*\|',  # Just number in table
-        r'(?:Sequence|Number).*?(\d{3,4})',  # More flexible
-    ]
-    
-    for pattern in seq_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            metadata['sequence'] = match.group(1).zfill(4)
-            break
-    
-    # Extract Revision - try multiple patterns
-    rev_patterns = [
-        r'Revision\s*[:\-|]?\s*(G\d+)',
-        r'\|\s*(G\d{2,3})\s*\|',  # In table
-        r'\b(G\d{2,3})\b',  # Standalone
-    ]
-    
-    for pattern in rev_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            metadata['revision'] = match.group(1).upper()
-            break
-    
-    # Extract Date - try multiple patterns
-    date_patterns = [
-        r'Date\s*[:\-|]?\s*(\d{1,2}[-/][A-Za-z]{3}[-/]\d{4})',
-        r'(\d{1,2}[-/][A-Za-z]{3}[-/]\d{4})',
-        r'Date.*?(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})',
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
-        if match:
-            metadata['date'] = match.group(1)
-            break
+    # Sequence / Revision / Date from the shared pattern registry (REMO_TABLE family)
+    info = extract_fields(text, 'REMO_TABLE')
+    if info['sequence']:
+        metadata['sequence'] = info['sequence'].zfill(4)
+    if info['revision']:
+        metadata['revision'] = info['revision'].upper()
+    metadata['date'] = info['date']
     
     # Debug output
     if metadata['sequence'] or metadata['revision']:
@@ -183,79 +165,163 @@ def process_file(file_path):
     }
 
 
-def process_directory(directory_path):
-    """Process all PDF and Word files in directory"""
+def scan_directory(directory):
+    """Classify PDF/Word files in a single directory pass; returns ({type: [paths]}, skipped)"""
+    files = {file_type: [] for file_type in WORKERS}
+    skipped = []
+    
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            file_type = SUPPORTED_TYPES.get(os.path.splitext(entry.name)[1].lower())
+            if not file_type or not entry.is_file():
+                continue
+            # Skip temporary files
+            if is_temp_file(entry.name):
+                skipped.append(entry.name)
+                continue
+            files[file_type].append(Path(entry.path))
+    
+    for paths in files.values():
+        paths.sort()
+    return files, sorted(skipped)
+
+
+def _process_file_job(file_path):
+    """Run process_file in a worker; its output is captured so each file's log stays together"""
+    log = io.StringIO()
+    started = time.perf_counter()
+    with redirect_stdout(log):
+        result = process_file(file_path)
+    # atexit does not run in pool workers: persist pattern hit counts here
+    get_registry().flush()
+    return result, log.getvalue(), time.perf_counter() - started
+
+
+def _run_jobs(files):
+    """Yield (file_type, path, (result, log, seconds)) as each file completes"""
+    if not PARALLEL:
+        for file_type, paths in files.items():
+            for file_path in paths:
+                yield file_type, file_path, _process_file_job(file_path)
+        return
+    
+    pools = {}
+    futures = {}
+    try:
+        for file_type, paths in files.items():
+            if not paths:
+                continue
+            pool = ProcessPoolExecutor(max_workers=min(WORKERS[file_type], len(paths)))
+            pools[file_type] = pool
+            for file_path in paths:
+                futures[pool.submit(_process_file_job, file_path)] = (file_type, file_path)
+        
+        for future in as_completed(futures):
+            file_type, file_path = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = (None, f"\n📖 Processing: {file_path.name}\n  ❌ Worker error: {e}\n", 0.0)
+            yield file_type, file_path, outcome
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def iter_process_directory(directory_path):
+    """Process all PDF and Word files in directory, yielding results as files complete"""
     directory = Path(directory_path)
     
     if not directory.exists():
         print(f"\n❌ Error: Directory not found!")
         print(f"   Path: {directory_path}")
-        return []
+        return
     
     print(f"\n{'='*70}")
     print(f"📁 Scanning directory...")
     print(f"{'='*70}")
     
-    results = []
-    skipped = []
-    
-    # Find all files
-    all_files = (
-        list(directory.glob("*.pdf")) + 
-        list(directory.glob("*.docx")) + 
-        list(directory.glob("*.doc"))
-    )
-    
-    print(f"\n📊 Found {len(all_files)} file(s) total")
-    
-    for file_path in all_files:
-        # Skip temporary files
-        if is_temp_file(file_path.name):
-            print(f"\n⏭️  Skipping temporary: {file_path.name}")
-            skipped.append(file_path.name)
-            continue
+    files, skipped = scan_directory(directory)
+    total = sum(len(paths) for paths in files.values())
+    
+    for name in skipped:
+        print(f"\n⏭️  Skipping temporary: {name}")
+    counts = ', '.join(f"{file_type}: {len(paths)}" for file_type, paths in files.items())
+    print(f"\n📊 Found {total + len(skipped)} file(s) total ({counts})")
+    
+    started = time.perf_counter()
+    done = 0
+    succeeded = 0
+    type_done = {file_type: 0 for file_type in files}
+    type_seconds = {file_type: 0.0 for file_type in files}
+    # Each type's pool runs from `started` until its latest completion
+    type_elapsed = {file_type: 0.0 for file_type in files}
+    
+    for file_type, file_path, (result, log, seconds) in _run_jobs(files):
+        done += 1
+        type_done[file_type] += 1
+        type_seconds[file_type] += seconds
         
-        # Process file
-        result = process_file(file_path)
+        print(log, end='')
         if result:
-            results.append(result)
+            succeeded += 1
             print(f"  ✅ New name: {result['new_name']}")
+        
+        # Progress, ETA and per-type throughput
+        elapsed = time.perf_counter() - started
+        type_elapsed[file_type] = elapsed
+        eta = elapsed / done * (total - done)
+        rates = ', '.join(
+            f"{t} {n / type_elapsed[t]:.1f}/s ({type_seconds[t] / n:.2f} s/file)"
+            for t, n in type_done.items() if n and type_elapsed[t]
+        )
+        print(f"  ⏱️  [{done}/{total}] {done * 100 // total}% | "
+              f"elapsed {_format_seconds(elapsed)} | ETA {_format_seconds(eta)} | {rates}")
+        
+        # Rows stream out in completion order; rename_files sorts before renaming
+        if result:
+            yield result
     
     print(f"\n{'='*70}")
-    print(f"✅ Successfully processed: {len(results)} file(s)")
+    print(f"✅ Successfully processed: {succeeded} file(s) in {_format_seconds(time.perf_counter() - started)}")
     if skipped:
         print(f"⏭️  Skipped temporary files: {len(skipped)}")
-    if len(all_files) - len(results) - len(skipped) > 0:
-        print(f"⚠️  Failed to process: {len(all_files) - len(results) - len(skipped)} file(s)")
+    if total - succeeded > 0:
+        print(f"⚠️  Failed to process: {total - succeeded} file(s)")
     print(f"{'='*70}")
-    
-    return results
+
+
+def process_directory(directory_path):
+    """Process all PDF and Word files in directory"""
+    return list(iter_process_directory(directory_path))
+
+
+def collect(items, into):
+    """Pass items through while keeping them in `into` (lets results stream into the report)"""
+    for item in items:
+        into.append(item)
+        yield item
 
 
 def create_excel_report(results, output_path):
-    """Create Excel report with file information"""
+    """Create Excel report with file information (results: list or generator)"""
     print(f"\n📊 Creating Excel report...")
     
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "File Rename Report"
-    
-    # Header row
-    headers = ['Original Filename', 'New Filename', 'Date', 'Sequence', 'Revision', 'Type']
-    ws.append(headers)
-    
-    # Style header
-    header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-    header_font = Font(bold=True, color='FFFFFF', size=12)
-    
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+    # Columns and styles are defined once; rows stream to disk as results arrive
+    columns = [
+        ('Original Filename', 50, 'plain'), ('New Filename', 45, 'plain'), ('Date', 15, 'plain_center'),
+        ('Sequence', 15, 'plain_center'), ('Revision', 12, 'plain_center'), ('Type', 10, 'plain_center')
+    ]
+    report = ReportWriter(output_path, "File Rename Report", columns, stripe='F2F2F2', keep_empty=False)
     
-    # Add data rows
+    # Add data rows (results may be a generator: rows are written as files complete)
     for item in results:
-        ws.append([
+        report.append([
             item['original_name'],
             item['new_name'],
             item['date'],
@@ -264,36 +330,17 @@ def create_excel_report(results, output_path):
             item['file_type']
         ])
     
-    # Column widths
-    ws.column_dimensions['A'].width = 50
-    ws.column_dimensions['B'].width = 45
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 15
-    ws.column_dimensions['E'].width = 12
-    ws.column_dimensions['F'].width = 10
-    
-    # Alternating row colors
-    light_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row), start=2):
-        if row_idx % 2 == 0:
-            for cell in row:
-                cell.fill = light_fill
-        # Center align certain columns
-        row[2].alignment = Alignment(horizontal='center')
-        row[3].alignment = Alignment(horizontal='center')
-        row[4].alignment = Alignment(horizontal='center')
-        row[5].alignment = Alignment(horizontal='center')
+    if not report.rows:
+        report.close()
+        print(f"⚠️  No rows to write - Excel report not created")
+        return False
     
     # Add summary
-    summary_row = ws.max_row + 2
-    ws[f'A{summary_row}'] = 'Total Files Processed:'
-    ws[f'B{summary_row}'] = len(results)
-    ws[f'A{summary_row}'].font = Font(bold=True, size=11)
-    ws[f'B{summary_row}'].font = Font(bold=True, size=11)
+    report.append_summary('Total Files Processed:', report.rows)
     
     # Save
     try:
-        wb.save(output_path)
+        report.close()
         print(f"✅ Excel report created successfully!")
         print(f"   📄 Location: {output_path}")
         return True
@@ -313,24 +360,25 @@ def rename_files(results, directory_path):
     success_count = 0
     fail_count = 0
     
+    # Files complete in any order; rename in name order so collision suffixes
+    # (_1, _2, ...) go to the same files on every run
+    results = sorted(results, key=lambda item: item['old_path'].name)
+    
+    # Plan the whole mapping from one directory listing and apply it in two phases
+    outcome = apply_renames(directory, [(item['old_path'].name, item['new_name']) for item in results])
+    
     for item in results:
-        old_path = item['old_path']
-        new_path = directory / item['new_name']
-        
-        try:
-            if new_path.exists():
-                print(f"⚠️  Exists: {item['new_name']}")
-                fail_count += 1
-                continue
-            
-            old_path.rename(new_path)
+        final_name, status = outcome[item['old_path'].name]
+        if status == 'renamed':
             print(f"✅ {item['original_name']}")
             print(f"   → {item['new_name']}")
             success_count += 1
-            
-        except Exception as e:
+        elif status in ('collision', 'unchanged'):
+            print(f"⚠️  Exists: {item['new_name']}")
+            fail_count += 1
+        else:
             print(f"❌ Failed: {item['original_name']}")
-            print(f"   Error: {e}")
+            print(f"   Error: {status}")
             fail_count += 1
     
     print(f"\n{'='*70}")
@@ -380,8 +428,9 @@ def main():
         print("   Install: pip install pdfplumber python-docx openpyxl")
         return
     
-    # Process files
-    results = process_directory(DIRECTORY_PATH)
+    # Process files; results stream into the Excel report as each file completes
+    results = []
+    report_created = create_excel_report(collect(iter_process_directory(DIRECTORY_PATH), results), OUTPUT_EXCEL)
     
     if not results:
         print(f"\n{'='*70}")
@@ -401,8 +450,7 @@ def main():
     # Show summary
     show_summary(results)
     
-    # Create Excel report
-    if not create_excel_report(results, OUTPUT_EXCEL):
+    if not report_created:
         print("\n⚠️  Excel report creation failed, but continuing...")
     
     # Ask to rename
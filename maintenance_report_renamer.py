@@ -10,74 +10,20 @@ import pytesseract
 from docx import Document
 from collections import defaultdict
 
+from pdf_progressive_ocr import progressive_ocr, ocr_stats_snapshot, print_ocr_stats
+from date_normalize import parse_date as parse_date_to_excel
+
 # تنظیم مسیر Tesseract (در صورت نیاز)
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-def parse_date_to_excel(date_str):
-    """
-    تبدیل تاریخ به datetime object
-    ورودی: 14-Oct-2024 یا 14-October-2024
-    """
-    if not date_str:
-        return None
-    
-    try:
-        months = {
-            'jan': 1, 'january': 1,
-            'feb': 2, 'february': 2,
-            'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4,
-            'may': 5,
-            'jun': 6, 'june': 6,
-            'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8,
-            'sep': 9, 'september': 9,
-            'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11,
-            'dec': 12, 'december': 12
-        }
-        
-        # پاک کردن فضاهای اضافی
-        date_str = date_str.strip()
-        
-        # فرمت 1: 14-Oct-2024
-        parts = date_str.split('-')
-        if len(parts) == 3:
-            day = int(parts[0])
-            month_name = parts[1].lower()
-            year = int(parts[2])
-            
-            month = months.get(month_name)
-            if month:
-                return datetime(year, month, day)
-        
-        # فرمت 2: 14 Oct 2024
-        parts = date_str.split()
-        if len(parts) == 3:
-            day = int(parts[0])
-            month_name = parts[1].lower()
-            year = int(parts[2])
-            
-            month = months.get(month_name)
-            if month:
-                return datetime(year, month, day)
-                
-    except Exception as e:
-        print(f"   ⚠️ خطا در تبدیل تاریخ '{date_str}': {e}")
-    
-    return None
-
 def extract_text_from_pdf_with_ocr(pdf_path):
     """
     استخراج متن از PDF با OCR
+    ابتدا نوار بالای صفحه با DPI پایین، سپس در صورت نیاز DPI و ناحیه بزرگ‌تر
     """
     try:
         print(f"   🔍 تلاش برای OCR...")
-        images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300)
-        
-        if images:
-            text = pytesseract.image_to_string(images[0], lang='eng')
-            return text
+        return progressive_ocr(pdf_path)
     except Exception as e:
         print(f"   ⚠️ خطا در OCR: {str(e)}")
     
@@ -366,6 +312,7 @@ def rename_files(folder_path):
     print("🔄 تغییر نام Maintenance Weekly Reports")
     print("="*80)
     print(f"📂 مسیر پوشه: {folder_path}\n")
+    ocr_snapshot = ocr_stats_snapshot()
     
     # پیدا کردن فایل‌ها
     all_files = []
@@ -495,6 +442,7 @@ def rename_files(folder_path):
     print(f"\n📊 نتیجه:")
     print(f"   ✅ موفق: {renamed_count}")
     print(f"   ❌ ناموفق: {failed_count}")
+    print_ocr_stats(since=ocr_snapshot)
     print("="*80)
 
 def main():
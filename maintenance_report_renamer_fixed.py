@@ -10,51 +10,11 @@ import pytesseract
 from docx import Document
 from collections import defaultdict
 
+from date_normalize import parse_date as parse_date_to_excel
+
 # تنظیم مسیر Tesseract (در صورت نیاز)
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-def parse_date_to_excel(date_str):
-    """
-    تبدیل تاریخ به datetime object
-    ورودی: 14-Oct-2024
-    """
-    if not date_str:
-        return None
-    
-    try:
-        months = {
-            'jan': 1, 'january': 1,
-            'feb': 2, 'february': 2,
-            'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4,
-            'may': 5,
-            'jun': 6, 'june': 6,
-            'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8,
-            'sep': 9, 'september': 9,
-            'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11,
-            'dec': 12, 'december': 12
-        }
-        
-        # حذف فضاهای اضافی
-        date_str = date_str.strip()
-        
-        # فرمت: 14-Oct-2024 یا 14-October-2024
-        parts = date_str.split('-')
-        if len(parts) == 3:
-            day = int(parts[0])
-            month_name = parts[1].lower()
-            year = int(parts[2])
-            
-            month = months.get(month_name)
-            if month:
-                return datetime(year, month, day)
-    except:
-        pass
-    
-    return None
-
 def extract_text_from_pdf_with_ocr(pdf_path):
     """
     استخراج متن از PDF با OCR
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Preprocess - خط لوله قابل تنظیم پیش‌پردازش تصویر برای OCR
+
+هر خط لوله فهرستی از مراحل است که به صورت متنی تعریف می‌شود:
+    "grayscale|downscale:0.5|median:3|otsu"
+
+زمان هر مرحله اندازه‌گیری می‌شود. در حالت tune، ارزان‌ترین خط لوله‌ای انتخاب می‌شود
+که دقت استخراج Doc No و تاریخ را روی نمونه‌های برچسب‌دار حفظ کند.
+
+استفاده:
+    from ocr_preprocess import PreprocessPipeline, default_pipeline
+    pipeline = default_pipeline()
+    processed = pipeline(image)
+    pipeline.print_timings()
+
+تنظیم خودکار (labels.csv با ستون‌های file,doc_no,date):
+    python ocr_preprocess.py tune labels.csv
+    python ocr_preprocess.py show
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+# فایل ذخیره خط لوله انتخاب شده در حالت tune
+CONFIG_PATH = os.environ.get('OCR_PREPROCESS_CONFIG',
+                             str(Path(__file__).with_name('ocr_preprocess.json')))
+
+
+# ---------------------------------------------------------------------------
+# مراحل
+# ---------------------------------------------------------------------------
+
+def stage_grayscale(img, order='rgb'):
+    if img.ndim == 2:
+        return img
+    if img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if order == 'bgr' else cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY if order == 'bgr' else cv2.COLOR_RGB2GRAY)
+
+
+def stage_downscale(img, scale=0.5):
+    scale = float(scale)
+    return cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def stage_max_width(img, width=2000):
+    width = int(width)
+    if img.shape[1] <= width:
+        return img
+    return stage_downscale(img, width / img.shape[1])
+
+
+def stage_clahe(img, clip=2.0, tile=8):
+    tile = int(tile)
+    return cv2.createCLAHE(clipLimit=float(clip), tileGridSize=(tile, tile)).apply(img)
+
+
+def stage_median(img, k=3):
+    return cv2.medianBlur(img, int(k))
+
+
+def stage_gaussian(img, k=3):
+    k = int(k)
+    return cv2.GaussianBlur(img, (k, k), 0)
+
+
+def stage_bilateral(img, d=5, sigma=50):
+    return cv2.bilateralFilter(img, int(d), float(sigma), float(sigma))
+
+
+def stage_nlmeans(img, h=3, template=7, search=21):
+    return cv2.fastNlMeansDenoising(img, None, float(h), int(template), int(search))
+
+
+def stage_otsu(img):
+    _, binary = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def stage_threshold(img, value=150):
+    _, binary = cv2.threshold(img, int(value), 255, cv2.THRESH_BINARY)
+    return binary
+
+
+def stage_adaptive(img, block=31, c=10):
+    return cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY, int(block), float(c))
+
+
+def stage_deskew(img, max_angle=10):
+    """
+    اصلاح کجی صفحه بر اساس زاویه پیکسل‌های متن (متن تیره روی زمینه روشن)
+    """
+    coords = np.column_stack(np.where(img < 128))
+    if len(coords) < 100:
+        return img
+    angle = cv2.minAreaRect(coords[:, ::-1].astype(np.float32))[-1]
+    if angle > 45:
+        angle -= 90
+    if abs(angle) < 0.1 or abs(angle) > float(max_angle):
+        return img
+    h, w = img.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(img, matrix, (w, h), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_REPLICATE)
+
+
+STAGES = {
+    'grayscale': stage_grayscale,
+    'downscale': stage_downscale,
+    'max_width': stage_max_width,
+    'clahe': stage_clahe,
+    'median': stage_median,
+    'gaussian': stage_gaussian,
+    'bilateral': stage_bilateral,
+    'nlmeans': stage_nlmeans,
+    'otsu': stage_otsu,
+    'threshold': stage_threshold,
+    'adaptive': stage_adaptive,
+    'deskew': stage_deskew,
+}
+
+
+# خط لوله‌های از پیش تعریف شده
+PIPELINES = {
+    # رفتار قبلی PDFProcessor.preprocess_image
+    'pdfprocessor_legacy': 'grayscale|clahe:2.0,8|nlmeans:3,7,21|otsu',
+    # رفتار قبلی ExtractedData.preprocess_image (تصویر از cv2.imread با ترتیب BGR)
+    'extracteddata_legacy': 'grayscale:bgr|threshold:150|nlmeans:10,7,21',
+    'fast': 'grayscale|median:3|otsu',
+    'fast_clahe': 'grayscale|clahe:2.0,8|median:3|otsu',
+}
+
+# کاندیداهای حالت tune (از ارزان به گران)
+TUNE_CANDIDATES = [
+    'grayscale|otsu',
+    'grayscale|downscale:0.67|otsu',
+    'grayscale|median:3|otsu',
+    'grayscale|downscale:0.67|median:3|otsu',
+    'grayscale|gaussian:3|otsu',
+    'grayscale|clahe:2.0,8|median:3|otsu',
+    'grayscale|bilateral:5,50|otsu',
+    'grayscale|median:3|adaptive:31,10',
+    'grayscale|clahe:2.0,8|median:3|otsu|deskew',
+    PIPELINES['pdfprocessor_legacy'],
+]
+
+
+def parse_spec(spec):
+    """
+    "grayscale|clahe:2.0,8|otsu" → [('grayscale', []), ('clahe', ['2.0', '8']), ('otsu', [])]
+    """
+    spec = PIPELINES.get(spec, spec)
+    steps = []
+    for part in spec.split('|'):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, args = part.partition(':')
+        if name not in STAGES:
+            raise ValueError(f"مرحله ناشناخته: {name}")
+        steps.append((name, [a for a in args.split(',') if a]))
+    return steps
+
+
+class PreprocessPipeline:
+    """
+    اجرای مراحل پیش‌پردازش با اندازه‌گیری زمان هر مرحله
+    """
+
+    def __init__(self, spec):
+        self.spec = PIPELINES.get(spec, spec)
+        self.steps = parse_spec(self.spec)
+        self.timings = {}
+        self.calls = 0
+
+    def __call__(self, image):
+        img = np.array(image) if isinstance(image, Image.Image) else image
+        self.calls += 1
+        for name, args in self.steps:
+            started = time.perf_counter()
+            img = STAGES[name](img, *args)
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+        return img
+
+    def total_seconds(self):
+        return sum(self.timings.values())
+
+    def print_timings(self):
+        if not self.calls:
+            return
+        print(f"\n🧪 پیش‌پردازش ({self.spec}) روی {self.calls} تصویر:")
+        total = self.total_seconds() or 1e-9
+        for name, _ in self.steps:
+            seconds = self.timings.get(name, 0.0)
+            print(f"  {name:<10} {seconds:>7.2f} ثانیه ({seconds / total:>4.0%})")
+
+
+def load_tuned_spec():
+    """
+    خط لوله انتخاب شده در آخرین اجرای tune (یا None)
+    """
+    try:
+        with open(CONFIG_PATH, encoding='utf-8') as f:
+            return json.load(f).get('tuned')
+    except (OSError, ValueError):
+        return None
+
+
+def default_pipeline(fallback='pdfprocessor_legacy'):
+    """
+    خط لوله تنظیم شده در صورت وجود، در غیر این صورت خط لوله پیش‌فرض
+    """
+    return PreprocessPipeline(load_tuned_spec() or fallback)
+
+
+# ---------------------------------------------------------------------------
+# تنظیم خودکار
+# ---------------------------------------------------------------------------
+
+_DOC_NO_RE = re.compile(r'SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-\d{4}-G\d{2}', re.IGNORECASE)
+_DATE_RE = re.compile(r'\b\d{1,2}[-\s/.][A-Za-z0-9]{2,9}[-\s/.]\d{2,4}\b')
+
+
+def _normalize(value):
+    return re.sub(r'[^A-Z0-9]', '', (value or '').upper())
+
+
+def _fields_correct(text, doc_no, date):
+    """
+    آیا Doc No و تاریخ برچسب در متن OCR پیدا شده‌اند؟
+    """
+    found_doc = {_normalize(m) for m in _DOC_NO_RE.findall(text)}
+    found_date = {_normalize(m) for m in _DATE_RE.findall(text)}
+    doc_ok = not doc_no or _normalize(doc_no) in found_doc
+    date_ok = not date or _normalize(date) in found_date
+    return doc_ok and date_ok
+
+
+def _load_sample_image(path):
+    """
+    تصویر نمونه؛ برای PDF صفحه اول با zoom=3 (مشابه PDFProcessor)
+    """
+    if str(path).lower().endswith('.pdf'):
+        import fitz
+        doc = fitz.open(path)
+        try:
+            pix = doc[0].get_pixmap(matrix=fitz.Matrix(3, 3))
+            return np.array(Image.frombytes("RGB", [pix.width, pix.height], pix.samples))
+        finally:
+            doc.close()
+    return np.array(Image.open(path).convert('RGB'))
+
+
+def load_labels(labels_csv):
+    """
+    labels.csv: file,doc_no,date (مسیر نسبی نسبت به محل فایل CSV)
+    """
+    base = Path(labels_csv).parent
+    samples = []
+    with open(labels_csv, encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            path = Path(row['file'])
+            if not path.is_absolute():
+                path = base / path
+            samples.append((path, row.get('doc_no', '').strip(), row.get('date', '').strip()))
+    return samples
+
+
+def tune(labels_csv, candidates=None, ocr=None, save=True):
+    """
+    ارزیابی کاندیداها روی نمونه‌های برچسب‌دار و انتخاب ارزان‌ترین خط لوله‌ای
+    که دقت آن کمتر از خط لوله قبلی نباشد
+
+    Args:
+        labels_csv: فایل برچسب‌ها
+        candidates: فهرست spec ها (پیش‌فرض TUNE_CANDIDATES)
+        ocr: تابع img → متن (پیش‌فرض Tesseract)
+    """
+    if ocr is None:
+        from ocr_service import run_tesseract
+        ocr = lambda img: run_tesseract(img)[0]
+
+    candidates = candidates or TUNE_CANDIDATES
+    baseline_spec = PIPELINES['pdfprocessor_legacy']
+    if baseline_spec not in candidates:
+        candidates = list(candidates) + [baseline_spec]
+
+    samples = load_labels(labels_csv)
+    images = []
+    for path, doc_no, date in samples:
+        try:
+            images.append((_load_sample_image(path), doc_no, date))
+        except Exception as e:
+            print(f"⚠️  {path}: {e}")
+    if not images:
+        print("❌ هیچ نمونه قابل استفاده‌ای پیدا نشد!")
+        return None
+
+    print("=" * 80)
+    print(f"🎯 تنظیم پیش‌پردازش روی {len(images)} نمونه و {len(candidates)} خط لوله")
+    print("=" * 80)
+
+    results = []
+    for spec in candidates:
+        pipeline = PreprocessPipeline(spec)
+        correct = 0
+        ocr_seconds = 0.0
+        for img, doc_no, date in images:
+            processed = pipeline(img)
+            started = time.perf_counter()
+            text = ocr(processed)
+            ocr_seconds += time.perf_counter() - started
+            correct += int(_fields_correct(text, doc_no, date))
+        accuracy = correct / len(images)
+        prep = pipeline.total_seconds() / len(images)
+        total = prep + ocr_seconds / len(images)
+        results.append((spec, accuracy, prep, total))
+        print(f"  {accuracy:>5.0%} | پیش‌پردازش {prep * 1000:>7.1f} ms | کل {total * 1000:>8.1f} ms | {spec}")
+
+    baseline_accuracy = next(r[1] for r in results if r[0] == baseline_spec)
+    eligible = [r for r in results if r[1] >= baseline_accuracy]
+    winner = min(eligible, key=lambda r: r[3])
+
+    print("-" * 80)
+    print(f"🏆 انتخاب: {winner[0]}")
+    print(f"   دقت {winner[1]:.0%} (پایه {baseline_accuracy:.0%}) | "
+          f"زمان هر صفحه {winner[3] * 1000:.0f} ms")
+
+    if save:
+        with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'tuned': winner[0], 'accuracy': winner[1],
+                       'baseline_accuracy': baseline_accuracy, 'samples': len(images)},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 ذخیره شد: {CONFIG_PATH}")
+    return winner[0]
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('tune', 'show'):
+        print("استفاده:")
+        print("  python ocr_preprocess.py tune labels.csv")
+        print("  python ocr_preprocess.py show")
+        return
+
+    if args[0] == 'show':
+        tuned = load_tuned_spec()
+        print(f"🧪 خط لوله فعلی: {tuned or PIPELINES['pdfprocessor_legacy']}"
+              + ("" if tuned else " (پیش‌فرض)"))
+        for name, spec in PIPELINES.items():
+            print(f"  {name:<22} {spec}")
+        return
+
+    if len(args) < 2:
+        print("❌ فایل برچسب‌ها مشخص نشده است")
+        return
+    tune(args[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR Service - سرویس محلی OCR با مدل‌های همیشه بارگذاری شده
+
+بارگذاری EasyOCR و PaddleOCR در هر اجرای اسکریپت چند ثانیه طول می‌کشد.
+این سرویس مدل‌ها را یک بار بارگذاری می‌کند و از طریق HTTP روی localhost
+به چند اسکریپت به صورت همزمان سرویس می‌دهد.
+
+اجرای سرویس:
+    python ocr_service.py serve [--port 8765] [--engines tesseract,easyocr,paddle]
+
+استفاده در اسکریپت‌ها (PDFProcessor به صورت خودکار از آن استفاده می‌کند):
+    from ocr_service import OCRClient
+    client = OCRClient.connect()
+    if client:
+        results = client.ocr('easyocr', [image1, image2])   # [(text, confidence), ...]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import base64
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import numpy as np
+    from PIL import Image
+    IMAGING_AVAILABLE = True
+except ImportError:
+    IMAGING_AVAILABLE = False
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_URL = os.environ.get('OCR_SERVICE_URL', f'http://{DEFAULT_HOST}:{DEFAULT_PORT}')
+
+# زمان انتظار برای بررسی در دسترس بودن سرویس (ثانیه)
+CONNECT_TIMEOUT = 0.5
+
+# زمان انتظار برای هر درخواست OCR (ثانیه)
+REQUEST_TIMEOUT = 600
+
+
+# ---------------------------------------------------------------------------
+# اجرای موتورها (مشترک بین سرویس و PDFProcessor)
+# ---------------------------------------------------------------------------
+
+def run_tesseract(img):
+    """
+    Tesseract: (متن، میانگین اطمینان 0 تا 100)
+    """
+    import pytesseract
+    data = pytesseract.image_to_data(img, lang='eng', output_type=pytesseract.Output.DICT)
+    words, confs = [], []
+    for word, conf in zip(data['text'], data['conf']):
+        conf = float(conf)
+        if word.strip() and conf >= 0:
+            words.append(word)
+            confs.append(conf)
+    return " ".join(words), (sum(confs) / len(confs) if confs else 0.0)
+
+
+def run_easyocr(reader, img):
+    """
+    EasyOCR: (متن، میانگین اطمینان 0 تا 100)
+    """
+    result = reader.readtext(img, detail=1, paragraph=False)
+    texts = [r[1] for r in result]
+    confs = [r[2] * 100 for r in result]
+    return " ".join(texts), (sum(confs) / len(confs) if confs else 0.0)
+
+
+def run_paddle(paddle_ocr, img):
+    """
+    PaddleOCR: (متن، میانگین اطمینان 0 تا 100)
+    """
+    result = paddle_ocr.ocr(img, cls=True)
+    if not result or not result[0]:
+        return "", 0.0
+    texts = [line[1][0] for line in result[0]]
+    confs = [line[1][1] * 100 for line in result[0]]
+    return " ".join(texts), sum(confs) / len(confs)
+
+
+def run_tesseract_batch(images, workers=None):
+    """
+    Tesseract گروهی؛ هر تصویر یک پردازش tesseract است، پس با thread موازی می‌شود
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(images) <= 1 or workers <= 1:
+        return [run_tesseract(img) for img in images]
+    with ThreadPoolExecutor(max_workers=min(workers, len(images))) as executor:
+        return list(executor.map(run_tesseract, images))
+
+
+def run_easyocr_batch(reader, images, batch_size=8):
+    """
+    EasyOCR گروهی با readtext_batched
+
+    readtext_batched فقط تصاویر هم‌اندازه را با هم می‌پذیرد؛ تصاویر بر اساس ابعاد گروه‌بندی می‌شوند.
+    """
+    results = [None] * len(images)
+    by_shape = {}
+    for idx, img in enumerate(images):
+        by_shape.setdefault(img.shape[:2], []).append(idx)
+
+    for indices in by_shape.values():
+        if len(indices) == 1:
+            results[indices[0]] = run_easyocr(reader, images[indices[0]])
+            continue
+        batch = reader.readtext_batched([images[i] for i in indices], detail=1,
+                                        paragraph=False, batch_size=batch_size)
+        for idx, result in zip(indices, batch):
+            texts = [r[1] for r in result]
+            confs = [r[2] * 100 for r in result]
+            results[idx] = (" ".join(texts), (sum(confs) / len(confs) if confs else 0.0))
+    return results
+
+
+def run_paddle_each(paddle_ocr, images):
+    """
+    PaddleOCR روی چند تصویر، یکی یکی
+
+    paddle_ocr.ocr هر بار فقط یک تصویر می‌پذیرد؛ تنها دسته‌بندی، دسته‌بندی خطوط داخل
+    همان تصویر در مرحله تشخیص متن است (rec_batch_num). رابط مثل توابع گروهی دیگر است
+    تا در cascade قابل جایگزینی باشد.
+    """
+    return [run_paddle(paddle_ocr, img) for img in images]
+
+
+def load_engines(names):
+    """
+    بارگذاری مدل‌ها؛ خروجی: {نام موتور: تابع(images) -> [(متن، اطمینان), ...]}
+    """
+    engines = {}
+    for name in names:
+        try:
+            if name == 'tesseract':
+                import pytesseract
+                pytesseract.get_tesseract_version()
+                engines[name] = run_tesseract_batch
+            elif name == 'easyocr':
+                import easyocr
+                print("🔧 راه‌اندازی EasyOCR...")
+                reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+                engines[name] = lambda imgs, _r=reader: run_easyocr_batch(_r, imgs)
+            elif name == 'paddle':
+                from paddleocr import PaddleOCR
+                print("🔧 راه‌اندازی PaddleOCR...")
+                paddle_ocr = PaddleOCR(use_angle_cls=True, lang='en', show_log=False)
+                engines[name] = lambda imgs, _p=paddle_ocr: run_paddle_each(_p, imgs)
+            print(f"✅ {name} آماده است")
+        except Exception as e:
+            print(f"⚠️  {name} در دسترس نیست: {e}")
+    return engines
+
+
+# ---------------------------------------------------------------------------
+# تبدیل تصویر برای ارسال
+# ---------------------------------------------------------------------------
+
+def encode_image(img):
+    """
+    numpy array یا PIL Image → PNG base64
+    """
+    if not isinstance(img, Image.Image):
+        img = Image.fromarray(img)
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def decode_image(data):
+    """
+    PNG base64 → numpy array
+    """
+    img = Image.open(io.BytesIO(base64.b64decode(data)))
+    return np.array(img)
+
+
+# ---------------------------------------------------------------------------
+# سرویس
+# ---------------------------------------------------------------------------
+
+class OCRServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, engines):
+        super().__init__(address, OCRRequestHandler)
+        self.engines = engines
+        # مدل‌ها thread-safe نیستند؛ هر موتور قفل خودش را دارد
+        self.locks = {name: threading.Lock() for name in engines}
+        # آمار از چند thread درخواست به‌روز می‌شود
+        self.stats_lock = threading.Lock()
+        self.stats = {name: {'images': 0, 'seconds': 0.0} for name in engines}
+        self.started = time.time()
+
+
+class OCRRequestHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'not found'})
+            return
+        with self.server.stats_lock:
+            stats = {name: dict(s) for name, s in self.server.stats.items()}
+        self._send_json(200, {
+            'engines': list(self.server.engines),
+            'uptime': time.time() - self.server.started,
+            'stats': stats,
+        })
+
+    def do_POST(self):
+        if self.path != '/ocr':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            engine = request['engine']
+            images = [decode_image(d) for d in request['images']]
+        except Exception as e:
+            self._send_json(400, {'error': f'bad request: {e}'})
+            return
+
+        if engine not in self.server.engines:
+            self._send_json(400, {'error': f'engine not loaded: {engine}'})
+            return
+
+        started = time.perf_counter()
+        try:
+            with self.server.locks[engine]:
+                results = self.server.engines[engine](images)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        seconds = time.perf_counter() - started
+
+        with self.server.stats_lock:
+            stats = self.server.stats[engine]
+            stats['images'] += len(images)
+            stats['seconds'] += seconds
+        self._send_json(200, {
+            'results': [{'text': t, 'confidence': c} for t, c in results],
+            'seconds': seconds,
+        })
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, engine_names=('tesseract', 'easyocr', 'paddle')):
+    """
+    اجرای سرویس تا زمان توقف با Ctrl+C
+    """
+    engines = load_engines(engine_names)
+    if not engines:
+        print("❌ هیچ موتور OCR بارگذاری نشد!")
+        return
+
+    server = OCRServer((host, port), engines)
+    print("=" * 70)
+    print(f"🚀 سرویس OCR روی http://{host}:{port}")
+    print(f"   موتورها: {', '.join(engines)}")
+    print("   برای توقف: Ctrl+C")
+    print("=" * 70)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 سرویس متوقف شد")
+    finally:
+        server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# کلاینت
+# ---------------------------------------------------------------------------
+
+class OCRServiceUnavailable(RuntimeError):
+    """
+    اتصال به سرویس OCR برقرار نشد (سرویس متوقف شده یا پاسخ نمی‌دهد)
+    """
+
+
+class OCRClient:
+    """
+    کلاینت سرویس OCR
+    """
+
+    def __init__(self, url, engines):
+        self.url = url.rstrip('/')
+        self.engines = engines
+
+    @classmethod
+    def connect(cls, url=DEFAULT_URL):
+        """
+        اتصال به سرویس؛ اگر سرویس در حال اجرا نباشد None برمی‌گرداند
+        """
+        if not IMAGING_AVAILABLE:
+            return None
+        try:
+            with urllib.request.urlopen(f"{url.rstrip('/')}/health", timeout=CONNECT_TIMEOUT) as resp:
+                info = json.loads(resp.read().decode('utf-8'))
+            return cls(url, info.get('engines', []))
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+
+    def ocr(self, engine, images):
+        """
+        OCR گروهی تصاویر؛ خروجی: [(متن، اطمینان), ...] به ترتیب ورودی
+
+        اگر سرویس در دسترس نباشد OCRServiceUnavailable (تا فراخواننده به موتورهای محلی برگردد)
+        و اگر سرویس خطا برگرداند RuntimeError ایجاد می‌شود.
+        """
+        payload = json.dumps({
+            'engine': engine,
+            'images': [encode_image(img) for img in images],
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            f"{self.url}/ocr", data=payload,
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as resp:
+                result = json.loads(resp.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"OCR service error: {e.read().decode('utf-8', 'replace')}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise OCRServiceUnavailable(f"OCR service unreachable: {e}") from e
+        return [(r['text'], r['confidence']) for r in result['results']]
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('serve', 'status'):
+        print("استفاده:")
+        print("  python ocr_service.py serve [--port 8765] [--engines tesseract,easyocr,paddle]")
+        print("  python ocr_service.py status")
+        return
+
+    port = int(args[args.index('--port') + 1]) if '--port' in args else DEFAULT_PORT
+
+    if args[0] == 'status':
+        client = OCRClient.connect(f'http://{DEFAULT_HOST}:{port}')
+        if client:
+            print(f"✅ سرویس OCR فعال است: {client.url} ({', '.join(client.engines)})")
+        else:
+            print("❌ سرویس OCR در حال اجرا نیست")
+        return
+
+    engine_names = ('tesseract', 'easyocr', 'paddle')
+    if '--engines' in args:
+        engine_names = args[args.index('--engines') + 1].split(',')
+    serve(port=port, engine_names=engine_names)
+
+
+if __name__ == "__main__":
+    main()
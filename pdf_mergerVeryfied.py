@@ -2,9 +2,14 @@ import os
 import re
 import pandas as pd
 from datetime import datetime
-from PyPDF2 import PdfMerger, PdfReader
+from PyPDF2 import PdfMerger
 import shutil
 
+from doc_patterns import extract as extract_fields
+
+from pdf_text_cache import get_default_cache
+from pdf_text_engine import extract_text, TEXT_ENGINES
+
 class PdfMergerProcessor:
     def __init__(self, directory_path):
         self.directory_path = directory_path
@@ -21,57 +26,36 @@ class PdfMergerProcessor:
         
         try:
             # خواندن محتوای PDF
-            reader = PdfReader(pdf_path)
-            text = ""
-            
             # خواندن چند صفحه اول (معمولاً Doc No در صفحه اول است)
-            for page_num in range(min(3, len(reader.pages))):
-                page = reader.pages[page_num]
-                text += page.extract_text() + " "
+            text, engine = extract_text(pdf_path, pages=(1, 3), engines=TEXT_ENGINES)
             
             print(f"  🔍 متن استخراج شده: {text[:200]}...")
             
-            # جستجوی Doc No با فرمت: SJSC-GGNRSP-PDPE-REDH/REDL-XXXX-GXX
-            doc_pattern = r'(SJSC-GGNRSP-[A-Z]+-[A-Z]+-(\d{4})-(G\d{2}))'
-            match = re.search(doc_pattern, text, re.IGNORECASE)
+            # جستجوی Doc No و Date با مخزن مشترک الگوها (خانواده PDPE)
+            # فرمت: SJSC-GGNRSP-PDPE-REDH/REDL-XXXX-GXX
+            info = extract_fields(text, 'PDPE')
+            doc_no = info['doc_no']
             
-            if match:
-                doc_no = match.group(1)
-                number = match.group(2)  # 4 رقم وسط (مثل 0388)
-                rev = match.group(3)      # Gxx (مثل G00)
+            if info['number']:
+                number = info['number']  # 4 رقم وسط (مثل 0388)
+                rev = info['rev']        # Gxx (مثل G00)
                 print(f"  ✅ Doc No پیدا شد: {doc_no}")
                 print(f"  ✅ Number: {number}, Rev: {rev}")
-            else:
-                # تلاش با الگوی دیگر
-                alt_pattern = r'Doc\s*No\.?\s*:?\s*([A-Z0-9\-]+)'
-                match2 = re.search(alt_pattern, text, re.IGNORECASE)
-                if match2:
-                    doc_no = match2.group(1)
-                    # استخراج number و rev از doc_no
-                    parts = doc_no.split('-')
-                    for i, part in enumerate(parts):
-                        if re.match(r'\d{4}', part):
-                            number = part
-                            if i + 1 < len(parts):
-                                rev_part = parts[i + 1]
-                                if re.match(r'G?\d{2}', rev_part, re.IGNORECASE):
-                                    rev = 'G' + re.sub(r'[^0-9]', '', rev_part).zfill(2)
-                            break
-            
-            # جستجوی Date
-            date_patterns = [
-                r'Date\s*:?\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-                r'Date\s*:?\s*(\d{4}-\d{2}-\d{2})',
-                r'(\d{4}-\d{2}-\d{2})',
-                r'(\d{1,2}/\d{1,2}/\d{4})',
-            ]
+            elif doc_no:
+                # استخراج number و rev از doc_no
+                parts = doc_no.split('-')
+                for i, part in enumerate(parts):
+                    if re.match(r'\d{4}', part):
+                        number = part
+                        if i + 1 < len(parts):
+                            rev_part = parts[i + 1]
+                            if re.match(r'G?\d{2}', rev_part, re.IGNORECASE):
+                                rev = 'G' + re.sub(r'[^0-9]', '', rev_part).zfill(2)
+                        break
             
-            for pattern in date_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    date = match.group(1).strip()
-                    print(f"  ✅ Date پیدا شد: {date}")
-                    break
+            if info['date']:
+                date = info['date'].strip()
+                print(f"  ✅ Date پیدا شد: {date}")
             
         except Exception as e:
             print(f"  ⚠️  خطا در خواندن PDF: {e}")
@@ -340,6 +324,7 @@ class PdfMergerProcessor:
         print(f"   ✅ کل موفق: {successful}")
         print(f"   🔗 ادغام شده (Heavy + Light): {merged_count}")
         print(f"   ❌ ناموفق: {failed}")
+        get_default_cache().print_stats()
         
         return excel_path
 
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Progressive OCR - OCR مرحله‌ای برای گزارش‌های اسکن شده
+
+به جای OCR کل صفحه اول با 300 DPI، ابتدا فقط نوار بالای صفحه با DPI پایین OCR می‌شود.
+فقط اگر شماره سند یا تاریخ پیدا نشود، DPI یا ناحیه بزرگ‌تر می‌شود.
+
+تعداد موفقیت هر مرحله و حجم پیکسل OCR شده در پایگاه داده کش ثبت می‌شود
+تا صرفه‌جویی CPU در هر اجرا مشخص باشد.
+
+استفاده:
+    from pdf_progressive_ocr import progressive_ocr, ocr_stats_snapshot, print_ocr_stats
+
+    snapshot = ocr_stats_snapshot()
+    text = progressive_ocr(pdf_path)
+    print_ocr_stats(since=snapshot)
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+from pdf_text_cache import cached_extract, DEFAULT_CACHE_PATH
+from pdf_title_block import missing_fields, DEFAULT_FIELDS
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+try:
+    import fitz  # PyMuPDF
+    from PIL import Image
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+try:
+    from pdf2image import convert_from_path
+    PDF2IMAGE_AVAILABLE = True
+except ImportError:
+    PDF2IMAGE_AVAILABLE = False
+
+OCR_AVAILABLE = TESSERACT_AVAILABLE and (PYMUPDF_AVAILABLE or PDF2IMAGE_AVAILABLE)
+
+
+# مراحل OCR: (DPI, ناحیه نسبی x0, y0, x1, y1)
+OCR_TIERS = [
+    (150, (0.0, 0.0, 1.0, 0.25)),   # نوار بالای صفحه - جدول عنوان
+    (300, (0.0, 0.0, 1.0, 0.25)),   # همان نوار با کیفیت بالاتر
+    (300, (0.0, 0.0, 1.0, 1.0)),    # کل صفحه (روش قبلی)
+]
+
+# مرجع مقایسه: کل صفحه با 300 DPI
+BASELINE_DPI = 300
+
+
+def _render_region(pdf_path, dpi, box):
+    """
+    تبدیل ناحیه‌ای از صفحه اول به تصویر
+    """
+    if PYMUPDF_AVAILABLE:
+        doc = fitz.open(pdf_path)
+        try:
+            page = doc[0]
+            r = page.rect
+            clip = fitz.Rect(r.x0 + box[0] * r.width, r.y0 + box[1] * r.height,
+                             r.x0 + box[2] * r.width, r.y0 + box[3] * r.height)
+            zoom = dpi / 72
+            # فقط همان ناحیه رندر می‌شود
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+            return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        finally:
+            doc.close()
+
+    images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=dpi)
+    if not images:
+        return None
+    img = images[0]
+    w, h = img.size
+    return img.crop((int(box[0] * w), int(box[1] * h), int(box[2] * w), int(box[3] * h)))
+
+
+class OCRTierStats:
+    """
+    آمار دائمی مراحل OCR (قابل اشتراک بین چند پردازش)
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_tiers (
+                tier INTEGER PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                successes INTEGER NOT NULL DEFAULT 0,
+                seconds REAL NOT NULL DEFAULT 0,
+                pixels REAL NOT NULL DEFAULT 0,
+                documents INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.conn.commit()
+
+    def record(self, tier, seconds, pixels, success, new_document):
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO ocr_tiers (tier, attempts, successes, seconds, pixels, documents) '
+                'VALUES (?, 1, ?, ?, ?, ?) '
+                'ON CONFLICT(tier) DO UPDATE SET attempts = attempts + 1, '
+                'successes = successes + excluded.successes, seconds = seconds + excluded.seconds, '
+                'pixels = pixels + excluded.pixels, documents = documents + excluded.documents',
+                (tier, int(bool(success)), seconds, pixels, int(bool(new_document)))
+            )
+            self.conn.commit()
+
+    def snapshot(self):
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT tier, attempts, successes, seconds, pixels, documents FROM ocr_tiers'
+            ).fetchall()
+        return {r[0]: r[1:] for r in rows}
+
+
+_default_stats = None
+_default_stats_pid = None
+
+
+def get_ocr_stats():
+    global _default_stats, _default_stats_pid
+    if _default_stats is None or _default_stats_pid != os.getpid():
+        _default_stats = OCRTierStats()
+        _default_stats_pid = os.getpid()
+    return _default_stats
+
+
+def ocr_stats_snapshot():
+    """
+    وضعیت فعلی آمار (برای محاسبه آمار یک اجرا)
+    """
+    try:
+        return get_ocr_stats().snapshot()
+    except sqlite3.Error:
+        return {}
+
+
+def _progressive_ocr(pdf_path, fields, require_labels):
+    stats = get_ocr_stats()
+    text = ""
+    for tier, (dpi, box) in enumerate(OCR_TIERS, start=1):
+        started = time.perf_counter()
+        img = _render_region(pdf_path, dpi, box)
+        if img is None:
+            break
+        text = pytesseract.image_to_string(img, lang='eng')
+        seconds = time.perf_counter() - started
+
+        missing = missing_fields(text, fields, require_labels)
+        stats.record(tier, seconds, img.size[0] * img.size[1], not missing, tier == 1)
+        if not missing:
+            print(f"   ✅ OCR مرحله {tier} ({dpi} DPI، {box[3] - box[1]:.0%} صفحه): {seconds:.1f} ثانیه")
+            return text
+        print(f"   ↗️ OCR مرحله {tier} کافی نبود ({', '.join(missing)})")
+    return text
+
+
+def progressive_ocr(pdf_path, fields=DEFAULT_FIELDS, require_labels=True):
+    """
+    OCR مرحله‌ای صفحه اول تا زمانی که فیلدهای لازم پیدا شوند
+
+    fields باید همان فیلدهایی باشد که فراخواننده از متن استخراج می‌کند (نام‌ها از FIELD_PATTERNS)؛
+    require_labels=False یعنی مقدار بدون برچسب ("Date:") هم کافی است.
+    """
+    if not OCR_AVAILABLE:
+        return ""
+    key = '+'.join(fields) + ('' if require_labels else ':unlabeled')
+    return cached_extract(pdf_path, lambda p: _progressive_ocr(p, fields, require_labels),
+                          pages=(1, 1), engine=f'tesseract-progressive:{key}')
+
+
+def print_ocr_stats(since=None):
+    """
+    نمایش درصد موفقیت هر مرحله و صرفه‌جویی نسبت به OCR کل صفحه با 300 DPI
+    """
+    current = ocr_stats_snapshot()
+    since = since or {}
+    rows = {}
+    for tier, values in current.items():
+        before = since.get(tier, (0, 0, 0.0, 0.0, 0))
+        delta = tuple(a - b for a, b in zip(values, before))
+        if delta[0]:
+            rows[tier] = delta
+    if not rows:
+        return
+
+    documents = rows.get(1, (0, 0, 0.0, 0.0, 0))[4]
+    print(f"\n🔍 OCR مرحله‌ای ({documents} فایل اسکن شده):")
+    total_seconds = 0.0
+    total_pixels = 0.0
+    for tier in sorted(rows):
+        attempts, successes, seconds, pixels, _ = rows[tier]
+        dpi, box = OCR_TIERS[tier - 1] if tier <= len(OCR_TIERS) else (0, (0, 0, 0, 0))
+        total_seconds += seconds
+        total_pixels += pixels
+        print(f"   مرحله {tier} ({dpi} DPI، {box[3] - box[1]:.0%} صفحه): "
+              f"{successes}/{attempts} موفق، {seconds:.1f} ثانیه")
+
+    # مرجع: پیکسل‌های کل صفحه A4 با 300 DPI برای هر فایل
+    baseline_pixels = documents * (8.27 * BASELINE_DPI) * (11.69 * BASELINE_DPI)
+    if baseline_pixels:
+        print(f"   💾 پیکسل OCR شده: {total_pixels / baseline_pixels:.0%} "
+              f"نسبت به OCR کل صفحه با {BASELINE_DPI} DPI | زمان کل: {total_seconds:.1f} ثانیه")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF Text Cache - کش دائمی متن استخراج شده از PDF
+
+متن استخراج شده از صفحات PDF را در یک پایگاه داده SQLite نگه می‌دارد.
+کلید کش: هش محتوای فایل + بازه صفحات + موتور استخراج
+بنابراین در اجرای دوباره روی یک پوشه، فقط فایل‌های جدید یا تغییر یافته پردازش می‌شوند.
+
+استفاده:
+    from pdf_text_cache import cached_extract
+
+    text = cached_extract(pdf_path, read_first_page, pages=(1, 1), engine='pypdf2')
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+
+# مسیر پیش‌فرض پایگاه داده کش (قابل تغییر با متغیر محیطی)
+DEFAULT_CACHE_PATH = os.environ.get(
+    'PDF_TEXT_CACHE',
+    str(Path.home() / '.sjsc_pdf_text_cache.sqlite3')
+)
+
+# حداکثر حجم متن ذخیره شده در کش (پیش‌فرض: 200 مگابایت)
+DEFAULT_MAX_BYTES = int(os.environ.get('PDF_TEXT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+
+# اندازه بلوک خواندن فایل برای محاسبه هش
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path):
+    """
+    محاسبه هش SHA-256 محتوای فایل
+    """
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class PDFTextCache:
+    """
+    کش متن PDF با پشتیبانی از LRU و شمارنده hit/miss
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pdf_text (
+                content_hash TEXT NOT NULL,
+                pages TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (content_hash, pages, engine)
+            );
+            CREATE INDEX IF NOT EXISTS idx_pdf_text_access ON pdf_text(last_access);
+
+            -- نگهداری هش فایل بر اساس (مسیر، حجم، زمان تغییر) برای جلوگیری از هش دوباره
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def content_hash(self, file_path):
+        """
+        هش محتوای فایل؛ اگر حجم و زمان تغییر عوض نشده باشد از هش قبلی استفاده می‌شود
+        """
+        path = str(Path(file_path).resolve())
+        st = os.stat(path)
+
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT size, mtime, content_hash FROM file_hashes WHERE path = ?',
+                (path,)
+            ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime:
+            return row[2]
+
+        digest = file_sha256(path)
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO file_hashes (path, size, mtime, content_hash) VALUES (?, ?, ?, ?)',
+                (path, st.st_size, st.st_mtime, digest)
+            )
+            self.conn.commit()
+        return digest
+
+    @staticmethod
+    def _pages_key(pages):
+        first, last = pages
+        return f"{first}-{last}"
+
+    def get(self, content_hash, pages, engine):
+        """
+        دریافت متن از کش (None در صورت عدم وجود)
+        """
+        key = (content_hash, self._pages_key(pages), engine)
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT text FROM pdf_text WHERE content_hash = ? AND pages = ? AND engine = ?',
+                key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.conn.execute(
+                'UPDATE pdf_text SET last_access = ? WHERE content_hash = ? AND pages = ? AND engine = ?',
+                (time.time(),) + key
+            )
+            self.conn.commit()
+            return row[0]
+
+    def put(self, content_hash, pages, engine, text):
+        """
+        ذخیره متن در کش و اعمال سقف حجم
+        """
+        text = text or ""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pdf_text '
+                '(content_hash, pages, engine, text, size, created, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (content_hash, self._pages_key(pages), engine, text,
+                 len(text.encode('utf-8')), now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """
+        حذف قدیمی‌ترین رکوردها (LRU) تا زمانی که حجم کل زیر سقف برود
+        """
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM pdf_text').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            'SELECT content_hash, pages, engine, size FROM pdf_text ORDER BY last_access ASC'
+        ).fetchall()
+        for content_hash, pages, engine, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute(
+                'DELETE FROM pdf_text WHERE content_hash = ? AND pages = ? AND engine = ?',
+                (content_hash, pages, engine)
+            )
+            total -= size
+            self.evictions += 1
+
+    def get_or_extract(self, pdf_path, extractor, pages=(1, 1), engine='pypdf2'):
+        """
+        متن را از کش برمی‌گرداند؛ در غیر این صورت extractor(pdf_path) را اجرا و نتیجه را ذخیره می‌کند
+
+        اگر extractor خطا بدهد، خطا بالا می‌رود و چیزی در کش ذخیره نمی‌شود.
+        """
+        digest = self.content_hash(pdf_path)
+        text = self.get(digest, pages, engine)
+        if text is not None:
+            return text
+
+        text = extractor(pdf_path)
+        self.put(digest, pages, engine, text)
+        return text or ""
+
+    def stats(self):
+        """
+        آمار کش
+        """
+        with self._lock:
+            entries, total = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pdf_text'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': total,
+            'max_bytes': self.max_bytes,
+        }
+
+    def print_stats(self):
+        """
+        نمایش آمار کش
+        """
+        s = self.stats()
+        print(f"\n🗃️ کش متن PDF: {s['hits']} hit / {s['misses']} miss "
+              f"({s['hit_rate']:.0%}) | {s['entries']} رکورد، "
+              f"{s['size_bytes'] / 1024 / 1024:.1f} از {s['max_bytes'] / 1024 / 1024:.0f} MB"
+              + (f" | {s['evictions']} حذف LRU" if s['evictions'] else ""))
+
+    def clear(self):
+        """
+        پاک کردن کامل کش
+        """
+        with self._lock:
+            self.conn.execute('DELETE FROM pdf_text')
+            self.conn.execute('DELETE FROM file_hashes')
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+_default_cache = None
+_default_cache_pid = None
+
+
+def get_default_cache():
+    """
+    نمونه مشترک کش برای کل فرآیند
+
+    اتصال SQLite بین پردازش‌ها قابل اشتراک نیست؛ هر پردازش فرزند اتصال خودش را می‌سازد.
+    """
+    global _default_cache, _default_cache_pid
+    if _default_cache is None or _default_cache_pid != os.getpid():
+        _default_cache = PDFTextCache()
+        _default_cache_pid = os.getpid()
+    return _default_cache
+
+
+def cached_extract(pdf_path, extractor, pages=(1, 1), engine='pypdf2'):
+    """
+    استخراج متن با استفاده از کش مشترک
+
+    اگر پایگاه داده کش در دسترس نباشد، extractor مستقیما اجرا می‌شود.
+    """
+    try:
+        cache = get_default_cache()
+    except sqlite3.Error as e:
+        print(f"   ⚠️ کش متن PDF در دسترس نیست: {e}")
+        return extractor(pdf_path) or ""
+    return cache.get_or_extract(pdf_path, extractor, pages=pages, engine=engine)
+
+
+if __name__ == "__main__":
+    import sys
+
+    cache = get_default_cache()
+    if len(sys.argv) > 1 and sys.argv[1] == 'clear':
+        cache.clear()
+        print("🧹 کش متن PDF پاک شد")
+    cache.print_stats()
+    print(f"📂 مسیر: {cache.db_path}")
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF Text Engine - لایه مشترک استخراج متن از PDF با انتخاب خودکار موتور
+
+موتورها به ترتیب پیش‌فرض: PyMuPDF → PyPDF2 → pdfplumber → OCR
+برای هر خانواده گزارش (مثلا REMO, REWK, Daily) زمان و نرخ موفقیت هر موتور ثبت می‌شود
+و در اجراهای بعدی سریع‌ترین موتوری که متن قابل استفاده می‌دهد اول امتحان می‌شود.
+
+استفاده:
+    from pdf_text_engine import extract_text
+    text = extract_text(pdf_path, pages=(1, 1))
+
+بنچمارک:
+    python pdf_text_engine.py benchmark "D:\\path\\to\\reports" [--sample 20] [--pages 1-3]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import sqlite3
+import threading
+from pathlib import Path
+
+from pdf_text_cache import cached_extract, DEFAULT_CACHE_PATH
+
+# موتورهای استخراج (همه اختیاری)
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+try:
+    import PyPDF2
+    PYPDF2_AVAILABLE = True
+except ImportError:
+    PYPDF2_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    import pytesseract
+    from PIL import Image
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+try:
+    from pdf2image import convert_from_path
+    PDF2IMAGE_AVAILABLE = True
+except ImportError:
+    PDF2IMAGE_AVAILABLE = False
+
+
+# حداقل طول متن برای "قابل استفاده" بودن (مشابه آستانه اسکریپت‌های rename)
+MIN_USABLE_CHARS = 50
+
+# حداقل تعداد نمونه قبل از اعتماد به آمار یک موتور
+MIN_SAMPLES = 3
+
+# حداقل نرخ موفقیت برای اینکه موتور "خوب" محسوب شود
+MIN_SUCCESS_RATE = 0.8
+
+OCR_DPI = 300
+
+
+def _page_range(first_page, last_page, page_count):
+    return range(first_page - 1, min(last_page, page_count))
+
+
+def _extract_pymupdf(pdf_path, first_page, last_page):
+    text = ""
+    doc = fitz.open(pdf_path)
+    try:
+        for i in _page_range(first_page, last_page, len(doc)):
+            text += doc[i].get_text() + "\n"
+    finally:
+        doc.close()
+    return text
+
+
+def _extract_pypdf2(pdf_path, first_page, last_page):
+    text = ""
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for i in _page_range(first_page, last_page, len(reader.pages)):
+            text += (reader.pages[i].extract_text() or "") + "\n"
+    return text
+
+
+def _extract_pdfplumber(pdf_path, first_page, last_page):
+    text = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for i in _page_range(first_page, last_page, len(pdf.pages)):
+            text += (pdf.pages[i].extract_text() or "") + "\n"
+    return text
+
+
+def _extract_ocr(pdf_path, first_page, last_page):
+    text = ""
+    if PYMUPDF_AVAILABLE:
+        doc = fitz.open(pdf_path)
+        try:
+            zoom = OCR_DPI / 72
+            for i in _page_range(first_page, last_page, len(doc)):
+                pix = doc[i].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+                text += pytesseract.image_to_string(img, lang='eng') + "\n"
+        finally:
+            doc.close()
+    else:
+        images = convert_from_path(pdf_path, first_page=first_page, last_page=last_page, dpi=OCR_DPI)
+        for img in images:
+            text += pytesseract.image_to_string(img, lang='eng') + "\n"
+    return text
+
+
+# ترتیب پیش‌فرض: از سریع به کند
+ENGINES = {
+    'pymupdf': (_extract_pymupdf, PYMUPDF_AVAILABLE),
+    'pypdf2': (_extract_pypdf2, PYPDF2_AVAILABLE),
+    'pdfplumber': (_extract_pdfplumber, PDFPLUMBER_AVAILABLE),
+    'ocr': (_extract_ocr, TESSERACT_AVAILABLE and (PYMUPDF_AVAILABLE or PDF2IMAGE_AVAILABLE)),
+}
+
+TEXT_ENGINES = ('pymupdf', 'pypdf2', 'pdfplumber')
+
+
+def available_engines(engines=None):
+    """
+    لیست موتورهای نصب شده (به ترتیب پیش‌فرض)
+    """
+    names = engines or ENGINES.keys()
+    return [name for name in names if name in ENGINES and ENGINES[name][1]]
+
+
+def is_usable(text):
+    """
+    آیا متن استخراج شده قابل استفاده است؟
+    """
+    return bool(text) and len(text.strip()) >= MIN_USABLE_CHARS
+
+
+def detect_family(pdf_path):
+    """
+    تشخیص خانواده گزارش از نام فایل
+
+    SJSC-GGNRSP-MADR-REMO-0012-G00.pdf → REMO
+    20241014-Daily Production Report.pdf → DAILY
+    """
+    name = Path(pdf_path).name.upper()
+    match = re.search(r'SJSC-[A-Z0-9]+-[A-Z0-9]+-([A-Z]{4})-', name)
+    if match:
+        return match.group(1)
+    for keyword in ('DAILY', 'WEEKLY', 'MONTHLY'):
+        if keyword in name:
+            return keyword
+    return 'DEFAULT'
+
+
+class EngineStats:
+    """
+    آمار دائمی زمان و نرخ موفقیت هر موتور برای هر خانواده گزارش
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS engine_stats (
+                family TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                successes INTEGER NOT NULL DEFAULT 0,
+                total_seconds REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (family, engine)
+            )
+        """)
+        self.conn.commit()
+
+    def record(self, family, engine, seconds, success):
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO engine_stats (family, engine, attempts, successes, total_seconds) '
+                'VALUES (?, ?, 1, ?, ?) '
+                'ON CONFLICT(family, engine) DO UPDATE SET '
+                'attempts = attempts + 1, successes = successes + excluded.successes, '
+                'total_seconds = total_seconds + excluded.total_seconds',
+                (family, engine, int(bool(success)), seconds)
+            )
+            self.conn.commit()
+
+    def summary(self, family=None):
+        """
+        {family: {engine: {'attempts', 'success_rate', 'mean_seconds'}}}
+        """
+        query = 'SELECT family, engine, attempts, successes, total_seconds FROM engine_stats'
+        params = ()
+        if family:
+            query += ' WHERE family = ?'
+            params = (family,)
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        result = {}
+        for fam, engine, attempts, successes, total_seconds in rows:
+            result.setdefault(fam, {})[engine] = {
+                'attempts': attempts,
+                'success_rate': successes / attempts if attempts else 0.0,
+                'mean_seconds': total_seconds / attempts if attempts else 0.0,
+            }
+        return result
+
+    def ranking(self, family, engines):
+        """
+        ترتیب موتورها برای یک خانواده:
+        1. موتورهای با آمار کافی و نرخ موفقیت بالا (سریع‌ترین اول)
+        2. موتورهای بدون آمار کافی (ترتیب پیش‌فرض)
+        3. موتورهای با نرخ موفقیت پایین (سریع‌ترین اول)
+        """
+        stats = self.summary(family).get(family, {})
+        good, unknown, bad = [], [], []
+        for engine in engines:
+            s = stats.get(engine)
+            if not s or s['attempts'] < MIN_SAMPLES:
+                unknown.append(engine)
+            elif s['success_rate'] >= MIN_SUCCESS_RATE:
+                good.append(engine)
+            else:
+                bad.append(engine)
+        good.sort(key=lambda e: stats[e]['mean_seconds'])
+        bad.sort(key=lambda e: (-stats[e]['success_rate'], stats[e]['mean_seconds']))
+        return good + unknown + bad
+
+
+_default_stats = None
+_default_stats_pid = None
+
+
+def get_engine_stats():
+    """
+    نمونه مشترک آمار موتورها (یک اتصال برای هر پردازش)
+    """
+    global _default_stats, _default_stats_pid
+    if _default_stats is None or _default_stats_pid != os.getpid():
+        _default_stats = EngineStats()
+        _default_stats_pid = os.getpid()
+    return _default_stats
+
+
+def run_engine(engine, pdf_path, pages=(1, 1)):
+    """
+    اجرای مستقیم یک موتور (بدون کش) و برگرداندن (متن، زمان)
+    """
+    func = ENGINES[engine][0]
+    started = time.perf_counter()
+    text = func(pdf_path, pages[0], pages[1]) or ""
+    return text, time.perf_counter() - started
+
+
+def extract_text(pdf_path, pages=(1, 1), family=None, engines=None, use_cache=True):
+    """
+    استخراج متن با سریع‌ترین موتوری که برای این خانواده گزارش متن قابل استفاده می‌دهد
+
+    Args:
+        pdf_path: مسیر فایل PDF
+        pages: بازه صفحات (first, last) - شماره‌گذاری از 1
+        family: خانواده گزارش (پیش‌فرض: تشخیص از نام فایل)
+        engines: محدود کردن موتورها، مثلا TEXT_ENGINES برای حذف OCR
+        use_cache: استفاده از کش دائمی متن PDF
+
+    Returns:
+        (text, engine) - اگر هیچ موتوری متن کافی نداد، بهترین نتیجه موجود برگردانده می‌شود
+    """
+    family = family or detect_family(pdf_path)
+    stats = get_engine_stats()
+    order = stats.ranking(family, available_engines(engines))
+
+    best_text, best_engine = "", None
+    for engine in order:
+        def _timed(path, _engine=engine):
+            text, seconds = run_engine(_engine, path, pages)
+            stats.record(family, _engine, seconds, is_usable(text))
+            return text
+
+        try:
+            if use_cache:
+                text = cached_extract(pdf_path, _timed, pages=pages, engine=engine)
+            else:
+                text = _timed(pdf_path)
+        except Exception as e:
+            print(f"   ⚠️ خطا در موتور {engine}: {e}")
+            stats.record(family, engine, 0.0, False)
+            continue
+
+        if is_usable(text):
+            return text, engine
+        if len(text.strip()) > len(best_text.strip()):
+            best_text, best_engine = text, engine
+
+    return best_text, best_engine
+
+
+def benchmark(folder_path, sample_size=20, pages=(1, 1), engines=None, seed=0):
+    """
+    اجرای همه موتورها روی نمونه‌ای از فایل‌ها و نمایش رتبه‌بندی برای هر خانواده
+
+    نتایج در آمار دائمی ثبت می‌شوند تا اجراهای بعدی از موتور برنده استفاده کنند.
+    """
+    pdf_files = sorted(Path(folder_path).rglob('*.pdf'))
+    if not pdf_files:
+        print(f"❌ هیچ فایل PDF در {folder_path} پیدا نشد!")
+        return {}
+
+    random.Random(seed).shuffle(pdf_files)
+    sample = pdf_files[:sample_size]
+    engine_names = available_engines(engines)
+    stats = get_engine_stats()
+
+    print("=" * 80)
+    print(f"🏁 بنچمارک موتورهای استخراج متن روی {len(sample)} فایل")
+    print(f"   موتورها: {', '.join(engine_names)}")
+    print("=" * 80)
+
+    # {family: {engine: [attempts, successes, seconds]}}
+    results = {}
+    for idx, pdf_path in enumerate(sample, 1):
+        family = detect_family(pdf_path)
+        print(f"[{idx}/{len(sample)}] {pdf_path.name} ({family})")
+        for engine in engine_names:
+            try:
+                text, seconds = run_engine(engine, pdf_path, pages)
+                ok = is_usable(text)
+            except Exception as e:
+                print(f"   ⚠️ {engine}: {e}")
+                seconds, ok = 0.0, False
+            stats.record(family, engine, seconds, ok)
+            r = results.setdefault(family, {}).setdefault(engine, [0, 0, 0.0])
+            r[0] += 1
+            r[1] += int(ok)
+            r[2] += seconds
+
+    for family, per_engine in sorted(results.items()):
+        print(f"\n📊 خانواده: {family}")
+        print(f"   {'رتبه':<6}{'موتور':<12}{'موفقیت':>10}{'میانگین (ms)':>16}")
+        ranked = sorted(
+            per_engine.items(),
+            key=lambda kv: (kv[1][1] / kv[1][0] < MIN_SUCCESS_RATE, kv[1][2] / kv[1][0])
+        )
+        for rank, (engine, (attempts, successes, seconds)) in enumerate(ranked, 1):
+            print(f"   {rank:<6}{engine:<12}{successes / attempts:>10.0%}"
+                  f"{seconds / attempts * 1000:>16.1f}")
+    print("=" * 80)
+    return results
+
+
+def print_engine_stats():
+    """
+    نمایش آمار تجمعی موتورها
+    """
+    summary = get_engine_stats().summary()
+    if not summary:
+        print("ℹ️ هنوز آماری ثبت نشده است")
+        return
+    for family, per_engine in sorted(summary.items()):
+        order = get_engine_stats().ranking(family, list(per_engine))
+        print(f"\n📊 {family}: ترتیب فعلی → {' → '.join(order)}")
+        for engine in order:
+            s = per_engine[engine]
+            print(f"   {engine:<12} {s['attempts']:>5} تلاش | "
+                  f"{s['success_rate']:>5.0%} موفق | {s['mean_seconds'] * 1000:>8.1f} ms")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('benchmark', 'stats'):
+        print("استفاده:")
+        print("  python pdf_text_engine.py benchmark <folder> [--sample 20] [--pages 1-3]")
+        print("  python pdf_text_engine.py stats")
+        return
+
+    if args[0] == 'stats':
+        print_engine_stats()
+        return
+
+    if len(args) < 2:
+        print("❌ مسیر پوشه مشخص نشده است")
+        return
+
+    sample_size = 20
+    pages = (1, 1)
+    if '--sample' in args:
+        sample_size = int(args[args.index('--sample') + 1])
+    if '--pages' in args:
+        first, _, last = args[args.index('--pages') + 1].partition('-')
+        pages = (int(first), int(last or first))
+
+    benchmark(args[1], sample_size=sample_size, pages=pages)
+
+
+if __name__ == "__main__":
+    main()
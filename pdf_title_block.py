@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF Title Block - استخراج متن فقط از ناحیه جدول عنوان (Title Block)
+
+شماره سند (SJSC-...-REMO-NNNN-GNN) و تاریخ همیشه در جدول بالای صفحه اول هستند.
+به جای خواندن کل صفحه، فقط همان ناحیه خوانده می‌شود (PyMuPDF clip یا pdfplumber crop).
+
+- ناحیه هر خانواده گزارش از چند فایل نمونه یاد گرفته می‌شود (learn)
+- اگر فیلدها در ناحیه پیدا نشوند، کل صفحه خوانده می‌شود و خطا ثبت می‌شود
+  تا بعدا با دستور retune ناحیه اصلاح شود
+
+استفاده:
+    from pdf_title_block import extract_title_block_text
+    text = extract_title_block_text(pdf_path, family='REMO')
+
+دستورات:
+    python pdf_title_block.py learn REMO "D:\\path\\to\\samples" [--sample 10]
+    python pdf_title_block.py retune REMO [--fields doc_no,date]
+    python pdf_title_block.py stats
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+from pdf_text_cache import cached_extract, DEFAULT_CACHE_PATH
+from pdf_text_engine import extract_text, detect_family, TEXT_ENGINES
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+
+# فیلدهای قابل جستجو در ناحیه عنوان
+FIELD_PATTERNS = {
+    'doc_no': re.compile(r'SJSC-[A-Z0-9]+-[A-Z0-9]+-[A-Z]+-\d{4}-G\d{2}', re.IGNORECASE),
+    'date': re.compile(r'\b\d{1,2}[-\s][A-Za-z]{3,9}[-\s]\d{4}\b'),
+    'title': re.compile(r'MAINTENANCE\s+MONTHLY\s+REPORT', re.IGNORECASE),
+    'period': re.compile(r'From\s+\d{1,2}[-\s][A-Za-z]{3,9}\s+to\s+\d{1,2}[-\s][A-Za-z]{3,9}[-\s]\d{4}',
+                         re.IGNORECASE),
+    'crude_title': re.compile(r'(?:HEAVY|LIGHT)\s+CRUDE', re.IGNORECASE),
+}
+
+# برچسب فیلدها؛ الگوهای doc_patterns تاریخ را فقط همراه برچسب "Date:" می‌شناسند،
+# پس برچسب هم باید داخل ناحیه باشد
+FIELD_LABELS = {
+    'doc_no': re.compile(r'\bDoc(?:ument)?\.?\s*(?:No|Number)\b', re.IGNORECASE),
+    'date': re.compile(r'\bDate\b', re.IGNORECASE),
+}
+
+# فیلدهای الزامی پیش‌فرض
+DEFAULT_FIELDS = ('doc_no', 'date')
+
+# ناحیه پیش‌فرض قبل از یادگیری: یک چهارم بالای صفحه (نسبت به ابعاد صفحه)
+DEFAULT_BOX = (0.0, 0.0, 1.0, 0.25)
+
+# حاشیه اضافه دور ناحیه یاد گرفته شده (نسبت به ابعاد صفحه)
+BOX_MARGIN = 0.02
+
+# بیشترین فاصله برچسب تا مقدار فیلد (نسبت به ابعاد صفحه)؛ برچسب‌های دورتر مربوط به آن فیلد نیستند
+LABEL_MAX_GAP = 0.15
+
+
+def missing_fields(text, fields=None, require_labels=True):
+    """
+    لیست فیلدهایی که در متن پیدا نشدند (مقدار یا برچسب)
+
+    require_labels=False برای فراخواننده‌هایی که مقدار بدون برچسب را هم می‌پذیرند
+    """
+    fields = fields or DEFAULT_FIELDS
+    text = text or ""
+    return [name for name in fields
+            if not FIELD_PATTERNS[name].search(text)
+            or (require_labels and name in FIELD_LABELS and not FIELD_LABELS[name].search(text))]
+
+
+class TitleBlockStore:
+    """
+    نگهداری ناحیه جدول عنوان هر خانواده و آمار hit/miss
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS title_blocks (
+                family TEXT PRIMARY KEY,
+                x0 REAL NOT NULL, y0 REAL NOT NULL,
+                x1 REAL NOT NULL, y1 REAL NOT NULL,
+                samples INTEGER NOT NULL DEFAULT 0,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                fields TEXT
+            );
+            CREATE TABLE IF NOT EXISTS title_block_misses (
+                family TEXT NOT NULL,
+                path TEXT NOT NULL,
+                missing TEXT NOT NULL,
+                recorded REAL NOT NULL,
+                PRIMARY KEY (family, path)
+            );
+        """)
+        # جدول‌های قدیمی ستون fields (فیلدهایی که ناحیه با آن‌ها یاد گرفته شده) را ندارند
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(title_blocks)')]
+        if 'fields' not in columns:
+            self.conn.execute('ALTER TABLE title_blocks ADD COLUMN fields TEXT')
+        self.conn.commit()
+
+    def get_box(self, family):
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT x0, y0, x1, y1 FROM title_blocks WHERE family = ?', (family,)
+            ).fetchone()
+        return tuple(row) if row else DEFAULT_BOX
+
+    def get_fields(self, family):
+        """
+        فیلدهایی که ناحیه خانواده با آن‌ها یاد گرفته شده (None اگر ثبت نشده باشد)
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT fields FROM title_blocks WHERE family = ?', (family,)
+            ).fetchone()
+        return row[0].split(',') if row and row[0] else None
+
+    def set_box(self, family, box, samples, fields=None):
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO title_blocks (family, x0, y0, x1, y1, samples, fields) VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(family) DO UPDATE SET x0 = excluded.x0, y0 = excluded.y0, '
+                'x1 = excluded.x1, y1 = excluded.y1, samples = excluded.samples, '
+                'fields = excluded.fields, hits = 0, misses = 0',
+                (family,) + tuple(box) + (samples, ','.join(fields) if fields else None)
+            )
+            self.conn.execute('DELETE FROM title_block_misses WHERE family = ?', (family,))
+            self.conn.commit()
+
+    def record(self, family, pdf_path, missing):
+        column = 'misses' if missing else 'hits'
+        with self._lock:
+            self.conn.execute(
+                f'INSERT INTO title_blocks (family, x0, y0, x1, y1, {column}) VALUES (?, ?, ?, ?, ?, 1) '
+                f'ON CONFLICT(family) DO UPDATE SET {column} = {column} + 1',
+                (family,) + DEFAULT_BOX
+            )
+            if missing:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO title_block_misses (family, path, missing, recorded) '
+                    'VALUES (?, ?, ?, ?)',
+                    (family, str(pdf_path), ','.join(missing), time.time())
+                )
+            self.conn.commit()
+
+    def missed_files(self, family):
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT path FROM title_block_misses WHERE family = ?', (family,)
+            ).fetchall()
+        return [Path(r[0]) for r in rows if Path(r[0]).exists()]
+
+    def summary(self):
+        with self._lock:
+            return self.conn.execute(
+                'SELECT family, x0, y0, x1, y1, samples, hits, misses FROM title_blocks ORDER BY family'
+            ).fetchall()
+
+
+_default_store = None
+_default_store_pid = None
+
+
+def get_title_block_store():
+    """
+    نمونه مشترک (یک اتصال برای هر پردازش)
+    """
+    global _default_store, _default_store_pid
+    if _default_store is None or _default_store_pid != os.getpid():
+        _default_store = TitleBlockStore()
+        _default_store_pid = os.getpid()
+    return _default_store
+
+
+def _clip_pymupdf(pdf_path, box):
+    doc = fitz.open(pdf_path)
+    try:
+        page = doc[0]
+        r = page.rect
+        clip = fitz.Rect(r.x0 + box[0] * r.width, r.y0 + box[1] * r.height,
+                         r.x0 + box[2] * r.width, r.y0 + box[3] * r.height)
+        return page.get_text(clip=clip)
+    finally:
+        doc.close()
+
+
+def _crop_pdfplumber(pdf_path, box):
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[0]
+        bbox = (box[0] * page.width, box[1] * page.height,
+                box[2] * page.width, box[3] * page.height)
+        return page.crop(bbox).extract_text() or ""
+
+
+def extract_region_text(pdf_path, box):
+    """
+    متن ناحیه مشخص شده از صفحه اول (مختصات نسبی 0..1)
+    """
+    box_key = ','.join(f"{v:.3f}" for v in box)
+    if PYMUPDF_AVAILABLE:
+        return cached_extract(pdf_path, lambda p: _clip_pymupdf(p, box),
+                              pages=(1, 1), engine=f'pymupdf-clip:{box_key}')
+    if PDFPLUMBER_AVAILABLE:
+        return cached_extract(pdf_path, lambda p: _crop_pdfplumber(p, box),
+                              pages=(1, 1), engine=f'pdfplumber-crop:{box_key}')
+    return ""
+
+
+def extract_title_block_text(pdf_path, family=None, fields=None):
+    """
+    متن ناحیه جدول عنوان؛ اگر فیلدها پیدا نشوند کل صفحه اول برگردانده می‌شود
+
+    Returns:
+        (text, from_region)
+    """
+    family = family or detect_family(pdf_path)
+    store = get_title_block_store()
+
+    try:
+        text = extract_region_text(pdf_path, store.get_box(family))
+    except Exception as e:
+        print(f"   ⚠️ خطا در خواندن ناحیه عنوان: {e}")
+        text = ""
+
+    missing = missing_fields(text, fields)
+    store.record(family, pdf_path, missing)
+    if not missing:
+        return text, True
+
+    print(f"   ℹ️ ناحیه عنوان کافی نبود ({', '.join(missing)})، خواندن کل صفحه...")
+    text, engine = extract_text(pdf_path, pages=(1, 1), family=family, engines=TEXT_ENGINES)
+    return text, False
+
+
+def _field_boxes_pymupdf(pdf_path, fields):
+    """
+    مختصات نسبی کلماتی که با الگوی فیلدها مطابقت دارند
+    """
+    boxes = []
+    doc = fitz.open(pdf_path)
+    try:
+        page = doc[0]
+        r = page.rect
+        # (x0, y0, x1, y1, word, block_no, line_no, word_no)
+        lines = {}
+        for w in page.get_text("words"):
+            lines.setdefault((w[5], w[6]), []).append(w)
+        for words in lines.values():
+            boxes.extend(_match_line(words, fields, r.width, r.height, lambda w: (w[0], w[1], w[2], w[3], w[4])))
+    finally:
+        doc.close()
+    return boxes
+
+
+def _field_boxes_pdfplumber(pdf_path, fields):
+    boxes = []
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[0]
+        lines = {}
+        for w in page.extract_words():
+            lines.setdefault(round(w['top']), []).append(w)
+        for words in lines.values():
+            words.sort(key=lambda w: w['x0'])
+            boxes.extend(_match_line(words, fields, page.width, page.height,
+                                     lambda w: (w['x0'], w['top'], w['x1'], w['bottom'], w['text'])))
+    return boxes
+
+
+def _match_line(words, fields, width, height, unpack):
+    """
+    اجرای الگوها روی یک خط و برگرداندن ناحیه کلمات مطابق
+
+    خروجی: [(نام فیلد، ناحیه، برچسب است؟), ...]
+    """
+    parts = [unpack(w) for w in words]
+    line = ""
+    spans = []
+    for x0, y0, x1, y1, word in parts:
+        start = len(line)
+        line += word + " "
+        spans.append((start, start + len(word), (x0, y0, x1, y1)))
+
+    found = []
+    for name in fields:
+        patterns = [(FIELD_PATTERNS[name], False)]
+        if name in FIELD_LABELS:
+            patterns.append((FIELD_LABELS[name], True))
+        for pattern, is_label in patterns:
+            for match in pattern.finditer(line):
+                hit = [b for s, e, b in spans if s < match.end() and e > match.start()]
+                if hit:
+                    found.append((name, (min(b[0] for b in hit) / width, min(b[1] for b in hit) / height,
+                                         max(b[2] for b in hit) / width, max(b[3] for b in hit) / height),
+                                  is_label))
+    return found
+
+
+def _gap(a, b):
+    """
+    فاصله بین دو ناحیه (صفر اگر روی هم باشند)
+    """
+    dx = max(0.0, b[0] - a[2], a[0] - b[2])
+    dy = max(0.0, b[1] - a[3], a[1] - b[3])
+    return max(dx, dy)
+
+
+def _with_labels(found):
+    """
+    ناحیه مقادیر به همراه نزدیک‌ترین برچسب هر کدام (برچسب در خانه کناری یا بالای مقدار)
+
+    خروجی: (لیست ناحیه‌ها، فیلدهایی که برچسبشان کنار مقدار پیدا نشد)
+    """
+    values = [(name, b) for name, b, is_label in found if not is_label]
+    labels = [(name, b) for name, b, is_label in found if is_label]
+    boxes = [b for _, b in values]
+    unlabeled = set()
+    for name in {name for name, _ in values if name in FIELD_LABELS}:
+        candidates = [(_gap(lb, vb), lb) for n, vb in values if n == name
+                      for ln, lb in labels if ln == name]
+        candidates = [c for c in candidates if c[0] <= LABEL_MAX_GAP]
+        if candidates:
+            boxes.append(min(candidates)[1])
+        else:
+            unlabeled.add(name)
+    return boxes, unlabeled
+
+
+def learn_title_block(family, pdf_paths, fields=None):
+    """
+    یادگیری ناحیه جدول عنوان از چند فایل نمونه (اجتماع ناحیه فیلدها و برچسب‌هایشان + حاشیه)
+    """
+    fields = list(fields or DEFAULT_FIELDS)
+    union = None
+    used = 0
+
+    for pdf_path in pdf_paths:
+        try:
+            if PYMUPDF_AVAILABLE:
+                found = _field_boxes_pymupdf(pdf_path, fields)
+            elif PDFPLUMBER_AVAILABLE:
+                found = _field_boxes_pdfplumber(pdf_path, fields)
+            else:
+                print("❌ برای یادگیری ناحیه، PyMuPDF یا pdfplumber لازم است")
+                return None
+        except Exception as e:
+            print(f"   ⚠️ {Path(pdf_path).name}: {e}")
+            continue
+
+        names = {name for name, _, is_label in found if not is_label}
+        if not set(fields) <= names:
+            print(f"   ⚠️ {Path(pdf_path).name}: فیلدها پیدا نشدند ({', '.join(sorted(set(fields) - names))})")
+            continue
+
+        boxes, unlabeled = _with_labels(found)
+        if unlabeled:
+            print(f"   ⚠️ {Path(pdf_path).name}: برچسب فیلدها کنار مقدار پیدا نشد ({', '.join(sorted(unlabeled))})")
+            continue
+
+        used += 1
+        for b in boxes:
+            union = b if union is None else (min(union[0], b[0]), min(union[1], b[1]),
+                                             max(union[2], b[2]), max(union[3], b[3]))
+        print(f"   ✅ {Path(pdf_path).name}")
+
+    if union is None:
+        print(f"❌ هیچ نمونه قابل استفاده‌ای برای {family} پیدا نشد")
+        return None
+
+    box = (max(0.0, union[0] - BOX_MARGIN), max(0.0, union[1] - BOX_MARGIN),
+           min(1.0, union[2] + BOX_MARGIN), min(1.0, union[3] + BOX_MARGIN))
+    get_title_block_store().set_box(family, box, used, fields)
+    print(f"📐 ناحیه {family}: ({box[0]:.3f}, {box[1]:.3f}) → ({box[2]:.3f}, {box[3]:.3f}) "
+          f"از {used} نمونه - {(box[2] - box[0]) * (box[3] - box[1]):.0%} از صفحه")
+    return box
+
+
+def print_title_block_stats():
+    rows = get_title_block_store().summary()
+    if not rows:
+        print("ℹ️ هنوز ناحیه‌ای یاد گرفته نشده است")
+        return
+    for family, x0, y0, x1, y1, samples, hits, misses in rows:
+        total = hits + misses
+        rate = f"{hits / total:.0%}" if total else "-"
+        print(f"📐 {family:<10} ({x0:.3f}, {y0:.3f}) → ({x1:.3f}, {y1:.3f}) | "
+              f"{samples} نمونه | {hits} hit / {misses} miss ({rate})")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('learn', 'retune', 'stats'):
+        print("استفاده:")
+        print("  python pdf_title_block.py learn <family> <folder> [--sample 10] [--fields doc_no,date,period]")
+        print("  python pdf_title_block.py retune <family> [--fields doc_no,date,period]")
+        print("  python pdf_title_block.py stats")
+        return
+
+    if args[0] == 'stats':
+        print_title_block_stats()
+        return
+
+    if len(args) < 2:
+        print("❌ خانواده گزارش مشخص نشده است")
+        return
+    family = args[1].upper()
+
+    if args[0] == 'learn':
+        if len(args) < 3:
+            print("❌ مسیر پوشه نمونه‌ها مشخص نشده است")
+            return
+        sample_size = int(args[args.index('--sample') + 1]) if '--sample' in args else 10
+        fields = args[args.index('--fields') + 1].split(',') if '--fields' in args else None
+        pdf_files = sorted(Path(args[2]).glob('*.pdf'))[:sample_size]
+        print(f"🔍 یادگیری ناحیه عنوان {family} از {len(pdf_files)} فایل...")
+        learn_title_block(family, pdf_files, fields)
+    else:
+        # نمونه‌های قبلی + فایل‌هایی که ناحیه فعلی برایشان کافی نبود
+        pdf_files = get_title_block_store().missed_files(family)
+        if not pdf_files:
+            print(f"ℹ️ هیچ خطای ثبت شده‌ای برای {family} وجود ندارد")
+            return
+        # همان فیلدهای learn، مگر اینکه --fields داده شود
+        fields = (args[args.index('--fields') + 1].split(',') if '--fields' in args
+                  else get_title_block_store().get_fields(family))
+        print(f"🔧 تنظیم مجدد ناحیه {family} با {len(pdf_files)} فایل ناموفق...")
+        current = get_title_block_store().get_box(family)
+        box = learn_title_block(family, pdf_files, fields)
+        if box and current != DEFAULT_BOX:
+            merged = (min(box[0], current[0]), min(box[1], current[1]),
+                      max(box[2], current[2]), max(box[3], current[3]))
+            get_title_block_store().set_box(family, merged, len(pdf_files), fields)
+            print(f"📐 ناحیه ادغام شده: ({merged[0]:.3f}, {merged[1]:.3f}) → ({merged[2]:.3f}, {merged[3]:.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persian Layout - شکستن خطوط فارسی بر اساس عرض واقعی حروف
+
+روش قبلی کل متن صفحه را یک جا reshape و bidi می‌کرد و بعد با شمارش کاراکتر
+(max_width = 80) خط می‌شکست؛ نتیجه: خطوط ناهموار یا بیرون زده از صفحه.
+
+اینجا:
+- هر کلمه جداگانه reshape و عرض آن با متریک واقعی فونت TTF ثبت شده (BNazanin/Vazir) اندازه‌گیری می‌شود
+- خطوط بر اساس عرض (نه تعداد کاراکتر) شکسته می‌شوند
+- bidi روی هر خط پس از شکستن اعمال می‌شود (ترتیب درست راست به چپ در هر خط)
+- کلمات reshape شده و عرض آنها کش می‌شوند (متن‌های طولانی کلمات تکراری زیادی دارند)
+
+استفاده:
+    from persian_layout import PersianLayout
+
+    layout = PersianLayout('BNazanin', 10, max_width=page_width - 100)
+    for line in layout.wrap(text):
+        c.drawRightString(page_width - 50, y, line)
+
+بنچمارک (300 صفحه):
+    python persian_layout.py benchmark [--pages 300] [--font Vazir.ttf]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import tempfile
+from functools import lru_cache
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    import arabic_reshaper
+    from bidi.algorithm import get_display
+    LAYOUT_AVAILABLE = True
+except ImportError:
+    LAYOUT_AVAILABLE = False
+
+
+# حجم کش کلمات reshape شده
+WORD_CACHE_SIZE = 100000
+
+# خط فقط شامل حروف فارسی/عربی (بدون عدد، حروف لاتین و پرانتز) و علائم ساده:
+# نتیجه bidi برای چنین خطی همان معکوس رشته است (ZWNJ توسط bidi حذف می‌شود)
+_PURE_RTL_LINE = re.compile('^[\u0621-\u065F\u066E-\u06D5\u06E5-\u06EF\u06FA-\u06FF'
+                            '\uFB50-\uFDFF\uFE70-\uFEFC\u200c .,:;!?\u060C\u061B\u061F]*$')
+_RTL_LETTER = re.compile('[\u0621-\u064A\u066E-\u06D3\u06FA-\u06FF\uFB50-\uFDFF\uFE70-\uFEFC]')
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def shape_word(word):
+    """
+    reshape یک کلمه (شکل اتصال حروف فقط به حروف همان کلمه بستگی دارد)
+    """
+    return arabic_reshaper.reshape(word)
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def display_line(shaped_line):
+    """
+    اعمال الگوریتم bidi روی یک خط reshape شده
+
+    خطوط تمام فارسی بدون اجرای کامل الگوریتم bidi معکوس می‌شوند.
+    """
+    if _PURE_RTL_LINE.match(shaped_line) and _RTL_LETTER.search(shaped_line):
+        return shaped_line.replace('\u200c', '')[::-1]
+    return get_display(shaped_line)
+
+
+class PersianLayout:
+    """
+    چیدمان متن فارسی با عرض مشخص برای یک فونت و اندازه
+    """
+
+    def __init__(self, font_name, font_size, max_width):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.max_width = max_width
+        self._widths = {}
+        self.space_width = self.width(' ')
+
+    def width(self, shaped):
+        """
+        عرض متن reshape شده با متریک فونت (کش شده)
+        """
+        w = self._widths.get(shaped)
+        if w is None:
+            w = pdfmetrics.stringWidth(shaped, self.font_name, self.font_size)
+            self._widths[shaped] = w
+        return w
+
+    def _break_word(self, shaped):
+        """
+        شکستن کلمه بلندتر از عرض خط (مثلا آدرس یا شماره طولانی)
+        """
+        parts = []
+        current = ""
+        for ch in shaped:
+            if current and self.width(current + ch) > self.max_width:
+                parts.append(current)
+                current = ""
+            current += ch
+        if current:
+            parts.append(current)
+        return parts
+
+    def wrap_paragraph(self, paragraph):
+        """
+        شکستن یک پاراگراف؛ خروجی: خطوط آماده رسم (reshape و bidi شده)
+        """
+        lines = []
+        current = []
+        current_width = 0.0
+        for word in paragraph.split():
+            shaped = shape_word(word)
+            w = self.width(shaped)
+            if w > self.max_width:
+                pieces = self._break_word(shaped)
+            else:
+                pieces = [shaped]
+            for piece in pieces:
+                w = self.width(piece)
+                extra = w + (self.space_width if current else 0.0)
+                if current and current_width + extra > self.max_width:
+                    lines.append(display_line(' '.join(current)))
+                    current, current_width = [], 0.0
+                    extra = w
+                current.append(piece)
+                current_width += extra
+        if current:
+            lines.append(display_line(' '.join(current)))
+        return lines
+
+    def wrap(self, text):
+        """
+        شکستن کل متن؛ پاراگراف خالی یک خط خالی می‌شود
+        """
+        lines = []
+        for paragraph in text.split('\n'):
+            if paragraph.strip():
+                lines.extend(self.wrap_paragraph(paragraph))
+            else:
+                lines.append("")
+        return lines
+
+
+def legacy_wrap(text, max_chars=80):
+    """
+    روش قبلی (reshape و bidi کل متن، شکستن با شمارش کاراکتر) - فقط برای مقایسه در بنچمارک
+    """
+    bidi_text = get_display(arabic_reshaper.reshape(text))
+    lines = []
+    for line in bidi_text.split('\n'):
+        current_line = ""
+        for word in line.split():
+            if len(current_line) + len(word) < max_chars:
+                current_line += word + " "
+            else:
+                lines.append(current_line)
+                current_line = word + " "
+        if current_line:
+            lines.append(current_line)
+    return lines
+
+
+def _synthetic_pages(count, seed=0):
+    rng = random.Random(seed)
+    words = ('تعمیر', 'و', 'نگهداری', 'تجهیزات', 'بازرسی', 'پیشگیرانه', 'ایمنی', 'عملیات',
+             'پیمانکار', 'کارفرما', 'باید', 'طبق', 'روش', 'اجرایی', 'استاندارد', 'شیر', 'پمپ',
+             'خط', 'لوله', 'فشار', 'دما', 'گزارش', 'ماهانه', 'ارائه', 'نماید', 'API', '610', 'بند')
+    pages = {}
+    for page in range(1, count + 1):
+        paragraphs = []
+        for _ in range(rng.randint(4, 8)):
+            paragraphs.append(' '.join(rng.choice(words) for _ in range(rng.randint(30, 80))) + '.')
+        pages[page] = '\n'.join(paragraphs)
+    return pages
+
+
+def benchmark(pages=300, font_path='Vazir.ttf', font_name='Vazir'):
+    """
+    مقایسه زمان چیدمان و ساخت PDF برای سند ترجمه شده چند صد صفحه‌ای
+    """
+    pdfmetrics.registerFont(TTFont(font_name, font_path))
+    page_width, page_height = A4
+    data = _synthetic_pages(pages)
+    chars = sum(len(t) for t in data.values())
+
+    print("=" * 70)
+    print(f"📊 بنچمارک چیدمان فارسی: {pages} صفحه، {chars:,} کاراکتر، فونت {font_name}")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    legacy_lines = sum(len(legacy_wrap(t)) for t in data.values())
+    legacy_seconds = time.perf_counter() - started
+
+    shape_word.cache_clear()
+    display_line.cache_clear()
+    layout = PersianLayout(font_name, 10, page_width - 100)
+    started = time.perf_counter()
+    lines = [layout.wrap(t) for t in data.values()]
+    layout_seconds = time.perf_counter() - started
+
+    overflow = sum(1 for page in lines for line in page if layout.width(line) > layout.max_width + 0.01)
+    info = shape_word.cache_info()
+    print(f"   روش قبلی (شمارش کاراکتر): {legacy_seconds:.2f} ثانیه، {legacy_lines:,} خط")
+    print(f"   متریک فونت:               {layout_seconds:.2f} ثانیه، {sum(map(len, lines)):,} خط، "
+          f"{overflow} خط بیرون زده")
+    print(f"   کش کلمات: {info.hits:,} hit / {info.misses:,} miss")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'layout_benchmark.pdf')
+        started = time.perf_counter()
+        c = canvas.Canvas(output, pagesize=A4)
+        c.setFont(font_name, 10)
+        for page_lines in lines:
+            y = page_height - 90
+            for line in page_lines:
+                if y < 50:
+                    c.showPage()
+                    c.setFont(font_name, 10)
+                    y = page_height - 50
+                c.drawRightString(page_width - 50, y, line)
+                y -= 15
+            c.showPage()
+            c.setFont(font_name, 10)
+        c.save()
+        print(f"   ساخت PDF: {time.perf_counter() - started:.2f} ثانیه "
+              f"({os.path.getsize(output) / 1024 / 1024:.1f} MB)")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] != 'benchmark':
+        print("استفاده:")
+        print("  python persian_layout.py benchmark [--pages 300] [--font Vazir.ttf]")
+        return
+    if not LAYOUT_AVAILABLE:
+        print("❌ reportlab, arabic_reshaper و python-bidi لازم است")
+        return
+
+    pages = int(args[args.index('--pages') + 1]) if '--pages' in args else 300
+    font_path = args[args.index('--font') + 1] if '--font' in args else 'Vazir.ttf'
+    font_name = os.path.splitext(os.path.basename(font_path))[0]
+    benchmark(pages, font_path, font_name)
+
+
+if __name__ == "__main__":
+    main()
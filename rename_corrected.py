@@ -10,6 +10,7 @@ import re
 from docx import Document
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
+from rename_planner import apply_renames, STATUS_LABELS
 
 def extract_sequence_number(doc):
     """استخراج Sequence Number از داخل سند"""
@@ -279,29 +280,27 @@ def rename_files(results):
     success = 0
     failed = 0
     
+    # همه تغییر نام‌ها یکجا و دو مرحله‌ای (نام تکراری: پسوند _copyN)
+    folder = os.path.dirname(files_to_rename[0]['old_path'])
+    outcome = apply_renames(folder, [(r['old_name'], r['new_name']) for r in files_to_rename],
+                            on_collision='copy')
+    
     for r in files_to_rename:
-        old_path = r['old_path']
-        new_path = os.path.join(os.path.dirname(old_path), r['new_name'])
-        
-        try:
-            if os.path.exists(new_path):
+        final_name, status = outcome[r['old_name']]
+        if status == 'renamed':
+            if final_name != r['new_name']:
                 print(f"⚠️  فایل موجود است: {r['new_name']}")
-                # اضافه کردن شماره
-                base, ext = os.path.splitext(new_path)
-                counter = 1
-                while os.path.exists(f"{base}_copy{counter}{ext}"):
-                    counter += 1
-                new_path = f"{base}_copy{counter}{ext}"
-                r['new_name'] = os.path.basename(new_path)
-            
-            os.rename(old_path, new_path)
+                r['new_name'] = final_name
             print(f"✅ {r['old_name']}")
             print(f"   → {r['new_name']}\n")
             success += 1
-            
-        except Exception as e:
+        elif status == 'unchanged':
+            print(f"✅ {r['old_name']}")
+            print(f"   {STATUS_LABELS[status]}\n")
+            success += 1
+        else:
             print(f"❌ خطا: {r['old_name']}")
-            print(f"   {e}\n")
+            print(f"   {STATUS_LABELS[status]}\n")
             failed += 1
     
     print(f"{'='*70}")
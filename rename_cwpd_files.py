@@ -7,9 +7,9 @@
 
 import os
 from pathlib import Path
-from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl import load_workbook
 from datetime import datetime
+from report_writer import ReportWriter
 
 
 class CWPDFileRenamer:
@@ -200,49 +200,24 @@ class CWPDFileRenamer:
         Args:
             output_path: مسیر فایل خروجی Excel
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "گزارش فایل‌های CWPD"
+        # هدر جدول، عرض و استایل ستون‌ها
+        columns = [
+            ('ردیف', 8, 'cell'), ('نام اصلی فایل', 30, 'cell'), ('نام جدید فایل', 50, 'cell'),
+            ('Ref Number', 15, 'cell'), ('Date', 20, 'cell'), ('وضعیت', 20, 'cell')
+        ]
         
-        # تنظیمات سبک
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        # داده‌ها (ردیف‌ها به صورت جریانی نوشته می‌شوند)
+        with ReportWriter(output_path, "گزارش فایل‌های CWPD", columns) as report:
+            for row_idx, result in enumerate(self.results, 1):
+                report.append([
+                    row_idx,
+                    result['original_name'],
+                    result['new_name'],
+                    result['number'],
+                    result['date'],
+                    result['status']
+                ])
         
-        # هدر جدول
-        headers = ['ردیف', 'نام اصلی فایل', 'نام جدید فایل', 'Ref Number', 'Date', 'وضعیت']
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
-        
-        # داده‌ها
-        for row_idx, result in enumerate(self.results, 2):
-            ws.cell(row=row_idx, column=1, value=row_idx-1).border = border
-            ws.cell(row=row_idx, column=2, value=result['original_name']).border = border
-            ws.cell(row=row_idx, column=3, value=result['new_name']).border = border
-            ws.cell(row=row_idx, column=4, value=result['number']).border = border
-            ws.cell(row=row_idx, column=5, value=result['date']).border = border
-            ws.cell(row=row_idx, column=6, value=result['status']).border = border
-        
-        # تنظیم عرض ستون‌ها
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 50
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 20
-        ws.column_dimensions['F'].width = 20
-        
-        # ذخیره فایل
-        wb.save(output_path)
         print(f"\n✓ گزارش Excel در مسیر زیر ذخیره شد:")
         print(f"  {output_path}")
 
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rename Manifest - فهرست فایل‌های پردازش شده برای اجرای افزایشی تغییر نام
+
+برای هر فایل دیده شده، مسیر، حجم، زمان تغییر، هش محتوا، فیلدهای استخراج شده و نتیجه
+(extracted / failed / renamed) در SQLite ثبت می‌شود. در اجرای بعدی:
+- فایل جدید یا تغییر یافته: استخراج کامل (OCR در صورت نیاز)
+- فایل بدون تغییر با فیلدهای کامل: فیلدها از فهرست خوانده می‌شوند (بدون خواندن فایل)
+- فایل بدون تغییر که قبلا ناموفق بوده: رد می‌شود (مگر با --retry-failed)
+
+تشخیص تغییر ابتدا با حجم و زمان تغییر انجام می‌شود؛ هش فقط برای فایل جدید یا فایلی که
+زمان تغییرش عوض شده محاسبه می‌شود (فایل کپی یا جابجا شده با همان محتوا هم شناخته می‌شود).
+
+استفاده:
+    from rename_manifest import get_manifest
+
+    manifest = get_manifest()
+    plan = manifest.plan(files, retry_failed=False)
+    # plan['extract']: فایل‌هایی که باید استخراج شوند
+    # plan['reuse']:   [(path, fields), ...] بدون نیاز به استخراج
+    manifest.record_extraction(path, fields, seconds)
+    manifest.record_rename(path, new_name)
+
+مدیریت:
+    python rename_manifest.py status [folder]
+    python rename_manifest.py clear [folder]
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+from pdf_text_cache import file_sha256
+
+
+# مسیر پیش‌فرض پایگاه داده فهرست (قابل تغییر با متغیر محیطی)
+DEFAULT_MANIFEST_PATH = os.environ.get(
+    'RENAME_MANIFEST',
+    str(Path.home() / '.sjsc_rename_manifest.sqlite3')
+)
+
+# فیلدهایی از اطلاعات فایل که در فهرست ذخیره می‌شوند
+MANIFEST_FIELDS = ('doc_no', 'doc_number', 'rev', 'date_str', 'report_title', 'period')
+
+
+class RenameManifest:
+    """
+    فهرست فایل‌های پردازش شده (فقط در پردازش اصلی استفاده می‌شود)
+    """
+
+    def __init__(self, db_path=DEFAULT_MANIFEST_PATH):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._stats = {}  # path -> (size, mtime_ns, sha256) فایل‌های بررسی شده در این اجرا
+
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS processed_files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                fields TEXT,
+                new_name TEXT,
+                seconds REAL DEFAULT 0,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_processed_files_sha ON processed_files(sha256);
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _key(file_path):
+        return str(Path(file_path).resolve())
+
+    def _lookup(self, key, size, mtime_ns):
+        """
+        رکورد معتبر برای محتوای فعلی فایل؛ خروجی: (وضعیت, رکورد یا None, sha256)
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT size, mtime_ns, sha256, outcome, fields, seconds FROM processed_files WHERE path = ?',
+                (key,)
+            ).fetchone()
+        if row and row[0] == size and row[1] == mtime_ns:
+            return 'unchanged', row[3:], row[2]
+
+        # حجم یا زمان تغییر فرق کرده یا مسیر جدید است: مقایسه با هش محتوا
+        sha = file_sha256(key)
+        if row and row[2] == sha:
+            self._refresh(key, size, mtime_ns, sha, row[3:])
+            return 'unchanged', row[3:], sha
+        with self._lock:
+            same = self.conn.execute(
+                'SELECT outcome, fields, seconds FROM processed_files WHERE sha256 = ? '
+                'ORDER BY updated DESC LIMIT 1', (sha,)
+            ).fetchone()
+        if same:
+            self._refresh(key, size, mtime_ns, sha, same)
+            return 'unchanged', same, sha
+        return ('changed' if row else 'new'), None, sha
+
+    def _refresh(self, key, size, mtime_ns, sha, record):
+        """
+        هش تایید کرد که محتوا تغییر نکرده: حجم و زمان تغییر فعلی ثبت می‌شود تا در اجرای بعدی
+        (حتی برای فایل ناموفقی که رد می‌شود) دوباره هش محاسبه نشود
+        """
+        outcome, fields, seconds = record
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO processed_files (path, size, mtime_ns, sha256, outcome, fields, seconds, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns',
+                (key, size, mtime_ns, sha, outcome, fields, seconds, time.time())
+            )
+            self.conn.commit()
+
+    def plan(self, files, retry_failed=False):
+        """
+        تقسیم فایل‌ها به: استخراج لازم، استفاده دوباره از فیلدها و رد شده
+
+        Returns:
+            dict: extract (لیست مسیرها)، reuse ([(path, fields)])، skipped (لیست مسیرها)،
+                  counts (تعداد هر وضعیت)، saved_seconds (زمان استخراج صرفه‌جویی شده)
+        """
+        plan = {
+            'extract': [],
+            'reuse': [],
+            'skipped': [],
+            'counts': {'new': 0, 'changed': 0, 'unchanged': 0, 'failed': 0, 'retried': 0},
+            'saved_seconds': 0.0
+        }
+        for file_path in files:
+            key = self._key(file_path)
+            st = os.stat(key)
+            state, record, sha = self._lookup(key, st.st_size, st.st_mtime_ns)
+            self._stats[key] = (st.st_size, st.st_mtime_ns, sha)
+
+            if state != 'unchanged':
+                plan['counts'][state] += 1
+                plan['extract'].append(file_path)
+                continue
+
+            outcome, fields, seconds = record
+            if outcome == 'failed':
+                if retry_failed:
+                    plan['counts']['retried'] += 1
+                    plan['extract'].append(file_path)
+                else:
+                    plan['counts']['failed'] += 1
+                    plan['skipped'].append(file_path)
+                    plan['saved_seconds'] += seconds or 0.0
+                continue
+
+            if not fields:
+                plan['counts']['changed'] += 1
+                plan['extract'].append(file_path)
+                continue
+            plan['counts']['unchanged'] += 1
+            plan['reuse'].append((file_path, json.loads(fields)))
+            plan['saved_seconds'] += seconds or 0.0
+        return plan
+
+    def _write(self, file_path, outcome, fields=None, new_name=None, seconds=None):
+        key = self._key(file_path)
+        size, mtime_ns, sha = self._stats.get(key) or (None, None, None)
+        if sha is None:
+            st = os.stat(key)
+            size, mtime_ns, sha = st.st_size, st.st_mtime_ns, file_sha256(key)
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO processed_files (path, size, mtime_ns, sha256, outcome, fields, new_name, seconds, updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, '
+                'sha256 = excluded.sha256, outcome = excluded.outcome, '
+                'fields = COALESCE(excluded.fields, fields), new_name = excluded.new_name, '
+                'seconds = COALESCE(excluded.seconds, seconds), updated = excluded.updated',
+                (key, size, mtime_ns, sha, outcome,
+                 json.dumps(fields, ensure_ascii=False) if fields is not None else None,
+                 new_name, seconds, time.time())
+            )
+            self.conn.commit()
+
+    def record_extraction(self, file_path, data, seconds):
+        """
+        ثبت نتیجه استخراج (data: دیکشنری اطلاعات فایل)
+        """
+        fields = {name: data.get(name) for name in MANIFEST_FIELDS}
+        outcome = 'extracted' if data.get('doc_number') and data.get('rev') else 'failed'
+        self._write(file_path, outcome, fields, seconds=seconds)
+
+    def record_rename(self, file_path, new_name):
+        """
+        ثبت تغییر نام موفق (مشخصات فایل اصلی از مرحله plan همین اجرا خوانده می‌شود)
+        """
+        self._write(file_path, 'renamed', new_name=new_name)
+
+    def _folder_filter(self, folder):
+        """
+        شرط SQL فایل‌های داخل پوشه؛ مقایسه پیشوند با substr (در LIKE کاراکترهای _ و % نام پوشه wildcard هستند)
+        """
+        if not folder:
+            return '', ()
+        prefix = self._key(folder).rstrip(os.sep) + os.sep
+        return ' WHERE substr(path, 1, ?) = ?', (len(prefix), prefix)
+
+    def rows(self, folder=None):
+        where, params = self._folder_filter(folder)
+        with self._lock:
+            return self.conn.execute(
+                'SELECT path, outcome, new_name, seconds FROM processed_files' + where + ' ORDER BY path',
+                params
+            ).fetchall()
+
+    def clear(self, folder=None):
+        where, params = self._folder_filter(folder)
+        with self._lock:
+            self.conn.execute('DELETE FROM processed_files' + where, params)
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def print_plan_summary(plan):
+    """
+    خلاصه کار انجام نشده به لطف فهرست
+    """
+    c = plan['counts']
+    print(f"🗂️ فهرست فایل‌ها: {c['new']} جدید، {c['changed']} تغییر یافته، "
+          f"{c['retried']} تلاش دوباره برای ناموفق‌ها")
+    print(f"   ⏭️ بدون استخراج دوباره: {c['unchanged']} فایل بدون تغییر، "
+          f"{c['failed']} فایل ناموفق قبلی (برای تلاش دوباره: --retry-failed)")
+    if plan['saved_seconds']:
+        print(f"   ⏱️ زمان استخراج صرفه‌جویی شده (تخمینی): {plan['saved_seconds']:.1f} ثانیه")
+
+
+_default_manifest = None
+_default_manifest_pid = None
+
+
+def get_manifest():
+    """
+    فهرست مشترک در پردازش فعلی
+    """
+    global _default_manifest, _default_manifest_pid
+    if _default_manifest is None or _default_manifest_pid != os.getpid():
+        _default_manifest = RenameManifest()
+        _default_manifest_pid = os.getpid()
+    return _default_manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('status', 'clear'):
+        print("استفاده:")
+        print("  python rename_manifest.py status [folder]")
+        print("  python rename_manifest.py clear [folder]")
+        sys.exit(1)
+
+    folder = sys.argv[2] if len(sys.argv) > 2 else None
+    manifest = get_manifest()
+    if sys.argv[1] == 'clear':
+        manifest.clear(folder)
+        print(f"🧹 فهرست {'پوشه ' + folder if folder else 'همه پوشه‌ها'} پاک شد")
+    else:
+        rows = manifest.rows(folder)
+        by_outcome = {}
+        for path, outcome, new_name, seconds in rows:
+            by_outcome.setdefault(outcome, []).append((path, new_name))
+        print(f"🗂️ {len(rows)} فایل در فهرست ({manifest.db_path})")
+        for outcome, items in sorted(by_outcome.items()):
+            print(f"   {outcome}: {len(items)}")
+        for path, _ in by_outcome.get('failed', []):
+            print(f"   ❌ {path}")
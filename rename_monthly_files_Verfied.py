@@ -14,6 +14,9 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from datetime import datetime
 
+from docx_header_reader import read_report_fields
+from rename_planner import apply_renames, STATUS_LABELS
+
 try:
     from PyPDF2 import PdfReader
     PDF_SUPPORT = True
@@ -39,7 +42,10 @@ class MonthlyFileRenamer:
         
         Args:
             doc: شیء Document از python-docx
-            
+        
+        اولین مقدار پیدا شده برای هر فیلد نگه داشته می‌شود (همان قاعده docx_header_reader،
+        تا نتیجه به این بستگی نداشته باشد که کدام مسیر اجرا شده است)
+        
         Returns:
             dict: دیکشنری حاوی sequence_number, date, revision
         """
@@ -58,7 +64,7 @@ class MonthlyFileRenamer:
                     
                     # جستجوی Sequence Number
                     for i, cell_text in enumerate(cells_text):
-                        if 'Sequence' in cell_text and 'Number' in cell_text:
+                        if not data['sequence_number'] and 'Sequence' in cell_text and 'Number' in cell_text:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -70,7 +76,7 @@ class MonthlyFileRenamer:
                     
                     # جستجوی Revision در Header
                     for i, cell_text in enumerate(cells_text):
-                        if cell_text in ['Revision', 'Rev', 'REV']:
+                        if not data['revision'] and cell_text in ['Revision', 'Rev', 'REV']:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -88,7 +94,7 @@ class MonthlyFileRenamer:
                 # جستجوی Revision (اگر در Header پیدا نشده)
                 if not data['revision']:
                     for i, cell_text in enumerate(cells_text):
-                        if cell_text in ['Revision', 'Rev', 'REV']:
+                        if not data['revision'] and cell_text in ['Revision', 'Rev', 'REV']:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -100,7 +106,7 @@ class MonthlyFileRenamer:
                 
                 # جستجوی Date
                 for i, cell_text in enumerate(cells_text):
-                    if cell_text == 'Date' or cell_text == 'DATE':
+                    if not data['date'] and cell_text in ['Date', 'DATE']:
                         try:
                             if row_idx + 1 < len(table.rows):
                                 next_row = table.rows[row_idx + 1]
@@ -228,6 +234,8 @@ class MonthlyFileRenamer:
         print(f"تعداد {len(pdf_files)} فایل PDF پیدا شد.\n")
         
         # پردازش فایل‌های Word
+        pending_renames = []
+        
         for file_path in word_files:
             # رد کردن فایل‌های موقت
             if file_path.name.startswith('~$'):
@@ -236,11 +244,12 @@ class MonthlyFileRenamer:
             print(f"📄 در حال پردازش Word: {file_path.name}")
             
             try:
-                # خواندن فایل Word
-                doc = Document(file_path)
+                # خواندن سریع Header و جداول اول فایل Word
+                data = read_report_fields(file_path)
                 
-                # استخراج داده‌ها
-                data = self.extract_table_data_from_word(doc)
+                # اگر فیلدی پیدا نشد، کل سند با python-docx بررسی می‌شود
+                if not all(data.values()):
+                    data = self.extract_table_data_from_word(Document(file_path))
                 
                 print(f"  Sequence Number: {data['sequence_number']}")
                 print(f"  Revision: {data['revision']}")
@@ -266,14 +275,9 @@ class MonthlyFileRenamer:
                     'status': 'پردازش شد'
                 }
                 
-                # تغییر نام فایل (اختیاری)
+                # تغییر نام فایل (اختیاری) - پس از پردازش همه فایل‌ها یکجا انجام می‌شود
                 if rename_files:
-                    new_path = file_path.parent / new_filename
-                    if not new_path.exists():
-                        file_path.rename(new_path)
-                        result['status'] = 'تغییر نام داده شد'
-                    else:
-                        result['status'] = 'فایل با این نام وجود دارد'
+                    pending_renames.append((file_path.name, result))
                 
                 self.results.append(result)
                 
@@ -321,14 +325,9 @@ class MonthlyFileRenamer:
                     'status': 'پردازش شد'
                 }
                 
-                # تغییر نام فایل (اختیاری)
+                # تغییر نام فایل (اختیاری) - پس از پردازش همه فایل‌ها یکجا انجام می‌شود
                 if rename_files:
-                    new_path = file_path.parent / new_filename
-                    if not new_path.exists():
-                        file_path.rename(new_path)
-                        result['status'] = 'تغییر نام داده شد'
-                    else:
-                        result['status'] = 'فایل با این نام وجود دارد'
+                    pending_renames.append((file_path.name, result))
                 
                 self.results.append(result)
                 
@@ -344,6 +343,15 @@ class MonthlyFileRenamer:
                     'status': f'خطا: {str(e)}'
                 })
         
+        # تغییر نام یکجا: نگاشت کامل از یک بار خواندن پوشه، اجرای دو مرحله‌ای با journal
+        if pending_renames:
+            outcome = apply_renames(
+                self.source_directory,
+                [(name, result['new_name']) for name, result in pending_renames]
+            )
+            for name, result in pending_renames:
+                result['status'] = STATUS_LABELS[outcome[name][1]]
+        
         return self.results
     
     def create_excel_report(self, output_path):
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rename Planner - تغییر نام گروهی دو مرحله‌ای با journal و امکان بازگشت
+
+تغییر نام فایل به فایل (با new_path.exists() برای هر فایل) جابجایی و چرخه
+(A→B و B→A) را پشتیبانی نمی‌کند و خطا در وسط کار پوشه را نیمه تغییر نام داده رها می‌کند.
+اینجا:
+- کل نگاشت از یک بار خواندن پوشه (os.scandir) در حافظه ساخته می‌شود؛ بدون exists برای هر فایل
+- تداخل نام‌ها (با فایل موجود یا بین دو فایل) و چرخه‌ها قبل از شروع تشخیص داده می‌شوند
+- فایل‌هایی که نامشان مقصد فایل دیگری است ابتدا به نام موقت و سپس به نام نهایی می‌روند
+- هر مرحله در journal ثبت می‌شود؛ اجرای متوقف شده قابل ادامه (resume) یا بازگشت (undo) است
+- در صورت خطا، تغییرات انجام شده خودکار برگردانده می‌شوند
+
+استفاده:
+    from rename_planner import apply_renames
+
+    outcome = apply_renames(folder, [(old_name, new_name), ...], on_collision='skip')
+    final_name, status = outcome[old_name]   # status: renamed/unchanged/collision/missing/failed
+
+مدیریت:
+    python rename_planner.py list
+    python rename_planner.py resume <journal>
+    python rename_planner.py undo <journal>
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+
+# محل نگهداری journal ها (قابل تغییر با متغیر محیطی)
+JOURNAL_DIR = os.environ.get(
+    'RENAME_JOURNAL_DIR',
+    str(Path.home() / '.sjsc_rename_journal')
+)
+
+# ذخیره قطعی (fsync) journal پس از این تعداد مرحله؛ مرز مراحل همیشه ذخیره قطعی می‌شود
+JOURNAL_SYNC_EVERY = 500
+
+TEMP_PREFIX = '.~rename-'
+
+STATUS_LABELS = {
+    'renamed': 'تغییر نام داده شد',
+    'planned': 'آماده تغییر نام (پیش‌نمایش)',
+    'unchanged': 'بدون تغییر (نام فعلی صحیح است)',
+    'collision': 'فایل با این نام وجود دارد',
+    'missing': 'فایل پیدا نشد',
+    'failed': 'خطا - تغییرات برگردانده شد'
+}
+
+
+def _key(name):
+    # روی ویندوز نام فایل به بزرگی و کوچکی حروف حساس نیست
+    return os.path.normcase(name)
+
+
+def _listing(directory):
+    with os.scandir(directory) as entries:
+        return {_key(entry.name): entry.name for entry in entries}
+
+
+def _copy_name(name, used):
+    base, ext = os.path.splitext(name)
+    counter = 1
+    while _key(f"{base}_copy{counter}{ext}") in used:
+        counter += 1
+    return f"{base}_copy{counter}{ext}"
+
+
+class RenamePlan:
+    """
+    نگاشت کامل تغییر نام فایل‌های یک پوشه
+
+    on_collision: 'skip' (فایل تغییر نام نمی‌کند) یا 'copy' (پسوند _copyN)
+    """
+
+    def __init__(self, directory, on_collision='skip'):
+        self.directory = Path(directory)
+        self.on_collision = on_collision
+        self.requests = []
+        self.results = {}
+        self.entries = []   # [old, temp یا None, new]
+        self.cycles = []
+        self.run_id = None
+
+    def add(self, old_name, new_name):
+        self.requests.append((old_name, new_name))
+
+    def prepare(self):
+        """
+        ساخت نگاشت نهایی از یک بار خواندن پوشه: تداخل‌ها، نام‌های موقت و چرخه‌ها
+        """
+        listing = _listing(self.directory)
+        self.results = {}
+        moves = {}
+        for old, new in self.requests:
+            if _key(old) not in listing:
+                self.results[old] = (None, 'missing')
+            elif old == new:
+                self.results[old] = (old, 'unchanged')
+            elif _key(old) not in moves:
+                moves[_key(old)] = (old, new)
+
+        # فایلی که تغییر نام نمی‌کند نامش را اشغال نگه می‌دارد؛ رد شدن یک فایل ممکن است
+        # مقصد فایل دیگری را اشغال کند، پس تا پایدار شدن نگاشت تکرار می‌شود
+        while True:
+            occupied = {k for k in listing if k not in moves}
+            taken = set()
+            targets = []
+            skipped = []
+            for source_key, (old, new) in moves.items():
+                target = new
+                target_key = _key(target)
+                if target_key != source_key and (target_key in occupied or target_key in taken):
+                    if self.on_collision == 'copy':
+                        target = _copy_name(new, occupied | taken | set(moves))
+                        target_key = _key(target)
+                    else:
+                        skipped.append(source_key)
+                        continue
+                taken.add(target_key)
+                targets.append((old, target))
+            if not skipped:
+                break
+            for source_key in skipped:
+                old, new = moves.pop(source_key)
+                self.results[old] = (None, 'collision')
+
+        # فایلی که نامش مقصد فایل دیگری است (زنجیره یا چرخه) ابتدا به نام موقت می‌رود
+        self.run_id = uuid.uuid4().hex[:8]
+        target_of = {_key(old): _key(new) for old, new in targets}
+        blocking = {t for s, t in target_of.items() if t != s and t in target_of}
+        self.entries = []
+        for i, (old, new) in enumerate(targets):
+            temp = f"{TEMP_PREFIX}{self.run_id}-{i}.tmp" if _key(old) in blocking else None
+            self.entries.append([old, temp, new])
+
+        self.cycles = self._find_cycles(target_of, {_key(old): old for old, _ in targets})
+        return self
+
+    @staticmethod
+    def _find_cycles(target_of, names):
+        cycles = []
+        state = {}
+        for start in target_of:
+            path = []
+            node = start
+            while node in target_of and node not in state:
+                state[node] = start
+                path.append(node)
+                node = target_of[node]
+            if node in target_of and state.get(node) == start and target_of[node] != node:
+                cycle = path[path.index(node):]
+                cycles.append([names[k] for k in cycle])
+        return cycles
+
+    def print_summary(self):
+        moving = len(self.entries)
+        via_temp = sum(1 for _, temp, _ in self.entries if temp)
+        counts = {}
+        for _, status in self.results.values():
+            counts[status] = counts.get(status, 0) + 1
+        print(f"🗺️ برنامه تغییر نام: {moving} فایل ({via_temp} از طریق نام موقت)"
+              + ''.join(f"، {STATUS_LABELS[s]}: {n}" for s, n in sorted(counts.items())))
+        for cycle in self.cycles[:5]:
+            shown = cycle + cycle[:1] if len(cycle) <= 6 else cycle[:5] + ['...']
+            print(f"   🔁 چرخه ({len(cycle)} فایل): {' → '.join(shown)}")
+        if len(self.cycles) > 5:
+            print(f"   🔁 ... و {len(self.cycles) - 5} چرخه دیگر")
+
+    def apply(self, dry_run=False):
+        """
+        اجرای برنامه؛ خروجی: {old_name: (final_name, status)}
+
+        پوشه دوباره خوانده می‌شود تا فایل‌هایی که پس از پیش‌نمایش اضافه شده‌اند بازنویسی نشوند.
+        """
+        self.prepare()
+        if dry_run or not self.entries:
+            for old, _, new in self.entries:
+                self.results[old] = (new, 'planned')
+            return self.results
+
+        journal = RenameJournal.create(self)
+        step = None
+        try:
+            for i, (old, temp, new) in enumerate(self.entries):
+                if temp:
+                    step = (old, temp)
+                    os.rename(self.directory / old, self.directory / temp)
+                    journal.step(i, 1)
+            journal.mark('phase1_done')
+            for i, (old, temp, new) in enumerate(self.entries):
+                step = (temp or old, new)
+                os.rename(self.directory / (temp or old), self.directory / new)
+                journal.step(i, 2)
+            journal.mark('completed')
+        except OSError as e:
+            journal.close()
+            print(f"❌ خطا در تغییر نام {step[0]} → {step[1]}: {e}")
+            print("↩️ برگرداندن تغییرات انجام شده...")
+            undo(journal.path)
+            for old, _, _ in self.entries:
+                self.results[old] = (None, 'failed')
+            return self.results
+
+        journal.close()
+        for old, _, new in self.entries:
+            self.results[old] = (new, 'renamed')
+        return self.results
+
+
+class RenameJournal:
+    """
+    ثبت برنامه و مراحل تغییر نام (JSON Lines)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._unsynced = 0
+
+    @classmethod
+    def create(cls, plan):
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{plan.run_id}.jsonl"
+        journal = cls(Path(JOURNAL_DIR) / name)
+        journal._write({
+            'run_id': plan.run_id,
+            'directory': str(plan.directory.resolve()),
+            'created': time.time(),
+            'entries': plan.entries
+        }, sync=True)
+        return journal
+
+    def _write(self, record, sync=False):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._unsynced += 1
+        if sync or self._unsynced >= JOURNAL_SYNC_EVERY:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def step(self, index, phase):
+        self._write({'step': index, 'phase': phase})
+
+    def mark(self, event):
+        self._write({'event': event, 'time': time.time()}, sync=True)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+def load_journal(path):
+    """
+    خواندن journal؛ خروجی: (header, رویدادها به ترتیب ثبت)
+    """
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        events = []
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # خط ناقص آخر (توقف ناگهانی)
+            if 'event' in record:
+                events.append(record['event'])
+    return header, events
+
+
+def _final_event(events):
+    # آخرین resume/undo انجام شده وضعیت نهایی را تعیین می‌کند
+    for event in reversed(events):
+        if event in ('completed', 'undone'):
+            return event
+    return None
+
+
+def current_names(header, events):
+    """
+    نام فعلی هر فایل برنامه: [(old, current, new), ...]
+
+    وضعیت از روی رویدادهای ثبت شده و یک بار خواندن پوشه تعیین می‌شود:
+    پیش از phase1_done هیچ فایلی به نام نهایی نرفته و پس از آن نام قدیم
+    فایل‌های مستقیم مقصد فایل دیگری نیست.
+    """
+    listing = _listing(header['directory'])
+    finished = _final_event(events)
+    located = []
+    for old, temp, new in header['entries']:
+        if finished == 'completed':
+            current = new
+        elif finished == 'undone':
+            current = old
+        elif temp and _key(temp) in listing:
+            current = temp
+        elif 'phase1_done' not in events:
+            current = old
+        elif temp:
+            current = new
+        else:
+            current = old if _key(old) in listing else new
+        located.append((old, current, new))
+    return located
+
+
+def _replan(journal_path, forward):
+    header, events = load_journal(journal_path)
+    plan = RenamePlan(header['directory'])
+    for old, current, new in current_names(header, events):
+        target = new if forward else old
+        if current != target:
+            plan.add(current, target)
+    results = plan.apply()
+    failed = [old for old, (_, status) in results.items() if status in ('failed', 'collision', 'missing')]
+    if not failed:
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'event': 'completed' if forward else 'undone', 'time': time.time()}) + '\n')
+    return results
+
+
+def resume(journal_path):
+    """
+    ادامه اجرای متوقف شده تا نام‌های نهایی
+    """
+    return _replan(journal_path, forward=True)
+
+
+def undo(journal_path):
+    """
+    برگرداندن همه فایل‌های یک اجرا (کامل یا نیمه کاره) به نام‌های اولیه
+    """
+    return _replan(journal_path, forward=False)
+
+
+def apply_renames(directory, renames, on_collision='skip', dry_run=False):
+    """
+    تغییر نام گروهی فایل‌های یک پوشه؛ renames: [(old_name, new_name), ...]
+    """
+    plan = RenamePlan(directory, on_collision)
+    for old_name, new_name in renames:
+        plan.add(old_name, new_name)
+    plan.prepare().print_summary()
+    return plan.apply(dry_run=dry_run)
+
+
+def list_journals():
+    if not os.path.isdir(JOURNAL_DIR):
+        return []
+    journals = []
+    for name in sorted(os.listdir(JOURNAL_DIR)):
+        if name.endswith('.jsonl'):
+            path = os.path.join(JOURNAL_DIR, name)
+            header, events = load_journal(path)
+            journals.append((path, header, events))
+    return journals
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ('list', 'resume', 'undo') or \
+            (sys.argv[1] != 'list' and len(sys.argv) < 3):
+        print("استفاده:")
+        print("  python rename_planner.py list")
+        print("  python rename_planner.py resume <journal>")
+        print("  python rename_planner.py undo <journal>")
+        sys.exit(1)
+
+    if sys.argv[1] == 'list':
+        for path, header, events in list_journals():
+            finished = _final_event(events)
+            state = ('↩️ برگردانده شده' if finished == 'undone' else
+                     '✅ کامل' if finished == 'completed' else '⚠️ نیمه کاره')
+            print(f"{state} | {len(header['entries'])} فایل | {header['directory']}")
+            print(f"   {path}")
+    else:
+        action = resume if sys.argv[1] == 'resume' else undo
+        results = action(sys.argv[2])
+        counts = {}
+        for _, status in results.values():
+            counts[status] = counts.get(status, 0) + 1
+        print(', '.join(f"{STATUS_LABELS[s]}: {n}" for s, n in sorted(counts.items())) or "کاری باقی نمانده است")
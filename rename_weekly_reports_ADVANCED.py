@@ -15,6 +15,8 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from docx import Document
 from collections import defaultdict
 
+from date_normalize import parse_date
+
 # سعی در import کتابخانه‌های PDF
 try:
     import PyPDF2
@@ -30,29 +32,6 @@ try:
 except:
     OCR_AVAILABLE = False
 
-def parse_date(date_str):
-    """تبدیل تاریخ به datetime"""
-    if not date_str:
-        return None
-    
-    months = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
-    
-    try:
-        date_str = date_str.strip()
-        parts = date_str.split('-')
-        if len(parts) == 3:
-            day = int(parts[0])
-            month = months.get(parts[1].lower())
-            year = int(parts[2])
-            if month:
-                return datetime(year, month, day)
-    except:
-        pass
-    return None
-
 def extract_from_word(doc_path):
     """
     استخراج اطلاعات از فایل Word
@@ -14,6 +14,9 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from datetime import datetime
 
+from docx_header_reader import read_report_fields
+from rename_planner import apply_renames, STATUS_LABELS
+
 class WordFileRenamer:
     def __init__(self, source_directory):
         """
@@ -32,6 +35,9 @@ class WordFileRenamer:
         Args:
             doc: شیء Document از python-docx
             
+        اولین مقدار پیدا شده برای هر فیلد نگه داشته می‌شود (همان قاعده docx_header_reader،
+        تا نتیجه به این بستگی نداشته باشد که کدام مسیر اجرا شده است)
+        
         Returns:
             dict: دیکشنری حاوی sequence_number, date, revision
         """
@@ -50,7 +56,7 @@ class WordFileRenamer:
                     
                     # جستجوی Sequence Number
                     for i, cell_text in enumerate(cells_text):
-                        if 'Sequence' in cell_text and 'Number' in cell_text:
+                        if not data['sequence_number'] and 'Sequence' in cell_text and 'Number' in cell_text:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -62,7 +68,7 @@ class WordFileRenamer:
                     
                     # جستجوی Revision در Header
                     for i, cell_text in enumerate(cells_text):
-                        if cell_text in ['Revision', 'Rev', 'REV']:
+                        if not data['revision'] and cell_text in ['Revision', 'Rev', 'REV']:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -80,7 +86,7 @@ class WordFileRenamer:
                 # جستجوی Revision (اگر در Header پیدا نشده)
                 if not data['revision']:
                     for i, cell_text in enumerate(cells_text):
-                        if cell_text in ['Revision', 'Rev', 'REV']:
+                        if not data['revision'] and cell_text in ['Revision', 'Rev', 'REV']:
                             try:
                                 if row_idx + 1 < len(table.rows):
                                     next_row = table.rows[row_idx + 1]
@@ -92,7 +98,7 @@ class WordFileRenamer:
                 
                 # جستجوی Date
                 for i, cell_text in enumerate(cells_text):
-                    if cell_text == 'Date' or cell_text == 'DATE':
+                    if not data['date'] and cell_text in ['Date', 'DATE']:
                         try:
                             if row_idx + 1 < len(table.rows):
                                 next_row = table.rows[row_idx + 1]
@@ -144,6 +150,8 @@ class WordFileRenamer:
         
         print(f"تعداد {len(word_files)} فایل Word پیدا شد.\n")
         
+        pending_renames = []
+        
         for file_path in word_files:
             # رد کردن فایل‌های موقت
             if file_path.name.startswith('~$'):
@@ -152,11 +160,12 @@ class WordFileRenamer:
             print(f"در حال پردازش: {file_path.name}")
             
             try:
-                # خواندن فایل Word
-                doc = Document(file_path)
+                # خواندن سریع Header و جداول اول فایل Word
+                data = read_report_fields(file_path)
                 
-                # استخراج داده‌ها
-                data = self.extract_table_data(doc)
+                # اگر فیلدی پیدا نشد، کل سند با python-docx بررسی می‌شود
+                if not all(data.values()):
+                    data = self.extract_table_data(Document(file_path))
                 
                 print(f"  Sequence Number: {data['sequence_number']}")
                 print(f"  Revision: {data['revision']}")
@@ -180,14 +189,9 @@ class WordFileRenamer:
                     'status': 'موفق'
                 }
                 
-                # تغییر نام فایل (اختیاری)
+                # تغییر نام فایل (اختیاری) - پس از پردازش همه فایل‌ها یکجا انجام می‌شود
                 if rename_files:
-                    new_path = file_path.parent / new_filename
-                    if not new_path.exists():
-                        file_path.rename(new_path)
-                        result['status'] = 'تغییر نام داده شد'
-                    else:
-                        result['status'] = 'فایل با این نام وجود دارد'
+                    pending_renames.append((file_path.name, result))
                 
                 self.results.append(result)
                 
@@ -202,6 +206,15 @@ class WordFileRenamer:
                     'status': f'خطا: {str(e)}'
                 })
         
+        # تغییر نام یکجا: نگاشت کامل از یک بار خواندن پوشه، اجرای دو مرحله‌ای با journal
+        if pending_renames:
+            outcome = apply_renames(
+                self.source_directory,
+                [(name, result['new_name']) for name, result in pending_renames]
+            )
+            for name, result in pending_renames:
+                result['status'] = STATUS_LABELS[outcome[name][1]]
+        
         return self.results
     
     def create_excel_report(self, output_path):
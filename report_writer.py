@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Report Writer - نوشتن جریانی گزارش‌های اکسل (openpyxl write-only)
+
+هر create_excel_report یک Workbook معمولی می‌ساخت و برای تک تک سلول‌ها اشیای تازه
+Font/PatternFill/Border/Alignment می‌ساخت؛ کل جدول تا زمان ذخیره در حافظه می‌ماند. اینجا:
+- workbook در حالت write-only است: هر ردیف به محض اضافه شدن روی دیسک نوشته می‌شود
+  و حافظه مستقل از تعداد ردیف‌ها ثابت می‌ماند
+- استایل‌ها یک بار به صورت NamedStyle تعریف و با نام به سلول‌ها داده می‌شوند
+- ردیف‌ها را می‌توان همزمان با رسیدن نتایج (از generator) اضافه کرد
+
+استفاده:
+    from report_writer import ReportWriter
+
+    columns = [('ردیف', 8, 'center'), ('نام فایل', 50, 'cell'), ('تاریخ', 15, 'date')]
+    with ReportWriter(output_path, "گزارش", columns) as report:
+        for idx, item in enumerate(results, 1):
+            report.append([idx, item['name'], item['date']])
+
+مقایسه با روش قبلی (زمان و حافظه):
+    python report_writer.py benchmark [rows] [--no-memory]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from copy import copy
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
+
+
+DATE_FORMAT = 'DD/MM/YYYY'
+
+_THIN = Side(style='thin')
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# استایل ستون‌ها (هر کدام یک بار به عنوان NamedStyle در workbook ثبت می‌شود)
+CELL_STYLES = {
+    'cell': {'border': True},
+    'center': {'border': True, 'align': 'center'},
+    'left': {'border': True, 'align': 'left'},
+    'date': {'border': True, 'align': 'center', 'number_format': DATE_FORMAT},
+    'link': {'border': True, 'align': 'left', 'font': {'color': '0563C1', 'underline': 'single'}},
+    'plain': {},
+    'plain_center': {'align': 'center', 'vertical': None},
+    'bold': {'font': {'bold': True, 'size': 11}},
+}
+
+
+def _named_style(name, spec, fill=None):
+    style = NamedStyle(name=name)
+    if spec.get('border'):
+        style.border = _BORDER
+    if spec.get('align'):
+        style.alignment = Alignment(horizontal=spec['align'], vertical=spec.get('vertical', 'center'))
+    if spec.get('font'):
+        style.font = Font(**spec['font'])
+    if spec.get('number_format'):
+        style.number_format = spec['number_format']
+    if fill:
+        style.fill = PatternFill(start_color=fill, end_color=fill, fill_type='solid')
+    return style
+
+
+class ReportWriter:
+    """
+    گزارش اکسل جریانی با یک برگه
+
+    columns: [(عنوان, عرض, نام استایل), ...]
+    stripe: رنگ ردیف‌های زوج (مثل 'F2F2F2')؛ None یعنی بدون رنگ یک در میان
+    keep_empty: اگر False باشد و هیچ ردیفی اضافه نشود، فایلی ساخته نمی‌شود
+    """
+
+    def __init__(self, output_path, title, columns, header_color='366092', header_size=12,
+                 stripe=None, keep_empty=True):
+        self.output_path = output_path
+        self.title = title
+        self.columns = columns
+        self.header_color = header_color
+        self.header_size = header_size
+        self.stripe = stripe
+        self.keep_empty = keep_empty
+        self.rows = 0
+        self.saved = False
+        self._wb = None
+        self._ws = None
+        self._row_number = 0
+        self._style_arrays = {}
+
+    def _open(self):
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet(self.title)
+
+        header = f"header_{self.header_color}_{self.header_size}"
+        self._wb.add_named_style(_named_style(header, {
+            'border': True, 'align': 'center',
+            'font': {'bold': True, 'color': 'FFFFFF', 'size': self.header_size}
+        }, fill=self.header_color))
+        for name, spec in CELL_STYLES.items():
+            self._wb.add_named_style(_named_style(name, spec))
+            if self.stripe:
+                self._wb.add_named_style(_named_style(f"{name}_stripe", spec, fill=self.stripe))
+
+        # عرض ستون‌ها باید قبل از اولین ردیف تنظیم شود
+        for col, (_, width, _) in enumerate(self.columns, 1):
+            self._ws.column_dimensions[get_column_letter(col)].width = width
+
+        self._write([name for name, _, _ in self.columns], [header] * len(self.columns))
+
+    def _style_array(self, name):
+        # جستجوی NamedStyle با نام برای هر سلول کند است؛ نتیجه یک بار برای هر استایل نگهداری می‌شود
+        if name not in self._style_arrays:
+            cell = WriteOnlyCell(self._ws)
+            cell.style = name
+            self._style_arrays[name] = cell._style
+        return copy(self._style_arrays[name])
+
+    def _write(self, values, styles, links=None):
+        row = []
+        for col, value in enumerate(values):
+            cell = WriteOnlyCell(self._ws, value=value)
+            if styles[col]:
+                cell._style = self._style_array(styles[col])
+            if links and col in links:
+                cell.hyperlink = links[col]
+            row.append(cell)
+        self._ws.append(row)
+        self._row_number += 1
+
+    def append(self, values, styles=None, links=None):
+        """
+        اضافه کردن یک ردیف داده
+
+        styles: لیست نام استایل برای هر ستون (پیش‌فرض: استایل ستون‌ها)
+        links: {شماره ستون از صفر: آدرس لینک}
+        """
+        if self._wb is None:
+            self._open()
+        if styles is None:
+            styles = [style for _, _, style in self.columns]
+            # ردیف اول داده (ردیف 2 برگه) زوج است، مثل رنگ‌آمیزی قبلی گزارش‌ها
+            if self.stripe and (self._row_number + 1) % 2 == 0:
+                styles = [f"{style}_stripe" for style in styles]
+        self._write(values, styles, links)
+        self.rows += 1
+
+    def append_summary(self, label, value):
+        """
+        ردیف خلاصه (یک ردیف خالی و سپس برچسب و مقدار پررنگ)
+        """
+        if self._wb is None:
+            self._open()
+        self._ws.append([])
+        self._row_number += 1
+        self._write([label, value], ['bold', 'bold'])
+
+    def close(self):
+        """
+        ذخیره فایل؛ خروجی: تعداد ردیف‌های داده
+        """
+        if self.saved:
+            return self.rows
+        if self._wb is None:
+            if not self.keep_empty:
+                return 0
+            self._open()
+        self._wb.save(self.output_path)
+        self.saved = True
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
+
+
+# ===== مقایسه با روش قبلی =====
+
+_BENCH_COLUMNS = [('ردیف', 8, 'center'), ('نام فایل اصلی', 40, 'center'), ('نام فایل جدید', 45, 'center'),
+                  ('Document No', 40, 'center'), ('REV', 8, 'center'), ('تاریخ', 15, 'date'),
+                  ('وضعیت', 20, 'center')]
+
+
+def _bench_rows(count):
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        yield [i + 1, f'report_{i:06d}.pdf', f'SJSC-GGNRSP-MADR-REMO-{i:04d}-G00.pdf',
+               f'SJSC-GGNRSP-MADR-REMO-{i:04d}', 'G00', start + timedelta(days=i % 365), '✅ موفق']
+
+
+def _legacy_report(path, count):
+    # همان الگوی create_excel_report های قبلی: workbook معمولی و اشیای استایل برای هر سلول
+    wb = Workbook()
+    ws = wb.active
+    ws.append([name for name, _, _ in _BENCH_COLUMNS])
+    for cell in ws[1]:
+        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        cell.font = Font(bold=True, color="FFFFFF", size=11)
+    for idx, row in enumerate(_bench_rows(count), start=2):
+        ws.append(row)
+        for col_idx, cell in enumerate(ws[idx], start=1):
+            cell.border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                                 top=Side(style='thin'), bottom=Side(style='thin'))
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+            if col_idx == 6:
+                cell.number_format = DATE_FORMAT
+    for col, (_, width, _) in enumerate(_BENCH_COLUMNS, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+    wb.save(path)
+
+
+def _streaming_report(path, count):
+    with ReportWriter(path, 'Benchmark', _BENCH_COLUMNS, header_color='4472C4', header_size=11) as report:
+        for row in _bench_rows(count):
+            report.append(row)
+
+
+def _measure(build, path, rows, trace):
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    build(path, rows)
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def benchmark(rows=100000, folder='.', memory=True):
+    """
+    زمان و اوج حافظه روش قبلی در برابر ReportWriter
+
+    زمان بدون tracemalloc اندازه‌گیری می‌شود؛ اوج حافظه در یک اجرای جداگانه با tracemalloc.
+    """
+    print(f"📊 گزارش {rows:,} ردیفی")
+    for label, build in (('روش قبلی (Workbook معمولی)', _legacy_report),
+                         ('ReportWriter (write-only)', _streaming_report)):
+        path = os.path.join(folder, f"_benchmark{build.__name__}.xlsx")
+        elapsed, _ = _measure(build, path, rows, trace=False)
+        size = os.path.getsize(path)
+        line = f"   {label}: {elapsed:.1f} ثانیه، حجم فایل {size / 1024 / 1024:.1f} MB"
+        if memory:
+            _, peak = _measure(build, path, rows, trace=True)
+            line += f"، اوج حافظه {peak / 1024 / 1024:.1f} MB"
+        os.remove(path)
+        print(line)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != 'benchmark':
+        print("استفاده:")
+        print("  python report_writer.py benchmark [rows] [--no-memory]")
+        sys.exit(1)
+
+    args = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+    benchmark(int(args[0]) if args else 100000, memory='--no-memory' not in sys.argv)
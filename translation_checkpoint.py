@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Checkpoint - ذخیره پیشرفت OCR و ترجمه صفحه به صفحه
+
+متن OCR و ترجمه هر صفحه به محض آماده شدن با کلید (هش محتوای سند، شماره صفحه)
+ذخیره می‌شود. اگر اجرا وسط کار متوقف شود یا ترجمه یک صفحه خطا بدهد،
+اجرای بعدی فقط صفحات ناقص را پردازش می‌کند و PDF خروجی در چند ثانیه دوباره ساخته می‌شود.
+
+ترجمه ذخیره شده فقط با همان نسخه واژه‌نامه و همان مترجم معتبر است؛ متن OCR همیشه معتبر است.
+
+استفاده:
+    from translation_checkpoint import TranslationCheckpoint, parse_pages
+
+    checkpoint = TranslationCheckpoint(pdf_path, glossary_version, backend='google')
+    saved = checkpoint.load(range(14, 35))      # {page: (ocr_text, translated یا None)}
+    checkpoint.save_ocr(14, text)
+    checkpoint.save_translation(14, translated)
+
+مدیریت:
+    python translation_checkpoint.py status <file.pdf>
+    python translation_checkpoint.py clear <file.pdf>
+"""
+
+import time
+import sqlite3
+import threading
+
+from pdf_text_cache import file_sha256
+from translation_memory import DEFAULT_MEMORY_PATH
+
+
+def parse_pages(spec):
+    """
+    تبدیل '14,16-18' به [14, 16, 17, 18]
+    """
+    pages = set()
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            pages.update(range(int(first), int(last) + 1))
+        else:
+            pages.add(int(part))
+    return sorted(pages)
+
+
+class TranslationCheckpoint:
+    """
+    وضعیت صفحات یک سند (قابل استفاده از چند thread)
+    """
+
+    def __init__(self, pdf_path, glossary_version='', backend='', db_path=DEFAULT_MEMORY_PATH):
+        self.pdf_path = str(pdf_path)
+        self.doc_hash = file_sha256(pdf_path)
+        self.glossary_version = glossary_version
+        self.backend = backend
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS translation_pages (
+                doc_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                ocr_text TEXT,
+                translated TEXT,
+                glossary_version TEXT,
+                backend TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (doc_hash, page)
+            );
+        """)
+        # جدول‌های قدیمی ستون مترجم ندارند (ترجمه‌های آنها دوباره انجام می‌شود)
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(translation_pages)')]
+        if 'backend' not in columns:
+            self.conn.execute('ALTER TABLE translation_pages ADD COLUMN backend TEXT')
+        self.conn.commit()
+
+    def load(self, pages):
+        """
+        وضعیت ذخیره شده صفحات؛ خروجی: {page: (ocr_text, translated)}
+
+        translated برای صفحه‌ای که ترجمه نشده یا با واژه‌نامه یا مترجم دیگری ترجمه شده None است.
+        """
+        pages = list(pages)
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT page, ocr_text, translated, glossary_version, backend FROM translation_pages '
+                'WHERE doc_hash = ?', (self.doc_hash,)
+            ).fetchall()
+        wanted = set(pages)
+        saved = {}
+        for page, ocr_text, translated, version, backend in rows:
+            if page not in wanted:
+                continue
+            if version != self.glossary_version or backend != self.backend:
+                translated = None
+            saved[page] = (ocr_text, translated)
+        return saved
+
+    def save_ocr(self, page, ocr_text):
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO translation_pages (doc_hash, page, ocr_text, updated) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(doc_hash, page) DO UPDATE SET ocr_text = excluded.ocr_text, '
+                'translated = NULL, updated = excluded.updated',
+                (self.doc_hash, page, ocr_text or "", time.time())
+            )
+            self.conn.commit()
+
+    def save_translation(self, page, translated):
+        with self._lock:
+            self.conn.execute(
+                'UPDATE translation_pages SET translated = ?, glossary_version = ?, backend = ?, updated = ? '
+                'WHERE doc_hash = ? AND page = ?',
+                (translated or "", self.glossary_version, self.backend, time.time(), self.doc_hash, page)
+            )
+            self.conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute('DELETE FROM translation_pages WHERE doc_hash = ?', (self.doc_hash,))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ('status', 'clear'):
+        print("استفاده:")
+        print("  python translation_checkpoint.py status <file.pdf>")
+        print("  python translation_checkpoint.py clear <file.pdf>")
+        sys.exit(1)
+
+    checkpoint = TranslationCheckpoint(sys.argv[2])
+    if sys.argv[1] == 'clear':
+        checkpoint.clear()
+        print(f"🧹 پیشرفت ذخیره شده {sys.argv[2]} پاک شد")
+    else:
+        with checkpoint._lock:
+            rows = checkpoint.conn.execute(
+                'SELECT page, translated IS NOT NULL FROM translation_pages WHERE doc_hash = ? ORDER BY page',
+                (checkpoint.doc_hash,)
+            ).fetchall()
+        done = [str(p) for p, t in rows if t]
+        ocr_only = [str(p) for p, t in rows if not t]
+        print(f"📄 {sys.argv[2]} ({checkpoint.doc_hash[:12]})")
+        print(f"   ✅ ترجمه شده ({len(done)}): {', '.join(done) or '-'}")
+        print(f"   🔍 فقط OCR ({len(ocr_only)}): {', '.join(ocr_only) or '-'}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Dispatcher - تقسیم متن در مرز جمله و ارسال همزمان با محدودیت نرخ
+
+- تقسیم‌کننده: جمله‌ها تا سقف کاراکتر در یک بخش قرار می‌گیرند و هیچ جمله یا
+  کلمه‌ای از وسط نصف نمی‌شود (جمله بلندتر از سقف در مرز کلمه شکسته می‌شود)
+- ارسال‌کننده: چند درخواست همزمان، محدودیت نرخ با token bucket (به جای sleep ثابت)،
+  تلاش دوباره با backoff نمایی و بازگرداندن نتایج به ترتیب ورودی
+
+استفاده:
+    from translation_dispatcher import TranslationDispatcher, pack_segments
+
+    dispatcher = TranslationDispatcher(backend, workers=4, rate=5.0)
+    results = dispatcher.translate_all(['\\n'.join(c) for c in pack_segments(sentences, 4000)])
+"""
+
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# تنظیمات پیش‌فرض ارسال
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 5.0          # درخواست در ثانیه
+DEFAULT_BURST = 5           # حداکثر درخواست پشت سر هم
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0       # ثانیه (دو برابر در هر تلاش)
+
+
+def split_long(text, max_chars):
+    """
+    شکستن متن بلندتر از سقف در آخرین فاصله قبل از سقف
+    """
+    parts = []
+    while len(text) > max_chars:
+        cut = text.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars  # کلمه بلندتر از سقف
+        parts.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        parts.append(text)
+    return parts
+
+
+def pack_segments(segments, max_chars, sep_len=1):
+    """
+    چیدن جمله‌ها در بخش‌هایی با حداکثر max_chars کاراکتر؛ خروجی: [[جمله, ...], ...]
+
+    ترتیب جمله‌ها حفظ می‌شود. جمله بلندتر از سقف به تنهایی یک بخش است.
+    """
+    chunks = []
+    chunk = []
+    size = 0
+    for segment in segments:
+        extra = len(segment) + (sep_len if chunk else 0)
+        if chunk and size + extra > max_chars:
+            chunks.append(chunk)
+            chunk, size = [], 0
+            extra = len(segment)
+        chunk.append(segment)
+        size += extra
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class TokenBucket:
+    """
+    محدودیت نرخ: rate توکن در ثانیه با ظرفیت capacity (قابل استفاده از چند thread)
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        انتظار تا در دسترس بودن توکن؛ خروجی: مدت انتظار (ثانیه)
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class TranslationDispatcher:
+    """
+    ارسال همزمان درخواست‌های ترجمه با محدودیت نرخ و تلاش دوباره
+    """
+
+    def __init__(self, backend, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 chars_per_second=None, max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.requests_bucket = TokenBucket(rate, burst) if rate else None
+        # سهمیه کاراکتری سرویس (در صورت وجود)؛ ظرفیت: یک دقیقه سهمیه
+        self.chars_bucket = TokenBucket(chars_per_second, chars_per_second * 60) if chars_per_second else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._executor = None
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'wait': 0.0, 'seconds': 0.0}
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self.stats[key] += value
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.workers > 1:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def translate_one(self, text):
+        """
+        ترجمه یک بخش با محدودیت نرخ و تلاش دوباره؛ در صورت شکست نهایی None
+        """
+        for attempt in range(self.max_retries + 1):
+            waited = 0.0
+            if self.requests_bucket:
+                waited += self.requests_bucket.acquire()
+            if self.chars_bucket:
+                waited += self.chars_bucket.acquire(len(text))
+            self._count('wait', waited)
+            self._count('requests')
+
+            started = time.perf_counter()
+            try:
+                result = self.backend.translate(text)
+                self._count('seconds', time.perf_counter() - started)
+                return result
+            except Exception as e:
+                self._count('seconds', time.perf_counter() - started)
+                if attempt == self.max_retries:
+                    print(f"      ⚠️ خطا در ترجمه (پس از {attempt + 1} تلاش): {e}")
+                    self._count('failures')
+                    return None
+                self._count('retries')
+                delay = self.backoff * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay / 2))
+
+    def translate_all(self, texts):
+        """
+        ترجمه همزمان چند بخش؛ نتایج به ترتیب ورودی (None برای بخش ناموفق)
+        """
+        executor = self._get_executor() if len(texts) > 1 else None
+        if executor is None:
+            return [self.translate_one(t) for t in texts]
+        return list(executor.map(self.translate_one, texts))
+
+    def print_stats(self):
+        s = self.stats
+        if not s['requests']:
+            return
+        print(f"🌐 ارسال ترجمه: {s['requests']} درخواست ({self.workers} همزمان)، "
+              f"{s['retries']} تلاش دوباره، {s['failures']} ناموفق | "
+              f"انتظار محدودیت نرخ {s['wait']:.1f} ثانیه، زمان سرویس {s['seconds']:.1f} ثانیه")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Translation Memory - حافظه ترجمه دائمی در سطح جمله
+
+قراردادها و روش‌های اجرایی بندهای تکراری زیادی دارند. هر جمله پس از ترجمه
+در یک پایگاه داده SQLite ذخیره می‌شود و در اجراهای بعدی (یا صفحات بعدی)
+بدون فراخوانی سرویس ترجمه استفاده می‌شود.
+
+کلید حافظه: متن نرمال شده جمله مبدا + نسخه واژه‌نامه + مترجم و زبان مبدا/مقصد
+با تغییر واژه‌نامه، ترجمه‌های قبلی به صورت خودکار نادیده گرفته می‌شوند؛ ترجمه‌های یک مترجم
+(مثلا 'stub') هرگز به جای ترجمه مترجم دیگر برگردانده نمی‌شوند.
+
+مترجم قابل تعویض است؛ مترجم 'stub' بدون اینترنت کار می‌کند (برای تست).
+
+استفاده:
+    from translation_memory import translate_segments, get_backend, get_translation_memory
+
+    text_fa = translate_segments(text, get_backend('google'), get_translation_memory(),
+                                 glossary_version='v1', postprocess=apply_terms)
+    get_translation_memory().print_stats()
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+from translation_dispatcher import TranslationDispatcher, pack_segments, split_long
+
+try:
+    from deep_translator import GoogleTranslator
+    DEEP_TRANSLATOR_AVAILABLE = True
+except ImportError:
+    DEEP_TRANSLATOR_AVAILABLE = False
+
+
+# مسیر پیش‌فرض پایگاه داده حافظه ترجمه (قابل تغییر با متغیر محیطی)
+DEFAULT_MEMORY_PATH = os.environ.get(
+    'TRANSLATION_MEMORY',
+    str(Path.home() / '.sjsc_translation_memory.sqlite3')
+)
+
+# جداکننده پاراگراف‌ها: خط خالی
+PARAGRAPH_SPLIT = re.compile(r'(\n[ \t]*\n\s*)')
+
+# شکست خط داخل پاراگراف (شکست خط صفحه PDF، نه پایان جمله)
+LINE_WRAP = re.compile(r'[ \t]*\n[ \t]*')
+
+# جداکننده جمله‌ها داخل پاراگراف: فاصله بعد از پایان جمله
+SEGMENT_SPLIT = re.compile(r'((?<=[.!?؟;])[ \t]+)')
+
+
+def normalize_segment(text):
+    """
+    نرمال‌سازی جمله برای کلید حافظه (فاصله‌های اضافه حذف می‌شوند)
+    """
+    return ' '.join(text.split())
+
+
+def glossary_version(terms):
+    """
+    نسخه واژه‌نامه: هش کوتاه از اصطلاحات مرتب شده
+    """
+    sha = hashlib.sha1()
+    for eng, fa in sorted(terms.items()):
+        sha.update(f"{eng}\t{fa}\n".encode('utf-8'))
+    return sha.hexdigest()[:12]
+
+
+def split_segments(text):
+    """
+    تقسیم متن به جمله‌ها؛ خروجی: [(جمله، جداکننده بعد از آن), ...]
+
+    متن فقط در خط خالی (پاراگراف) و پایان جمله تقسیم می‌شود؛ شکست خط‌های داخل
+    پاراگراف به فاصله تبدیل می‌شوند تا جمله‌ای که در چند خط PDF آمده یک جمله بماند.
+    با چسباندن جمله‌ها و جداکننده‌ها متن اصلی (با پاراگراف‌های یک خطی) ساخته می‌شود.
+    """
+    parts = PARAGRAPH_SPLIT.split(text)
+    segments = []
+    for i in range(0, len(parts), 2):
+        paragraph_sep = parts[i + 1] if i + 1 < len(parts) else ""
+        body = parts[i].rstrip()
+        trailing = parts[i][len(body):]
+        sentences = SEGMENT_SPLIT.split(LINE_WRAP.sub(' ', body))
+        for j in range(0, len(sentences), 2):
+            sep = sentences[j + 1] if j + 1 < len(sentences) else trailing + paragraph_sep
+            segments.append((sentences[j], sep))
+    return segments
+
+
+# ---------------------------------------------------------------------------
+# مترجم‌ها
+# ---------------------------------------------------------------------------
+
+class GoogleBackend:
+    """
+    مترجم Google (deep_translator)
+
+    محدودیت نرخ توسط TranslationDispatcher اعمال می‌شود؛ هر thread نمونه مترجم خودش را دارد.
+    """
+    name = 'google'
+
+    def __init__(self, source='en', target='fa'):
+        if not DEEP_TRANSLATOR_AVAILABLE:
+            raise RuntimeError("deep_translator نصب نیست")
+        self.source = source
+        self.target = target
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.chars = 0
+
+    def translate(self, text):
+        with self._lock:
+            self.calls += 1
+            self.chars += len(text)
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self._local.translator = GoogleTranslator(source=self.source, target=self.target)
+        return translator.translate(text) or ""
+
+
+class StubBackend:
+    """
+    مترجم محلی بدون اینترنت برای تست؛ هر خط را با پیشوند [fa] برمی‌گرداند
+    """
+    name = 'stub'
+
+    def __init__(self, source='en', target='fa', prefix='[fa] '):
+        self.source = source
+        self.target = target
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.chars = 0
+
+    def translate(self, text):
+        with self._lock:
+            self.calls += 1
+            self.chars += len(text)
+        return '\n'.join(self.prefix + line if line.strip() else line
+                         for line in text.split('\n'))
+
+
+def memory_scope(backend):
+    """
+    بخشی از کلید حافظه که به مترجم بستگی دارد: (نام مترجم، زبان مبدا، زبان مقصد)
+    """
+    return backend.name, backend.source, backend.target
+
+
+TRANSLATOR_BACKENDS = {
+    'google': GoogleBackend,
+    'stub': StubBackend,
+}
+
+
+def get_backend(name='google', **kwargs):
+    """
+    ساخت مترجم بر اساس نام
+    """
+    if name not in TRANSLATOR_BACKENDS:
+        raise ValueError(f"مترجم ناشناخته: {name} (موجود: {', '.join(TRANSLATOR_BACKENDS)})")
+    return TRANSLATOR_BACKENDS[name](**kwargs)
+
+
+# ---------------------------------------------------------------------------
+# حافظه ترجمه
+# ---------------------------------------------------------------------------
+
+class TranslationMemory:
+    """
+    حافظه ترجمه SQLite با شمارنده hit/miss (قابل استفاده از چند thread)
+    """
+
+    def __init__(self, db_path=DEFAULT_MEMORY_PATH):
+        self.db_path = str(db_path)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._migrate()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS translation_memory (
+                source TEXT NOT NULL,
+                glossary_version TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                target TEXT NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, glossary_version, backend, source_lang, target_lang)
+            );
+        """)
+        self.conn.commit()
+
+    def _migrate(self):
+        """
+        جدول قدیمی (کلید فقط جمله + نسخه واژه‌نامه) به جدول جدید منتقل می‌شود؛
+        ترجمه‌های مترجم stub منتقل نمی‌شوند و همه ترجمه‌های قبلی en→fa بوده‌اند
+        """
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(translation_memory)')]
+        if not columns or 'source_lang' in columns:
+            return
+        with self.conn:
+            self.conn.execute('ALTER TABLE translation_memory RENAME TO translation_memory_old')
+            self.conn.execute("""
+                CREATE TABLE translation_memory (
+                    source TEXT NOT NULL,
+                    glossary_version TEXT NOT NULL,
+                    backend TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    uses INTEGER NOT NULL DEFAULT 0,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (source, glossary_version, backend, source_lang, target_lang)
+                )
+            """)
+            self.conn.execute(
+                "INSERT INTO translation_memory "
+                "SELECT source, glossary_version, backend, 'en', 'fa', target, uses, created, last_used "
+                "FROM translation_memory_old WHERE backend != 'stub'"
+            )
+            self.conn.execute('DROP TABLE translation_memory_old')
+
+    def get_many(self, sources, version, scope):
+        """
+        جستجوی چند جمله نرمال شده؛ خروجی: {جمله: ترجمه} فقط برای موارد موجود
+
+        scope: (نام مترجم، زبان مبدا، زبان مقصد) - خروجی memory_scope
+        """
+        found = {}
+        now = time.time()
+        with self._lock:
+            for source in sources:
+                row = self.conn.execute(
+                    'SELECT target FROM translation_memory WHERE source = ? AND glossary_version = ? '
+                    'AND backend = ? AND source_lang = ? AND target_lang = ?',
+                    (source, version) + tuple(scope)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                found[source] = row[0]
+            if found:
+                self.conn.executemany(
+                    'UPDATE translation_memory SET uses = uses + 1, last_used = ? '
+                    'WHERE source = ? AND glossary_version = ? '
+                    'AND backend = ? AND source_lang = ? AND target_lang = ?',
+                    [(now, source, version) + tuple(scope) for source in found]
+                )
+                self.conn.commit()
+        return found
+
+    def put_many(self, pairs, version, scope):
+        """
+        ذخیره ترجمه‌ها: pairs = {جمله نرمال شده: ترجمه}، scope مثل get_many
+        """
+        if not pairs:
+            return
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO translation_memory '
+                '(source, glossary_version, backend, source_lang, target_lang, target, uses, created, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)',
+                [(source, version) + tuple(scope) + (target, now, now) for source, target in pairs.items()]
+            )
+            self.conn.commit()
+            self.stored += len(pairs)
+
+    def stats(self):
+        with self._lock:
+            entries = self.conn.execute('SELECT COUNT(*) FROM translation_memory').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'stored': self.stored,
+            'entries': entries,
+        }
+
+    def print_stats(self, backend=None):
+        """
+        نمایش آمار حافظه ترجمه (و تعداد فراخوانی مترجم در صورت وجود)
+        """
+        s = self.stats()
+        line = (f"\n🧠 حافظه ترجمه: {s['hits']} hit / {s['misses']} miss ({s['hit_rate']:.0%}) | "
+                f"{s['stored']} جمله جدید، {s['entries']} رکورد")
+        if backend is not None:
+            line += f" | مترجم {backend.name}: {backend.calls} فراخوانی، {backend.chars} کاراکتر"
+        print(line)
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute('DELETE FROM translation_memory')
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+_default_memory = None
+_default_memory_pid = None
+
+
+def get_translation_memory():
+    """
+    نمونه مشترک حافظه ترجمه برای کل فرآیند
+    """
+    global _default_memory, _default_memory_pid
+    if _default_memory is None or _default_memory_pid != os.getpid():
+        _default_memory = TranslationMemory()
+        _default_memory_pid = os.getpid()
+    return _default_memory
+
+
+def _translate_batch(sources, dispatcher, chunk_size):
+    """
+    ترجمه جمله‌ها با کمترین فراخوانی: جمله‌ها در مرز جمله بسته‌بندی و با خط جدید به هم چسبانده می‌شوند
+
+    - جمله بلندتر از chunk_size در مرز کلمه شکسته و جداگانه ترجمه می‌شود
+    - اگر تعداد خطوط خروجی یک بخش با ورودی برابر نباشد، آن بخش جمله به جمله ترجمه می‌شود
+    - جمله‌هایی که ترجمه نشدند (یا ترجمه خالی گرفتند) در خروجی نیستند
+    """
+    short = [s for s in sources if len(s) <= chunk_size]
+    long_parts = {s: split_long(s, chunk_size) for s in sources if len(s) > chunk_size}
+
+    chunks = pack_segments(short, chunk_size)
+    requests = ['\n'.join(chunk) for chunk in chunks]
+    for parts in long_parts.values():
+        requests.extend(parts)
+    translated = dispatcher.translate_all(requests)
+
+    results = {}
+    retry = []
+    for chunk, out in zip(chunks, translated):
+        if out is None:
+            continue
+        lines = out.split('\n')
+        if len(lines) == len(chunk):
+            results.update(zip(chunk, lines))
+        elif len(chunk) > 1:
+            retry.extend(chunk)
+        else:
+            results[chunk[0]] = ' '.join(lines)
+
+    pos = len(chunks)
+    for source, parts in long_parts.items():
+        outs = translated[pos:pos + len(parts)]
+        pos += len(parts)
+        if all(o is not None for o in outs):
+            results[source] = ' '.join(o.replace('\n', ' ') for o in outs)
+
+    if retry:
+        for source, out in zip(retry, dispatcher.translate_all(retry)):
+            if out is not None:
+                results[source] = out.replace('\n', ' ')
+
+    # ترجمه خالی (مثلا پاسخ خالی سرویس) ذخیره نمی‌شود تا در اجرای بعدی دوباره ترجمه شود
+    return {source: target for source, target in results.items() if target.strip()}
+
+
+def translate_segments(text, backend, memory=None, glossary_version='', postprocess=None,
+                       chunk_size=4000, dispatcher=None, refresh=False, failed=None):
+    """
+    ترجمه متن جمله به جمله با استفاده از حافظه ترجمه
+
+    - جمله‌های موجود در حافظه بدون فراخوانی مترجم استفاده می‌شوند
+      (با refresh=True همه جمله‌ها دوباره ترجمه و در حافظه جایگزین می‌شوند)
+    - بقیه (بدون تکرار) در بخش‌های حداکثر chunk_size کاراکتری و در مرز جمله
+      توسط dispatcher (همزمان، با محدودیت نرخ) ترجمه می‌شوند
+    - postprocess (مثلا اعمال واژه‌نامه) روی ترجمه جدید اجرا و نتیجه ذخیره می‌شود
+    - جمله‌هایی که ترجمه نشدند به لیست failed (در صورت وجود) اضافه می‌شوند
+    پاراگراف‌های متن اصلی حفظ می‌شوند.
+    """
+    segments = split_segments(text)
+    sources = [normalize_segment(seg) for seg, _ in segments]
+    unique = list(dict.fromkeys(s for s in sources if s))
+
+    scope = memory_scope(backend)
+    found = memory.get_many(unique, glossary_version, scope) if memory is not None and not refresh else {}
+    missing = [s for s in unique if s not in found]
+
+    if missing:
+        if dispatcher is None:
+            dispatcher = TranslationDispatcher(backend, workers=1, rate=None)
+        translated = _translate_batch(missing, dispatcher, chunk_size)
+        if postprocess:
+            translated = {s: postprocess(t) for s, t in translated.items()}
+        if memory is not None:
+            memory.put_many(translated, glossary_version, scope)
+        found.update(translated)
+        if failed is not None:
+            failed.extend(s for s in missing if s not in translated)
+
+    # در صورت خطای ترجمه، متن اصلی جمله حفظ می‌شود
+    return ''.join(found.get(source, seg) + sep
+                   for (seg, sep), source in zip(segments, sources))
+
+
+if __name__ == "__main__":
+    import sys
+
+    memory = get_translation_memory()
+    if len(sys.argv) > 1 and sys.argv[1] == 'clear':
+        memory.clear()
+        print("🧹 حافظه ترجمه پاک شد")
+    memory.print_stats()
+    print(f"📂 مسیر: {memory.db_path}")